@@ -0,0 +1,152 @@
+"""
+Benchmark de las colas por CPU de `src/simulator.py`: una cola Ready global
+contra una cola por CPU (con y sin robo de trabajo), con y sin afinidad, y con
+un costo de migración cada vez que un proceso corre en un CPU distinto del
+anterior.
+
+Primero verifica, con cargas aleatorias y todas las combinaciones de opciones,
+que ningún CPU corra dos procesos a la vez, que ningún proceso corra en dos
+CPUs a la vez, que todos terminen y que el tiempo ocupado sea la suma de las
+ráfagas más el costo de migración pagado. Después compara las políticas con
+muchos CPUs.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_affinity [--processes 20000] [--cpus 8 16 32 64]
+        [--migration-cost 0 2]
+"""
+
+import argparse
+import itertools
+import random
+import time
+from collections import defaultdict
+
+from src.process import Process
+from src.scheduler import AVAILABLE_SCHEDULERS, SchedulerMLFQ, SchedulerRR
+from src.simulator import simulate
+
+
+# (etiqueta, kwargs de simulate) de cada política comparada.
+POLICIES = [
+    ("global", {}),
+    ("global+afinidad", {"affinity": True}),
+    ("por CPU", {"per_cpu_queues": True, "work_stealing": False}),
+    ("por CPU+robo", {"per_cpu_queues": True}),
+    ("por CPU+robo+afinidad", {"per_cpu_queues": True, "affinity": True}),
+]
+
+
+def make_scheduler(name, quantum=4):
+    if name == "RR":
+        return SchedulerRR(quantum=quantum)
+    if name == "MLFQ":
+        return SchedulerMLFQ(quantum=quantum // 2 or 1, boost_interval=40)
+    return AVAILABLE_SCHEDULERS[name]()
+
+
+def make_processes(count, seed, num_cpus, max_burst=30):
+    """Llegadas en ráfagas, con la carga justa para mantener ocupados los CPUs."""
+    rng = random.Random(seed)
+    horizon = count * max_burst // (2 * num_cpus) + 1
+    waves = [rng.randint(0, horizon) for _ in range(max(1, count // 50))]
+    return [
+        Process(
+            pid=i,
+            filename=f"archivo_{i}.txt",
+            arrival_time=max(0, rng.choice(waves) + rng.randint(-5, 5)),
+            burst_time=rng.randint(1, max_burst),
+            priority=rng.randint(0, 5),
+        )
+        for i in range(count)
+    ]
+
+
+def check_result(processes, result, num_cpus, migration_cost):
+    by_cpu, by_pid = defaultdict(list), defaultdict(list)
+    for segment in result.timeline:
+        assert 0 <= segment.cpu < num_cpus
+        by_cpu[segment.cpu].append((segment.start, segment.end))
+        by_pid[segment.pid].append((segment.start, segment.end))
+    for intervals in itertools.chain(by_cpu.values(), by_pid.values()):
+        intervals.sort()
+        for (_, end), (start, _) in zip(intervals, intervals[1:]):
+            assert end <= start, "dos tramos superpuestos"
+
+    assert len(result.processes) == len(processes)
+    for process in processes:
+        intervals = by_pid[process.pid]
+        assert process.state == "Terminated"
+        assert process.start_time == intervals[0][0]
+        assert process.completion_time == intervals[-1][1]
+
+    metrics = result.metrics
+    busy = sum(segment.end - segment.start for segment in result.timeline)
+    assert busy == sum(p.burst_time for p in processes) + metrics["migration_time"]
+    assert metrics["migration_time"] <= metrics["migrations"] * migration_cost
+    if num_cpus == 1:
+        assert metrics["migrations"] == 0
+
+
+def check_policies(seed, cases=120):
+    rng = random.Random(seed)
+    options = list(itertools.product((False, True), repeat=3))
+    for _ in range(cases):
+        num_cpus = rng.randint(1, 6)
+        processes = make_processes(rng.randint(1, 50), rng.randrange(10**6), num_cpus)
+        migration_cost = rng.randint(0, 3)
+        for name in AVAILABLE_SCHEDULERS:
+            for per_cpu, steal, affinity in options:
+                result = simulate(
+                    processes,
+                    make_scheduler(name, rng.randint(1, 6)),
+                    num_cpus,
+                    per_cpu_queues=per_cpu,
+                    work_stealing=steal,
+                    affinity=affinity,
+                    migration_cost=migration_cost,
+                )
+                check_result(processes, result, num_cpus, migration_cost)
+    return cases * len(AVAILABLE_SCHEDULERS) * len(options)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--processes", type=int, default=20000)
+    parser.add_argument("--cpus", type=int, nargs="+", default=[8, 16, 32, 64])
+    parser.add_argument("--migration-cost", type=int, nargs="+", default=[0, 2])
+    parser.add_argument("--algorithm", choices=list(AVAILABLE_SCHEDULERS), default="RR")
+    parser.add_argument("--seed", type=int, default=23)
+    args = parser.parse_args()
+
+    cases = check_policies(args.seed)
+    print(f"{cases} simulaciones aleatorias: tramos, tiempos y migraciones coherentes")
+
+    print(
+        f"{'cpus':>4} {'costo':>5} {'política':<22} {'makespan':>9} "
+        f"{'throughput':>10} {'turnaround':>11} {'migraciones':>11} {'seg':>7}"
+    )
+    for num_cpus in args.cpus:
+        processes = make_processes(args.processes, args.seed, num_cpus)
+        for migration_cost in args.migration_cost:
+            for label, options in POLICIES:
+                start = time.perf_counter()
+                result = simulate(
+                    processes,
+                    make_scheduler(args.algorithm),
+                    num_cpus,
+                    record_events=False,
+                    migration_cost=migration_cost,
+                    **options,
+                )
+                elapsed = time.perf_counter() - start
+                metrics = result.metrics
+                print(
+                    f"{num_cpus:>4} {migration_cost:>5} {label:<22} "
+                    f"{metrics['makespan']:>9} {metrics['throughput']:>10.4f} "
+                    f"{metrics['avg_turnaround_time']:>11.2f} "
+                    f"{metrics['migrations']:>11} {elapsed:>7.2f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Benchmark del análisis de un archivo grande por rangos de bytes en paralelo
+(`split_file_ranges` + `parse_file_regex_range` + `merge_results` en
+`src/extractor_regex.py`) contra analizarlo completo en un solo worker.
+
+Primero verifica, sobre archivos aleatorios con entidades, saltos de línea
+`\\r\\n` y `\\r`, caracteres acentuados y bytes que no son UTF-8 válido, que
+unir los resultados de los rangos dé exactamente el mismo resultado que
+`parse_file_regex` para cualquier cantidad de rangos. Después mide un lote con
+un archivo grande y varios chicos: completo, el lote dura lo que tarda un
+worker con el archivo grande; por rangos, lo reparten todos los workers.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_chunks [--size-mb 64] [--workers 8] [--small 7]
+"""
+
+import argparse
+import concurrent.futures
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.bench_extractor import ENTIDADES, PALABRAS_RELLENO, generate_text_file
+from src.extractor_regex import (
+    merge_results,
+    parse_file_regex,
+    parse_file_regex_range,
+    split_file_ranges,
+)
+
+
+KEYS = ("Nombres", "Fechas", "Lugares", "ConteoPalabras")
+
+# Piezas "difíciles" cerca de los límites: meses y "de" (no son cortes
+# seguros), saltos de línea de Windows, bytes inválidos y multibyte partidos.
+PIEZAS_RARAS = [
+    b"de", b"enero", b"Septiembre", b"mayo", b"\r\n", b"\r", b"\n\n", b"\t",
+    b"\xff", b"\xc3", b"\xe2\x80", "¿Qué?".encode(), "«Malmö»".encode(),
+    "\ufeff".encode(), b"1945", b"12/03", b"-", b"_x", "Núñez".encode(),
+]
+
+
+def write_random_file(path, rng, tokens):
+    pieces = []
+    for _ in range(tokens):
+        roll = rng.random()
+        if roll < 0.15:
+            pieces.append(rng.choice(ENTIDADES).encode("utf-8"))
+        elif roll < 0.3:
+            pieces.append(rng.choice(PIEZAS_RARAS))
+        else:
+            pieces.append(rng.choice(PALABRAS_RELLENO).encode("utf-8"))
+        pieces.append(rng.choice([b" ", b" ", b"  ", b", ", b".\n", b""]))
+    with open(path, "wb") as f:
+        f.write(b"".join(pieces))
+
+
+def parse_by_ranges(path, parts, chunk_size=None):
+    extra = {} if chunk_size is None else {"chunk_size": chunk_size}
+    results = [
+        parse_file_regex_range(path, "BENCH", start, end, **extra)
+        for start, end in split_file_ranges(path, parts)
+    ]
+    return merge_results(path, results)
+
+
+def check_ranges(seed, cases=300):
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "check.txt")
+        for case in range(cases):
+            write_random_file(path, rng, rng.randint(0, 3000))
+            expected = parse_file_regex(path, "BENCH")
+            size = os.path.getsize(path)
+            for parts in (1, 2, 3, 7, 16, 64):
+                ranges = split_file_ranges(path, parts)
+                assert ranges[0][0] == 0 and ranges[-1][1] == size, ranges
+                assert all(a[1] == b[0] for a, b in zip(ranges, ranges[1:])), ranges
+                merged = parse_by_ranges(path, parts, rng.choice([None, 64, 1000]))
+                if any(merged[k] != expected[k] for k in KEYS):
+                    raise SystemExit(f"Resultados distintos (caso {case}, {parts} rangos)")
+
+
+def run_batch(executor, tasks):
+    """Segundos hasta que terminan todas las tareas (fn, args...)."""
+    start = time.perf_counter()
+    futures = [executor.submit(fn, *args) for fn, *args in tasks]
+    results = [future.result() for future in futures]
+    return time.perf_counter() - start, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size-mb", type=float, default=64)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--small", type=int, default=7, help="Archivos chicos")
+    parser.add_argument("--seed", type=int, default=21)
+    args = parser.parse_args()
+
+    check_ranges(args.seed)
+    print("Rangos unidos = archivo completo en todos los casos aleatorios")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        big = os.path.join(tmp_dir, "grande.txt")
+        generate_text_file(big, int(args.size_mb * 1024 * 1024))
+        small = []
+        for i in range(args.small):
+            path = os.path.join(tmp_dir, f"chico_{i}.txt")
+            generate_text_file(path, 64 * 1024, seed=i + 1)
+            small.append(path)
+
+        start = time.perf_counter()
+        ranges = split_file_ranges(big, args.workers)
+        split_seconds = time.perf_counter() - start
+        print(
+            f"{args.size_mb:g} MB en {len(ranges)} rangos "
+            f"(buscar los cortes: {split_seconds * 1000:.1f} ms), "
+            f"{args.small} archivos chicos, {args.workers} workers, "
+            f"{os.cpu_count()} CPUs"
+        )
+
+        whole = [(parse_file_regex, big, "BENCH")]
+        by_range = [(parse_file_regex_range, big, "BENCH", s, e) for s, e in ranges]
+        rest = [(parse_file_regex, path, "BENCH") for path in small]
+        print(f"{'pool':<10} {'completo (s)':>13} {'por rangos (s)':>15} {'acel.':>7}")
+        for label, pool_class in (
+            ("hilos", concurrent.futures.ThreadPoolExecutor),
+            ("procesos", concurrent.futures.ProcessPoolExecutor),
+        ):
+            with pool_class(max_workers=args.workers) as executor:
+                run_batch(executor, rest)  # arrancar los workers
+                t_whole, whole_results = run_batch(executor, whole + rest)
+                t_ranges, range_results = run_batch(executor, by_range + rest)
+            merged = merge_results(big, range_results[: len(ranges)])
+            if any(merged[k] != whole_results[0][k] for k in KEYS):
+                raise SystemExit("Resultados distintos en el archivo grande")
+            print(
+                f"{label:<10} {t_whole:>13.3f} {t_ranges:>15.3f} "
+                f"{t_whole / t_ranges:>6.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Prueba de carga de conexiones: compara el servidor con un hilo por cliente
+(modo por defecto) contra el modo asyncio (`--async`) a medida que crece la
+cantidad de clientes conectados a la vez.
+
+Para cada cantidad de clientes se mide el tiempo hasta que todos reciben su
+WELCOME, la latencia de ida y vuelta de un SUB/ACK_SUB enviado por todos a la
+vez, y los hilos y la memoria (RSS) del proceso servidor.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_connections [--clients 50 200 500] [--port 65440]
+"""
+
+import argparse
+import asyncio
+import json
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+
+def read_proc_status(pid):
+    """Devuelve (hilos, RSS en MiB) de un proceso leyendo /proc/<pid>/status."""
+    threads, rss_kb = 0, 0
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("Threads:"):
+                    threads = int(line.split()[1])
+                elif line.startswith("VmRSS:"):
+                    rss_kb = int(line.split()[1])
+    except OSError:
+        pass
+    return threads, rss_kb / 1024
+
+
+def wait_for_port(port, timeout=10.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return True
+        except OSError:
+            time.sleep(0.1)
+    return False
+
+
+async def read_message(reader, expected_type):
+    while True:
+        line = await reader.readline()
+        if not line:
+            raise ConnectionError("El servidor cerró la conexión.")
+        message = json.loads(line)
+        if message.get("type") == expected_type:
+            return message
+
+
+async def run_clients(port, num_clients, server_pid):
+    """Conecta `num_clients` clientes a la vez y mide WELCOME y SUB/ACK_SUB."""
+    start = time.perf_counter()
+
+    async def connect():
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        await read_message(reader, "WELCOME")
+        return reader, writer
+
+    connections = await asyncio.gather(*(connect() for _ in range(num_clients)))
+    connect_seconds = time.perf_counter() - start
+
+    async def round_trip(reader, writer):
+        t0 = time.perf_counter()
+        writer.write(json.dumps({"type": "SUB", "payload": "bench"}).encode() + b"\n")
+        await writer.drain()
+        await read_message(reader, "ACK_SUB")
+        return (time.perf_counter() - t0) * 1000
+
+    latencies = await asyncio.gather(*(round_trip(r, w) for r, w in connections))
+    threads, rss_mb = read_proc_status(server_pid)
+
+    for _, writer in connections:
+        writer.close()
+    await asyncio.gather(
+        *(w.wait_closed() for _, w in connections), return_exceptions=True
+    )
+
+    latencies.sort()
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    return connect_seconds, statistics.median(latencies), p95, threads, rss_mb
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, nargs="+", default=[50, 200, 500])
+    parser.add_argument("--port", type=int, default=65440)
+    args = parser.parse_args()
+
+    print(
+        f"{'modo':<8} {'clientes':>8} {'conexión (s)':>13} {'p50 (ms)':>9} "
+        f"{'p95 (ms)':>9} {'hilos':>6} {'RSS (MiB)':>10}"
+    )
+    for label, extra_args in (("hilos", []), ("asyncio", ["--async"])):
+        server = subprocess.Popen(
+            [sys.executable, "-m", "src.server", "--port", str(args.port)] + extra_args,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            if not wait_for_port(args.port):
+                print(f"{label:<8} el servidor no arrancó en el puerto {args.port}")
+                continue
+            for num_clients in args.clients:
+                result = asyncio.run(run_clients(args.port, num_clients, server.pid))
+                connect_s, p50, p95, threads, rss_mb = result
+                print(
+                    f"{label:<8} {num_clients:>8} {connect_s:>13.3f} {p50:>9.2f} "
+                    f"{p95:>9.2f} {threads:>6} {rss_mb:>10.1f}"
+                )
+                time.sleep(0.5)  # deja que el servidor limpie las desconexiones
+        finally:
+            server.kill()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
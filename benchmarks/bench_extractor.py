@@ -0,0 +1,129 @@
+"""
+Micro-benchmark del extractor Regex: compara la implementación anterior
+(cinco `re.findall` sobre el contenido completo, recompilando en cada llamada)
+con el escaneo combinado precompilado de `src/extractor_regex.py` y con su
+variante sobre bytes en un mmap del archivo.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_extractor [--sizes-mb 1 8 32] [--repeat 3]
+"""
+
+import argparse
+import os
+import random
+import re
+import tempfile
+import time
+
+from src.extractor_regex import (
+    CIUDADES_COMUNES,
+    parse_file_regex,
+    parse_file_regex_mmap,
+)
+
+
+PALABRAS_RELLENO = (
+    "the of and data report system value process result analysis en el la de "
+    "que los informe sistema datos och att det som för med"
+).split()
+
+ENTIDADES = [
+    "John Smith", "Anna Karlsson", "José Núñez", "Åsa Öberg",
+    "12 de enero de 1945", "Jan 12, 1945", "3rd may 2001", "12/03/1945",
+    "1945-03-12", "42", "2024",
+] + CIUDADES_COMUNES
+
+
+def legacy_parse_content(content):
+    """Implementación original del extractor (referencia para comparar)."""
+    nombres = re.findall(
+        r"\b[A-ZÁÉÍÓÚÑÅÄÖ][a-záéíóúñåäö]+(?:\s+[A-ZÁÉÍÓÚÑÅÄÖ][a-záéíóúñåäö]+)+\b",
+        content,
+    )
+    fechas_textuales = re.findall(
+        r"\b(?:\d{1,2}(?:st|nd|rd|th)?(?:\s*(?:de\s+)?(?:enero|febrero|marzo|abril|mayo|junio|julio|agosto|septiembre|octubre|noviembre|diciembre|"
+        r"jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec|maj))?(?:\s*[\.,]?\s*\d{2,4})?)\b",
+        content,
+        flags=re.IGNORECASE,
+    )
+    fechas_numericas = re.findall(
+        r"\b(?:\d{1,2}[/\-]\d{1,2}[/\-]\d{2,4}|\d{4}[/\-]\d{1,2}[/\-]\d{1,2})\b",
+        content,
+    )
+    fechas = fechas_textuales + fechas_numericas
+    ciudades_regex = (
+        r"\b(?:" + "|".join(re.escape(city) for city in CIUDADES_COMUNES) + r")\b"
+    )
+    lugares = re.findall(ciudades_regex, content)
+    palabras = re.findall(r"\b\w+\b", content)
+    return {
+        "Nombres": sorted(list(set(nombres))) if nombres else [],
+        "Fechas": sorted(list(set(fechas))) if fechas else [],
+        "Lugares": sorted(list(set(lugares))) if lugares else [],
+        "ConteoPalabras": len(palabras),
+    }
+
+
+def legacy_parse_file(filepath):
+    with open(filepath, "r", encoding="utf-8", errors="ignore") as f:
+        return legacy_parse_content(f.read())
+
+
+def generate_text_file(path, size_bytes, entity_ratio=0.05, seed=0):
+    """Escribe un archivo sintético de ~size_bytes con entidades mezcladas."""
+    rng = random.Random(seed)
+    written = 0
+    with open(path, "w", encoding="utf-8") as f:
+        while written < size_bytes:
+            tokens = [
+                rng.choice(ENTIDADES)
+                if rng.random() < entity_ratio
+                else rng.choice(PALABRAS_RELLENO)
+                for _ in range(200)
+            ]
+            line = " ".join(tokens) + ".\n"
+            f.write(line)
+            written += len(line.encode("utf-8"))
+
+
+def best_of(repeat, fn, *args):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes-mb", type=float, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    keys = ("Nombres", "Fechas", "Lugares", "ConteoPalabras")
+    print(
+        f"{'Tamaño':>10} {'Anterior (s)':>14} {'Nuevo (s)':>12} {'mmap (s)':>10} "
+        f"{'Acel. nuevo':>12} {'Acel. mmap':>11}"
+    )
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size_mb in args.sizes_mb:
+            path = os.path.join(tmp_dir, f"bench_{size_mb}mb.txt")
+            generate_text_file(path, int(size_mb * 1024 * 1024))
+
+            t_old, old = best_of(args.repeat, legacy_parse_file, path)
+            t_new, new = best_of(args.repeat, parse_file_regex, path, "BENCH")
+            t_mmap, mapped = best_of(args.repeat, parse_file_regex_mmap, path, "BENCH")
+
+            if any(old[k] != new[k] or old[k] != mapped[k] for k in keys):
+                raise SystemExit(f"Resultados distintos para {size_mb} MB")
+
+            print(
+                f"{size_mb:>8} MB {t_old:>14.3f} {t_new:>12.3f} {t_mmap:>10.3f} "
+                f"{t_old / t_new:>11.2f}x {t_old / t_mmap:>10.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
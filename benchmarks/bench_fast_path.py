@@ -0,0 +1,110 @@
+"""
+Benchmark del camino rápido de `src/simulator.py`: FCFS, SJF y Priority_NP en
+un CPU, calculados como un orden de despacho más una suma acumulada (con numpy
+si está instalado, o con un bucle de Python), contra el motor por eventos.
+
+La equivalencia con el motor, con cargas aleatorias y con y sin numpy, se
+prueba en `tests/test_simulator_fast_path.py` (`python -m pytest`).
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_fast_path [--processes 10000 100000 1000000]
+"""
+
+import argparse
+import random
+import time
+
+from src import simulator
+from src.process import Process
+from src.scheduler import SchedulerFCFS, SchedulerPriorityNP, SchedulerSJF
+from src.simulator import simulate
+
+
+SCHEDULERS = {
+    "FCFS": SchedulerFCFS,
+    "SJF": SchedulerSJF,
+    "Priority_NP": SchedulerPriorityNP,
+}
+
+
+def make_processes(count, seed, spread):
+    """`spread` controla cuánto se separan las llegadas (más = más CPU ocioso)."""
+    rng = random.Random(seed)
+    return [
+        Process(
+            pid=i,
+            filename=f"archivo_{i}.txt",
+            arrival_time=rng.randint(0, int(count * spread) + 1),
+            burst_time=rng.randint(1, 10),
+            priority=rng.randint(0, 5),
+        )
+        for i in range(count)
+    ]
+
+
+def snapshot(processes, result):
+    """Todo lo observable de una simulación, para comparar."""
+    return (
+        result.timeline,
+        result.events,
+        [p.pid for p in result.processes],
+        result.metrics,
+        [
+            (
+                p.start_time,
+                p.completion_time,
+                p.turnaround_time,
+                p.waiting_time,
+                p.ticks_in_current_burst,
+            )
+            for p in processes
+        ],
+    )
+
+
+def backends():
+    """Variantes del camino rápido disponibles: con y sin numpy."""
+    if simulator.np is not None:
+        return ["numpy", "python"]
+    return ["python"]
+
+
+def use_backend(name, numpy_module):
+    simulator.np = numpy_module if name == "numpy" else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--processes", type=int, nargs="+", default=[10000, 100000, 1000000]
+    )
+    parser.add_argument("--seed", type=int, default=13)
+    args = parser.parse_args()
+
+    numpy_module = simulator.np
+    names = backends()
+    print(
+        f"{'algoritmo':<12} {'procesos':>9} {'motor (s)':>10} "
+        + " ".join(f"{name + ' (s)':>11}" for name in names)
+    )
+    for count in args.processes:
+        for name, scheduler_cls in SCHEDULERS.items():
+            processes = make_processes(count, args.seed, 0.5)
+            times = []
+            start = time.perf_counter()
+            simulate(processes, scheduler_cls(), record_events=False, fast_path=False)
+            times.append(time.perf_counter() - start)
+            for backend in names:
+                use_backend(backend, numpy_module)
+                start = time.perf_counter()
+                simulate(processes, scheduler_cls(), record_events=False)
+                times.append(time.perf_counter() - start)
+            print(
+                f"{name:<12} {count:>9} {times[0]:>10.3f} "
+                + " ".join(f"{seconds:>11.3f}" for seconds in times[1:])
+            )
+    use_backend("numpy", numpy_module)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark del índice de archivos del servidor (`src/file_index.py`): listar el
+directorio en cada `trigger` (`os.listdir` + `os.path.isfile`, como hacía el
+servidor antes) contra leer el índice en memoria.
+
+Crea N archivos .txt en un directorio temporal y mide la carga inicial del
+índice, el listado anterior y `snapshot()`. Después crea, modifica, renombra y
+borra archivos, y mide cuánto tarda el índice en reflejarlo (con inotify y con
+polling), verificando que quede igual a un recorrido completo del directorio.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_file_index [--files 100000] [--changes 1000]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from src.file_index import FileIndex
+
+
+def old_listing(directory):
+    """Lo que hacía `trigger` antes en cada disparo."""
+    return [
+        f
+        for f in os.listdir(directory)
+        if f.endswith(".txt") and os.path.isfile(os.path.join(directory, f))
+    ]
+
+
+def create_files(directory, start, count, size=64):
+    payload = b"x" * size
+    for i in range(start, start + count):
+        with open(os.path.join(directory, f"f{i:07d}.txt"), "wb") as f:
+            f.write(payload)
+
+
+def expected_entries(directory):
+    fresh = FileIndex(directory, use_inotify=False)
+    fresh.rescan()
+    return sorted(fresh.snapshot())
+
+
+def apply_changes(directory, files, changes):
+    """Crea, agranda, renombra y borra `changes` archivos de cada tipo."""
+    create_files(directory, files, changes)
+    for i in range(changes):
+        with open(os.path.join(directory, f"f{i:07d}.txt"), "ab") as f:
+            f.write(b"more")
+        os.rename(
+            os.path.join(directory, f"f{changes + i:07d}.txt"),
+            os.path.join(directory, f"r{i:07d}.txt"),
+        )
+        os.remove(os.path.join(directory, f"f{2 * changes + i:07d}.txt"))
+    os.mkdir(os.path.join(directory, "subdir.txt"))  # no es un archivo
+
+
+def wait_until_synced(index, expected, timeout=30):
+    """Segundos hasta que el índice coincide con `expected` (o None)."""
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        if sorted(index.snapshot()) == expected:
+            return time.perf_counter() - start
+        time.sleep(0.01)
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=100000)
+    parser.add_argument("--changes", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for use_inotify in (True, False):
+        with tempfile.TemporaryDirectory() as directory:
+            create_files(directory, 0, args.files)
+            index = FileIndex(directory, use_inotify=use_inotify, poll_interval=0.5)
+
+            start = time.perf_counter()
+            mode = index.start()
+            load_seconds = time.perf_counter() - start
+            print(f"\n--- {mode}: {args.files} archivos ---")
+            print(f"carga inicial del índice:          {load_seconds:8.3f} s")
+
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                listed = old_listing(directory)
+            listing = (time.perf_counter() - start) / args.repeat
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                index.snapshot()
+            snapshot = (time.perf_counter() - start) / args.repeat
+            assert sorted(listed) == sorted(name for name, _ in index.snapshot())
+            print(f"listdir + isfile por trigger:      {listing:8.3f} s")
+            print(f"snapshot() por trigger:            {snapshot:8.4f} s")
+
+            apply_changes(directory, args.files, args.changes)
+            expected = expected_entries(directory)
+            synced = wait_until_synced(index, expected)
+            assert synced is not None, "el índice no refleja los cambios"
+            print(
+                f"{4 * args.changes} cambios reflejados en:        {synced:8.3f} s "
+                f"({index.rescans} recorridos completos)"
+            )
+            index.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark de la selección de HRRN (`src/scheduler.py`): la implementación
+anterior, que recalcula el Response Ratio de toda la cola en cada despacho
+(`ReadyQueue.pop_best`, O(n)), contra `ResponseRatioQueue`, que agrupa los
+procesos por ráfaga y solo compara la cabeza de cada grupo.
+
+Mide simulaciones completas con cada cola. Que ambas elijan siempre el mismo
+proceso se prueba en `tests/test_scheduler_hrrn.py` (`python -m pytest`).
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_hrrn [--processes 1000 10000 30000] [--cpus 2]
+"""
+
+import argparse
+import random
+import time
+
+from src.process import Process
+from src.scheduler import ReadyQueue, SchedulerHRRN
+from src.simulator import simulate
+
+
+class ScanningHRRN(SchedulerHRRN):
+    """HRRN con la cola anterior: recorre toda la cola en cada despacho."""
+
+    def create_ready_queue(self, processes=()):
+        return ReadyQueue(self.sort_key, processes)
+
+
+def make_processes(count, seed, max_burst=20):
+    rng = random.Random(seed)
+    return [
+        Process(
+            pid=i,
+            filename=f"archivo_{i}.txt",
+            arrival_time=rng.randint(0, count * max_burst // 8),
+            burst_time=rng.randint(1, max_burst),
+        )
+        for i in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--processes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--cpus", type=int, default=2)
+    parser.add_argument("--max-burst", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=19)
+    args = parser.parse_args()
+
+    print(
+        f"{'procesos':>9} {'recorrido (s)':>14} {'por ráfaga (s)':>15} "
+        f"{'speedup':>8}"
+    )
+    for count in args.processes:
+        times = []
+        for scheduler in (ScanningHRRN(), SchedulerHRRN()):
+            processes = make_processes(count, args.seed, args.max_burst)
+            start = time.perf_counter()
+            simulate(processes, scheduler, args.cpus, record_events=False)
+            times.append(time.perf_counter() - start)
+        print(
+            f"{count:>9} {times[0]:>14.3f} {times[1]:>15.3f} "
+            f"{times[0] / times[1]:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+Benchmark del registro de los workers (`src/log_pipeline.py`): sin registro,
+registro síncrono (como antes: `FileHandler` compartido y consola con flush
+en cada mensaje) y el `LogPipeline` con cola e hilo escritor por lotes.
+
+Primero mide el costo de una llamada a `logging.info` en el hilo que registra.
+Después procesa `--files` archivos chicos con `process_single_file_wrapper` en
+un pool de hilos y en uno de procesos, y calcula el costo del registro por
+archivo respecto de hacerlo sin registro (el mejor de `--repeat` lotes).
+Verifica además que el archivo de log tenga todas las líneas esperadas (3 por
+archivo), también las de los workers de procesos.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_logging [--files 2000] [--workers 4] [--calls 20000]
+        [--repeat 3]
+"""
+
+import argparse
+import concurrent.futures
+import logging
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_extractor import generate_text_file
+from src import server, worker
+from src.log_pipeline import (
+    CONSOLE_FORMAT,
+    CONSOLE_LOGGER_NAME,
+    LogPipeline,
+    attach_worker_logging,
+)
+
+
+# "Iniciando", "Datos extraídos" y "Finalizado" por cada archivo.
+LINES_PER_FILE = 3
+
+
+def reset_root():
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+    logging.disable(logging.NOTSET)
+
+
+class Setup:
+    """Configura el registro de un modo y lo deshace al salir."""
+
+    def __init__(self, mode, log_path, console_stream):
+        self.mode = mode
+        self.log_path = log_path
+        self.console_stream = console_stream
+        self.pipeline = None
+
+    def __enter__(self):
+        reset_root()
+        root = logging.getLogger()
+        root.setLevel(logging.INFO)
+        if self.mode == "sin registro":
+            logging.disable(logging.CRITICAL)
+        elif self.mode == "síncrono":
+            file_handler = logging.FileHandler(self.log_path)
+            file_handler.setFormatter(logging.Formatter(server.LOG_FORMAT))
+            file_handler.addFilter(lambda r: r.name != CONSOLE_LOGGER_NAME)
+            console_handler = logging.StreamHandler(self.console_stream)
+            console_handler.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+            console_handler.addFilter(lambda r: r.name == CONSOLE_LOGGER_NAME)
+            root.addHandler(file_handler)
+            root.addHandler(console_handler)
+        else:
+            self.pipeline = LogPipeline(
+                self.log_path,
+                server.LOG_FORMAT,
+                batch_records=server.LOG_BATCH_RECORDS,
+                flush_interval=server.LOG_FLUSH_INTERVAL_SECONDS,
+                console_stream=self.console_stream,
+            )
+            self.pipeline.start()
+        return self
+
+    def worker_queue(self):
+        return self.pipeline.worker_queue() if self.pipeline else None
+
+    def __exit__(self, *exc):
+        if self.pipeline is not None:
+            self.pipeline.stop()
+        reset_root()
+
+
+def per_call(mode, log_path, console_stream, calls):
+    """Microsegundos por `logging.info` en el hilo que registra."""
+    with Setup(mode, log_path, console_stream):
+        start = time.perf_counter()
+        for i in range(calls):
+            logging.info(f"[THREAD ID_1] Iniciando procesamiento de archivo: f{i}.txt")
+        return (time.perf_counter() - start) / calls * 1e6
+
+
+def run_pool(mode, pool, paths, workers, log_path, console_stream):
+    """Segundos para procesar `paths` en un pool recién creado (ya caliente)."""
+    with Setup(mode, log_path, console_stream) as setup:
+        if pool == "threads":
+            executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+        else:
+            executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=attach_worker_logging,
+                initargs=(
+                    setup.worker_queue(),
+                    logging.INFO,
+                    server.LOG_BATCH_RECORDS,
+                    server.LOG_FLUSH_INTERVAL_SECONDS,
+                ),
+            )
+        tasks = [(path, pool) for path in paths]
+        with executor:
+            list(executor.map(worker.process_single_file_wrapper, tasks[:workers]))
+            start = time.perf_counter()
+            results = list(executor.map(worker.process_single_file_wrapper, tasks))
+            seconds = time.perf_counter() - start
+    assert all(r["status"] == "success" for r in results)
+    return seconds
+
+
+def count_lines(path):
+    if not os.path.exists(path):
+        return 0
+    with open(path, encoding="utf-8") as f:
+        return sum(1 for _ in f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--size-kb", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    modes = ("sin registro", "síncrono", "pipeline")
+    with tempfile.TemporaryDirectory() as tmp_dir, open(os.devnull, "w") as devnull:
+        log_path = os.path.join(tmp_dir, "bench.log")
+
+        print(f"{'modo':<14} {'µs por logging.info':>20}")
+        for mode in modes:
+            print(f"{mode:<14} {per_call(mode, log_path, devnull, args.calls):>20.2f}")
+
+        paths = []
+        for i in range(args.files):
+            path = os.path.join(tmp_dir, f"f{i}.txt")
+            generate_text_file(path, args.size_kb * 1024, seed=i)
+            paths.append(path)
+
+        print(
+            f"\n{args.files} archivos de {args.size_kb} KB, {args.workers} workers, "
+            f"{os.cpu_count()} CPUs"
+        )
+        print(f"{'pool':<9} {'modo':<14} {'total (s)':>10} {'µs/archivo':>11}")
+        for pool in ("threads", "forks"):
+            baseline = None
+            for mode in modes:
+                # También se registran las tareas de calentamiento.
+                expected = LINES_PER_FILE * (args.files + args.workers)
+                if mode == "sin registro":
+                    expected = 0
+                times = []
+                for _ in range(args.repeat):
+                    if os.path.exists(log_path):
+                        os.remove(log_path)
+                    times.append(
+                        run_pool(mode, pool, paths, args.workers, log_path, devnull)
+                    )
+                    lines = count_lines(log_path)
+                    if lines != expected:
+                        sys.exit(
+                            f"{pool}/{mode}: {lines} líneas, se esperaban {expected}"
+                        )
+                seconds = min(times)
+                baseline = baseline if baseline is not None else seconds
+                overhead = (seconds - baseline) / args.files * 1e6
+                print(f"{pool:<9} {mode:<14} {seconds:>10.3f} {overhead:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
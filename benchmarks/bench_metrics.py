@@ -0,0 +1,107 @@
+"""
+Benchmark de las métricas por etapa del servidor (`src/metrics.py`).
+
+Primero verifica, con muestras aleatorias de distintas escalas, que cada
+percentil de `Histogram` quede entre el valor exacto y 1 / SUBBUCKETS por
+encima. Después mide lo que cuesta registrar (un `record`, un `span` y un
+`record_task` por archivo) y procesa archivos con `process_files` en modo
+threads y forks para mostrar la tabla del comando `metrics`.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_metrics [--files 24] [--workers 4] [--calls 100000]
+"""
+
+import argparse
+import math
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.bench_extractor import generate_text_file
+from src import server
+from src.metrics import PERCENTILES, SUBBUCKETS, Histogram, Metrics, format_metrics
+
+
+def check_percentiles(seed, cases=300):
+    rng = random.Random(seed)
+    for _ in range(cases):
+        scale = 10 ** rng.uniform(-7, 1)
+        values = [
+            rng.lognormvariate(0, rng.uniform(0.1, 2)) * scale
+            for _ in range(rng.randint(1, 2000))
+        ]
+        if rng.random() < 0.1:
+            values += [0.0] * rng.randint(1, 50)
+        histogram = Histogram()
+        for value in values:
+            histogram.add(value)
+        values.sort()
+        for p in (*PERCENTILES, 0, 100):
+            exact = values[max(math.ceil(p / 100 * len(values)), 1) - 1]
+            estimate = histogram.percentile(p)
+            assert exact <= estimate <= exact * (1 + 1 / SUBBUCKETS), (p, exact)
+
+
+def per_call(fn, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=24)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--calls", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=25)
+    args = parser.parse_args()
+
+    check_percentiles(args.seed)
+    print("Percentiles dentro del error de las cubetas en todos los casos aleatorios")
+
+    metrics = Metrics()
+    now = time.monotonic()
+    timings = {
+        "worker": "THREAD ID_1", "start": now, "read": 1e-4, "regex": 5e-4,
+        "end": now + 7e-4,
+    }
+
+    def record():
+        metrics.record("send", "threads", 1e-4)
+
+    def span():
+        with metrics.span("send", "threads"):
+            pass
+
+    def record_task():
+        metrics.record_task("threads", now, timings, now + 1e-3)
+
+    for name, fn, calls in (
+        ("record()", record, args.calls),
+        ("span()", span, args.calls),
+        ("record_task()", record_task, args.calls),
+        ("snapshot()", metrics.snapshot, 1000),
+    ):
+        print(f"{name:<14} {per_call(fn, calls):8.2f} µs")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = []
+        for i in range(args.files):
+            path = os.path.join(tmp_dir, f"f{i}.txt")
+            size_kb = random.Random(i).choice([4, 64, 512])
+            generate_text_file(path, size_kb * 1024, seed=i)
+            paths.append(path)
+        server.server_metrics.reset()
+        for mode in ("threads", "forks"):
+            start = time.monotonic()
+            server.process_files(paths, mode, args.workers)
+            server.server_metrics.record("batch", mode, time.monotonic() - start)
+        server.worker_pools.shutdown()
+    print()
+    print(format_metrics(server.server_metrics.snapshot()))
+
+
+if __name__ == "__main__":
+    main()
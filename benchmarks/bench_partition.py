@@ -0,0 +1,174 @@
+"""
+Benchmark del reparto de archivos de `trigger` (`src/partitioner.py`): el
+reparto anterior (la misma cantidad de archivos por cliente, en tramos
+contiguos), LPT por tamaño y capacidad de cada cliente, y el reparto dinámico
+con robo de trabajo (`WorkStealingQueues`).
+
+Con tamaños de archivo de cola pesada y clientes con distintas cantidades de
+workers, calcula el makespan previsto de cada reparto y el de una ejecución
+simulada (cada worker de un cliente toma el próximo archivo de su lote apenas
+se libera), ambos en bytes por worker. La cota inferior es
+max(total / workers totales, archivo más grande), con cada worker pesando
+1 / su lentitud. Con `--slowdown`, algunos
+clientes procesan más lento de lo que el reparto supone (ej. una máquina
+cargada), que es donde el reparto dinámico se nota. Antes verifica que LPT y el
+reparto dinámico procesen cada archivo exactamente una vez.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_partition [--files 2000] [--capacities 1 2 4 8]
+        [--slowdown 1 1 3 1]
+"""
+
+import argparse
+import heapq
+import random
+import time
+
+from src.partitioner import (
+    WorkStealingQueues,
+    batch_units,
+    file_weight,
+    partition_files,
+)
+
+
+def make_files(count, seed):
+    """Tamaños de cola pesada: la mayoría chicos, unos pocos de cientos de MB."""
+    rng = random.Random(seed)
+    return [
+        (f"archivo_{i:05d}.txt", int(min(rng.paretovariate(1.2) * 8 * 1024, 2**29)))
+        for i in range(count)
+    ]
+
+
+def even_partition(files, num_clients):
+    """El reparto anterior, sobre la lista en el orden del directorio."""
+    assignments, start = [], 0
+    for i in range(num_clients):
+        count = len(files) // num_clients + (i < len(files) % num_clients)
+        assignments.append([name for name, _ in files[start : start + count]])
+        start += count
+    return assignments
+
+
+def run_batch(weights, workers, slowdown=1):
+    """Duración de un lote si cada worker libre toma el próximo archivo."""
+    finish = [0] * workers
+    for weight in weights:
+        heapq.heapreplace(finish, finish[0] + weight * slowdown)
+    return max(finish)
+
+
+def evaluate(assignments, weights, capacities, slowdowns):
+    """(makespan previsto, makespan de la ejecución simulada)."""
+    predicted = actual = 0
+    for files, capacity, slowdown in zip(assignments, capacities, slowdowns):
+        client_weights = [weights[name] for name in files]
+        predicted = max(predicted, batch_units(client_weights, capacity))
+        actual = max(actual, run_batch(client_weights, capacity, slowdown))
+    return predicted, actual
+
+
+def run_dynamic(assignments, weights, capacities, slowdowns):
+    """
+    Ejecución simulada del reparto dinámico: cada worker libre le pide un
+    archivo a `WorkStealingQueues`. Devuelve (makespan, archivos procesados).
+    """
+    work = WorkStealingQueues(assignments, weights)
+    workers = [
+        (0, client, worker)
+        for client, capacity in enumerate(capacities)
+        for worker in range(capacity)
+    ]
+    heapq.heapify(workers)
+    processed, makespan = [], 0
+    while workers:
+        now, client, worker = heapq.heappop(workers)
+        makespan = max(makespan, now)
+        item = work.take(client)
+        if item is None:
+            continue
+        processed.append(item[0])
+        finish = now + weights[item[0]] * slowdowns[client]
+        heapq.heappush(workers, (finish, client, worker))
+    return makespan, processed
+
+
+def check_partition(seed, cases=200):
+    rng = random.Random(seed)
+    for _ in range(cases):
+        files = make_files(rng.randint(0, 300), rng.randrange(10**6))
+        capacities = [rng.randint(1, 8) for _ in range(rng.randint(1, 12))]
+        partition = partition_files(
+            [(name, file_weight(size)) for name, size in files], capacities
+        )
+        assigned = [name for batch in partition.assignments for name in batch]
+        assert sorted(assigned) == sorted(name for name, _ in files)
+        weights = {name: file_weight(size) for name, size in files}
+        for batch, load in zip(partition.assignments, partition.loads):
+            assert sum(weights[name] for name in batch) == load
+        slowdowns = [rng.choice([1, 1, 2, 5]) for _ in capacities]
+        _, processed = run_dynamic(
+            partition.assignments, weights, capacities, slowdowns
+        )
+        assert sorted(processed) == sorted(name for name, _ in files)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, nargs="+", default=[200, 2000, 20000])
+    parser.add_argument(
+        "--capacities", type=int, nargs="+", default=[1, 2, 4, 8], help="Workers"
+    )
+    parser.add_argument(
+        "--slowdown",
+        type=float,
+        nargs="+",
+        default=[1, 1, 3, 1],
+        help="Factor de lentitud real de cada cliente",
+    )
+    parser.add_argument("--seed", type=int, default=29)
+    args = parser.parse_args()
+
+    check_partition(args.seed)
+    print("LPT y reparto dinámico: cada archivo procesado exactamente una vez")
+
+    capacities = args.capacities
+    slowdowns = (args.slowdown + [1] * len(capacities))[: len(capacities)]
+    print(
+        f"{'archivos':>9} {'reparto':<8} {'previsto (MB)':>14} {'simulado (MB)':>14} "
+        f"{'/ cota':>7} {'seg':>7}"
+    )
+    for count in args.files:
+        files = make_files(count, args.seed)
+        weights = {name: file_weight(size) for name, size in files}
+        speed = sum(c / s for c, s in zip(capacities, slowdowns))
+        bound = max(sum(weights.values()) / speed, max(weights.values()))
+
+        start = time.perf_counter()
+        even = even_partition(files, len(capacities))
+        even_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        lpt = partition_files(weights.items(), capacities).assignments
+        lpt_seconds = time.perf_counter() - start
+
+        for label, assignments, seconds in (
+            ("parejo", even, even_seconds),
+            ("LPT", lpt, lpt_seconds),
+        ):
+            predicted, actual = evaluate(assignments, weights, capacities, slowdowns)
+            print(
+                f"{count:>9} {label:<8} {predicted / 2**20:>14.1f} "
+                f"{actual / 2**20:>14.1f} {actual / bound:>7.2f} {seconds:>7.3f}"
+            )
+        start = time.perf_counter()
+        actual, _ = run_dynamic(lpt, weights, capacities, slowdowns)
+        print(
+            f"{count:>9} {'dinámico':<8} {predicted / 2**20:>14.1f} "
+            f"{actual / 2**20:>14.1f} {actual / bound:>7.2f} "
+            f"{time.perf_counter() - start:>7.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
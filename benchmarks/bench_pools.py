@@ -0,0 +1,92 @@
+"""
+Benchmark de latencia por lote: pools de workers creados en cada lote (como
+hacía el servidor antes) contra los pools persistentes de `WorkerPoolManager`.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_pools [--batches 20] [--files 8] [--workers 4]
+"""
+
+import argparse
+import concurrent.futures
+import contextlib
+import io
+import os
+import statistics
+import tempfile
+import time
+
+from benchmarks.bench_extractor import generate_text_file
+from src.server import WorkerPoolManager
+from src.worker import process_single_file_wrapper
+
+
+def run_cold(mode, workers, map_input):
+    """Un lote con un executor nuevo, cerrado al terminar."""
+    executor_cls = (
+        concurrent.futures.ThreadPoolExecutor
+        if mode == "threads"
+        else concurrent.futures.ProcessPoolExecutor
+    )
+    with executor_cls(max_workers=workers) as executor:
+        return list(executor.map(process_single_file_wrapper, map_input))
+
+
+def run_warm(manager, mode, workers, map_input):
+    """Un lote sobre el pool persistente del manager."""
+    with manager.lease(mode, workers, len(map_input)) as executor:
+        return list(executor.map(process_single_file_wrapper, map_input))
+
+
+def measure(batches, fn, *args):
+    """Latencias (en ms) de `batches` ejecuciones consecutivas de fn(*args)."""
+    latencies = []
+    for _ in range(batches):
+        start = time.perf_counter()
+        fn(*args)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--batches", type=int, default=20)
+    parser.add_argument("--files", type=int, default=8, help="Archivos por lote")
+    parser.add_argument("--file-kb", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        paths = []
+        for i in range(args.files):
+            path = os.path.join(tmpdir, f"bench_{i}.txt")
+            generate_text_file(path, args.file_kb * 1024, seed=i)
+            paths.append(path)
+
+        print(
+            f"{args.batches} lotes de {args.files} archivos de {args.file_kb} KiB, "
+            f"{args.workers} workers (latencia por lote en ms)"
+        )
+        print(f"{'modo':<8} {'pool':<6} {'media':>8} {'p50':>8} {'max':>8}")
+
+        manager = WorkerPoolManager(idle_timeout=600, max_tasks_per_process=10**9)
+        try:
+            for mode in ("threads", "forks"):
+                map_input = [(p, mode) for p in paths]
+                with contextlib.redirect_stdout(io.StringIO()):
+                    cold = measure(args.batches, run_cold, mode, args.workers, map_input)
+                    warm = measure(
+                        args.batches, run_warm, manager, mode, args.workers, map_input
+                    )
+                for label, lat in (("frío", cold), ("tibio", warm)):
+                    print(
+                        f"{mode:<8} {label:<6} {statistics.mean(lat):8.1f} "
+                        f"{statistics.median(lat):8.1f} {max(lat):8.1f}"
+                    )
+                speedup = statistics.mean(cold) / statistics.mean(warm)
+                print(f"{mode:<8} speedup medio con pool persistente: {speedup:.2f}x")
+        finally:
+            manager.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Benchmark de memoria y velocidad de las representaciones de un proceso
+(`src/process.py`): la clase anterior con `__dict__` por objeto, `Process` con
+`__slots__` y `ProcessTable` (columnas en arreglos tipados, con vistas).
+
+Para cada una mide, con N procesos: la memoria que ocupan (con `tracemalloc`,
+sin contar los nombres de archivo ni los datos de entrada, que son los mismos
+para todas), el tiempo de creación y el de un recorrido que lee y escribe
+atributos como lo hace el simulador. Antes verifica, con una carga chica, que
+`simulate()` dé el mismo resultado con objetos `Process` y con vistas de una
+`ProcessTable`.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_process [--processes 1000000]
+"""
+
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+
+from src.process import Process, ProcessTable
+from src.scheduler import AVAILABLE_SCHEDULERS, SchedulerRR
+from src.simulator import simulate
+
+
+class DictProcess:
+    """`Process` tal como era antes de `__slots__` (un `__dict__` por objeto)."""
+
+    def __init__(self, pid, filename, arrival_time, burst_time, priority=0):
+        self.pid = pid
+        self.filename = filename
+        self.arrival_time = arrival_time
+        self.burst_time = burst_time
+        self.remaining_burst_time = burst_time
+        self.priority = priority
+        self.start_time = -1
+        self.completion_time = -1
+        self.waiting_time = 0
+        self.turnaround_time = 0
+        self.state = "New"
+        self.turnaround_formula = ""
+        self.waiting_formula = ""
+        self.response_ratio = 0.0
+        self.ticks_in_current_burst = 0
+
+
+def make_rows(count, seed):
+    rng = random.Random(seed)
+    return [
+        (i, f"archivo_{i}.txt", rng.randint(0, count), rng.randint(1, 100), i % 5)
+        for i in range(count)
+    ]
+
+
+def build(kind, rows):
+    if kind == "dict":
+        return [DictProcess(*row) for row in rows]
+    if kind == "slots":
+        return [Process(*row) for row in rows]
+    return ProcessTable(rows)
+
+
+def touch(items):
+    """Lo que hace el simulador con cada proceso: leer la ráfaga y escribir."""
+    total = 0
+    for process in items:
+        process.remaining_burst_time = process.burst_time
+        process.start_time = process.arrival_time
+        total += process.remaining_burst_time
+    return total
+
+
+def touch_columns(table):
+    """Lo mismo que `touch`, por columnas."""
+    table.remaining_burst_time[:] = table.burst_time
+    table.start_time[:] = table.arrival_time
+    return sum(table.remaining_burst_time)
+
+
+def check_views(seed):
+    rows = make_rows(300, seed)
+    for name, scheduler_cls in AVAILABLE_SCHEDULERS.items():
+        for num_cpus in (1, 2):
+            scheduler = SchedulerRR(quantum=4) if name == "RR" else scheduler_cls()
+            expected = simulate([Process(*row) for row in rows], scheduler, num_cpus)
+            actual = simulate(ProcessTable(rows).views(), scheduler, num_cpus)
+            assert actual.timeline == expected.timeline, name
+            assert actual.metrics == expected.metrics, name
+
+
+def measure_memory(kind, rows):
+    gc.collect()
+    tracemalloc.start()
+    items = build(kind, rows)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del items
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--processes", type=int, default=1000000)
+    parser.add_argument("--seed", type=int, default=17)
+    args = parser.parse_args()
+
+    check_views(args.seed)
+    print("simulate(): mismo resultado con Process y con vistas de ProcessTable")
+
+    rows = make_rows(args.processes, args.seed)
+    print(
+        f"{'representación':<16} {'memoria':>10} {'bytes/proc':>11} "
+        f"{'crear (s)':>10} {'recorrer (s)':>13}"
+    )
+    for kind in ("dict", "slots", "table"):
+        size = measure_memory(kind, rows)
+        start = time.perf_counter()
+        items = build(kind, rows)
+        build_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        touch(items)
+        touch_seconds = time.perf_counter() - start
+        print(
+            f"{kind:<16} {size / 2**20:>8.1f}MB {size / len(rows):>11.1f} "
+            f"{build_seconds:>10.3f} {touch_seconds:>13.3f}"
+        )
+        if kind == "table":
+            start = time.perf_counter()
+            touch_columns(items)
+            print(
+                f"{'table (cols)':<16} {'':>10} {'':>11} {'':>10} "
+                f"{time.perf_counter() - start:>13.3f}"
+            )
+        del items
+
+
+if __name__ == "__main__":
+    main()
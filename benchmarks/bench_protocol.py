@@ -0,0 +1,123 @@
+"""
+Benchmark del framing de mensajes: el buffer `str` con `split("\\n")` que usaba
+el protocolo v1 original contra `MessageReader` (recv_into sobre un bytearray
+preasignado) en v1 y en v2, con un mensaje grande que llega en muchos `recv`.
+También compara el tamaño en el cable de v1, v2 y v2 con zlib.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_protocol [--results 2000] [--chunk 4096]
+"""
+
+import argparse
+import json
+import socket
+import threading
+import time
+
+from src.protocol import PROTOCOL_V1, PROTOCOL_V2, MessageReader, encode_message
+
+
+def build_message(num_results):
+    """Un PROCESSING_COMPLETE con `num_results` resultados, como el del servidor."""
+    results = [
+        {
+            "filename": f"archivo_{i}.txt",
+            "pid_server": f"THREAD ID_{140000000000000 + i % 8}",
+            "status": "success",
+            "data": {
+                "nombres_encontrados": ["Juan Perez", "Maria Lopez", "Ana Gomez"],
+                "lugares_encontrados": ["Madrid", "Buenos Aires"],
+                "fechas_encontradas": ["12 de enero de 1945", "1990-05-01"],
+                "word_count": 1000 + i,
+            },
+        }
+        for i in range(num_results)
+    ]
+    return {"type": "PROCESSING_COMPLETE", "payload": {"results": results}}
+
+
+def read_legacy(sock, expected):
+    """Lectura original: decodifica cada recv y concatena a un str."""
+    buffer, messages = "", []
+    while len(messages) < expected:
+        data = sock.recv(4096)
+        if not data:
+            break
+        buffer += data.decode("utf-8")
+        while "\n" in buffer:
+            line, buffer = buffer.split("\n", 1)
+            messages.append(json.loads(line))
+    return messages
+
+
+def read_framed(sock, expected, version):
+    reader, messages = MessageReader(), []
+    reader.version = version
+    while len(messages) < expected:
+        if not reader.recv_from(sock):
+            break
+        messages.extend(json.loads(m) for m in reader.messages())
+    return messages
+
+
+def transfer(payload, chunk, read_fn, expected):
+    """Envía `payload` en trozos de `chunk` bytes por un socketpair y lo lee."""
+    sender, receiver = socket.socketpair()
+
+    def send_all():
+        for start in range(0, len(payload), chunk):
+            sender.sendall(payload[start : start + chunk])
+
+    writer = threading.Thread(target=send_all)
+    start = time.perf_counter()
+    writer.start()
+    messages = read_fn(receiver, expected)
+    elapsed = time.perf_counter() - start
+    writer.join()
+    sender.close()
+    receiver.close()
+    return elapsed, messages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--results", type=int, default=2000)
+    parser.add_argument("--messages", type=int, default=5)
+    parser.add_argument("--chunk", type=int, default=4096)
+    args = parser.parse_args()
+
+    message = build_message(args.results)
+    cases = [
+        ("v1 str+split", encode_message(message), lambda s, n: read_legacy(s, n)),
+        (
+            "v1 recv_into",
+            encode_message(message),
+            lambda s, n: read_framed(s, n, PROTOCOL_V1),
+        ),
+        (
+            "v2",
+            encode_message(message, PROTOCOL_V2),
+            lambda s, n: read_framed(s, n, PROTOCOL_V2),
+        ),
+        (
+            "v2 + zlib",
+            encode_message(message, PROTOCOL_V2, compress=True),
+            lambda s, n: read_framed(s, n, PROTOCOL_V2),
+        ),
+    ]
+
+    print(
+        f"{args.messages} mensajes de {args.results} resultados, "
+        f"enviados en trozos de {args.chunk} bytes"
+    )
+    print(f"{'framing':<14} {'bytes/mensaje':>14} {'tiempo (ms)':>12}")
+    for label, frame, read_fn in cases:
+        elapsed, messages = transfer(
+            frame * args.messages, args.chunk, read_fn, args.messages
+        )
+        assert messages == [message] * args.messages, f"{label}: mensajes distintos"
+        print(f"{label:<14} {len(frame):>14} {elapsed * 1000:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
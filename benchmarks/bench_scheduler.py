@@ -0,0 +1,123 @@
+"""
+Benchmark de las colas Ready de `src/scheduler.py`: una lista simple (el
+scheduler hace `sort` + `pop(0)` en cada llamada a `schedule`) contra
+`ReadyQueue` (heap, O(log n) por operación).
+
+Simula un CPU no preemptivo: en cada despacho entran a la cola los procesos que
+ya llegaron y el scheduler elige uno. Antes de medir verifica que las dos
+variantes despachen exactamente en el mismo orden, y que `ReadyQueue.update`
+(SRTF con restantes que cambian) respete el desempate por orden de inserción.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_scheduler [--processes 1000 10000 50000]
+"""
+
+import argparse
+import random
+import time
+
+from src.process import Process
+from src.scheduler import (
+    SchedulerFCFS,
+    SchedulerPriorityNP,
+    SchedulerSJF,
+    SchedulerSRTF,
+)
+
+
+SCHEDULERS = {
+    "FCFS": SchedulerFCFS,
+    "SJF": SchedulerSJF,
+    "SRTF": SchedulerSRTF,
+    "Priority_NP": SchedulerPriorityNP,
+}
+
+
+def make_processes(count, seed):
+    """Procesos con llegadas, ráfagas y prioridades aleatorias (con empates)."""
+    rng = random.Random(seed)
+    processes = [
+        Process(
+            pid=i,
+            filename=f"archivo_{i}.txt",
+            arrival_time=rng.randint(0, count * 2),
+            burst_time=rng.randint(1, 10),
+            priority=rng.randint(0, 5),
+        )
+        for i in range(count)
+    ]
+    processes.sort(key=lambda p: p.arrival_time)
+    return processes
+
+
+def run(processes, ready_queue, scheduler):
+    """Despacha todos los procesos con `scheduler`; devuelve los PIDs en orden."""
+    order, time_now, next_arrival = [], 0, 0
+    while next_arrival < len(processes) or ready_queue:
+        while (
+            next_arrival < len(processes)
+            and processes[next_arrival].arrival_time <= time_now
+        ):
+            ready_queue.append(processes[next_arrival])
+            next_arrival += 1
+        if not ready_queue:
+            time_now = processes[next_arrival].arrival_time
+            continue
+        process = scheduler.schedule(ready_queue, time_now, [], 1)
+        order.append(process.pid)
+        time_now += process.burst_time
+    return order
+
+
+def check_srtf_updates(seed, count=2000):
+    """
+    Restantes que bajan mientras los procesos están en la cola. La referencia
+    es el mínimo de la lista en orden de inserción: con claves que cambian,
+    `sort` + `pop(0)` desempata según el orden que dejó el sort anterior.
+    """
+    rng = random.Random(seed)
+    scheduler = SchedulerSRTF()
+    processes = make_processes(count, seed)
+    as_list = list(processes)
+    as_heap = scheduler.create_ready_queue(processes)
+    while as_list:
+        for process in rng.sample(as_list, min(5, len(as_list))):
+            process.remaining_burst_time = max(0, process.remaining_burst_time - 1)
+            as_heap.update(process)
+        expected = min(as_list, key=scheduler.sort_key)
+        as_list.remove(expected)
+        assert scheduler.schedule(as_heap, 0, [], 1) is expected
+    assert not as_heap
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--processes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    check_srtf_updates(args.seed)
+    print("SRTF con update(): mismo orden que la selección sobre la lista")
+
+    print(
+        f"{'algoritmo':<12} {'procesos':>9} {'lista':>9} {'heap':>8} {'speedup':>8}"
+    )
+    for count in args.processes:
+        for name, scheduler_cls in SCHEDULERS.items():
+            scheduler = scheduler_cls()
+            variants = ([], scheduler.create_ready_queue())
+            orders, times = [], []
+            for ready_queue in variants:
+                processes = make_processes(count, args.seed)
+                start = time.perf_counter()
+                orders.append(run(processes, ready_queue, scheduler))
+                times.append(time.perf_counter() - start)
+            assert orders[0] == orders[1], f"{name}: orden distinto"
+            print(
+                f"{name:<12} {count:>9} {times[0]:>8.3f}s {times[1]:>7.3f}s "
+                f"{times[0] / times[1]:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+Benchmark de la devolución de resultados de un pool de procesos: por el pipe
+del `ProcessPoolExecutor` (pickle) contra la arena de memoria compartida de
+`src/shared_results.py`.
+
+Primero verifica que codificar y decodificar devuelva el mismo resultado
+(incluidos textos con caracteres no UTF-8 válidos) y que el buffer circular
+nunca pise un registro sin leer, con lecturas en cualquier orden. Después
+cada worker devuelve resultados con la forma de `process_single_file_wrapper`
+(todos por la arena, sin el mínimo `MIN_SHARED_ENTITIES`) y se mide el tiempo total del lote y el tiempo de CPU del servidor (el hilo
+que recibe los resultados más el que los usa).
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_shared_results [--tasks 2000] [--workers 4]
+        [--entities 10 1000 10000]
+"""
+
+import argparse
+import collections
+import concurrent.futures
+import pickle
+import random
+import struct
+import time
+
+from src.shared_results import (
+    ResultArena,
+    SharedResult,
+    attach_worker,
+    decode_result,
+    encode_result,
+    resolve_result,
+    share_result,
+)
+
+
+NOMBRES = [
+    "John Smith", "Anna Karlsson", "José Núñez", "Åsa Öberg", "nombre\udcffroto"
+]
+LUGARES = ["New York", "Malmö", "Madrid", "Göteborg", "A Coruña", "Los Angeles"]
+
+
+def make_result(rng, entities, overlap=False):
+    """
+    Un resultado como los de `process_single_file_wrapper`. Con `overlap`,
+    algunos lugares también aparecen como nombres (ej. "New York").
+    """
+    nombres = {
+        f"{rng.choice(NOMBRES)} {rng.randrange(entities * 4)}" for _ in range(entities)
+    }
+    lugares = set(rng.sample(LUGARES, rng.randint(0, len(LUGARES))))
+    if overlap:
+        nombres |= set(rng.sample(sorted(lugares), len(lugares) // 2))
+        nombres.add("")
+    fechas = {
+        f"{rng.randint(1, 28)} de enero de {rng.randint(1900, 2024)}"
+        for _ in range(entities // 4)
+    }
+    return {
+        "pid_server": f"FORK PID_{rng.randrange(99999)}",
+        "filename": f"archivo_{rng.randrange(10**6)}.txt",
+        "data": {
+            "nombres_encontrados": sorted(nombres),
+            "fechas_encontradas": sorted(fechas),
+            "lugares_encontrados": sorted(lugares),
+            "word_count": rng.randrange(2**40),
+        },
+        "status": "success",
+        "error": "",
+    }
+
+
+def check_encoding(seed, cases=500):
+    rng = random.Random(seed)
+    for _ in range(cases):
+        result = make_result(rng, rng.choice([0, 1, 5, 200]), rng.random() < 0.5)
+        assert decode_result(encode_result(result)) == result
+
+
+def record_length(arena, handle):
+    """Largo del registro de `handle` (después del encabezado de la arena)."""
+    return struct.unpack_from("<I", arena.shm.buf, 24 + handle.offset)[0]
+
+
+def check_arena(seed, steps=20000):
+    """Reservas y lecturas al azar sobre una arena chica (vuelve al principio)."""
+    rng = random.Random(seed)
+    arena = ResultArena.create(16 * 1024)
+    live, full = collections.deque(), 0
+    try:
+        for _ in range(steps):
+            if live and (rng.random() < 0.5 or len(live) > 40):
+                handle, expected = live.popleft() if rng.random() < 0.7 else live.pop()
+                assert arena.read(handle) == expected
+            else:
+                result = make_result(rng, rng.choice([0, 3, 20]), rng.random() < 0.5)
+                handle = arena.write(result)
+                if handle is None:
+                    full += 1
+                    continue
+                live.append((handle, result))
+            spans = sorted(
+                (h.offset, h.offset + record_length(arena, h)) for h, _ in live
+            )
+            assert all(a[1] <= b[0] for a, b in zip(spans, spans[1:])), spans
+        for handle, expected in live:
+            assert arena.read(handle) == expected
+    finally:
+        arena.close()
+    return full
+
+
+_template = None
+
+
+def set_template(entities, arena_args):
+    global _template
+    _template = make_result(random.Random(entities), entities)
+    if arena_args is not None:
+        attach_worker(*arena_args)
+
+
+def task(i):
+    """Tarea del worker: devuelve una copia del resultado de ejemplo."""
+    result = dict(_template, filename=f"archivo_{i}.txt")
+    return share_result(result, min_entities=0)
+
+
+def run(tasks, workers, entities, use_arena):
+    arena = ResultArena.create(16 * 1024 * 1024) if use_arena else None
+    arena_args = (arena.name, arena.lock) if arena else None
+    try:
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=set_template,
+            initargs=(entities, arena_args),
+        ) as executor:
+            list(executor.map(task, range(workers * 2)))  # arrancar los workers
+            count = shared = 0
+            start, cpu = time.perf_counter(), time.process_time()
+            futures = [executor.submit(task, i) for i in range(tasks)]
+            for future in concurrent.futures.as_completed(futures):
+                result = future.result()
+                shared += isinstance(result, SharedResult)
+                result = resolve_result(result)
+                count += len(result["data"]["nombres_encontrados"])
+            wall = time.perf_counter() - start
+            cpu = time.process_time() - cpu
+    finally:
+        if arena is not None:
+            arena.close()
+    return wall, cpu, count, shared
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--entities", type=int, nargs="+", default=[10, 1000, 10000])
+    parser.add_argument("--seed", type=int, default=22)
+    args = parser.parse_args()
+
+    check_encoding(args.seed)
+    full = check_arena(args.seed)
+    print(f"Codificación y arena verificadas ({full} veces sin lugar, por pickle)")
+
+    print(
+        f"{'entidades':>9} {'bytes pickle':>12} {'bytes arena':>11} "
+        f"{'pipe (s)':>9} {'arena (s)':>9} {'CPU pipe':>9} {'CPU arena':>9} "
+        f"{'por arena':>9}"
+    )
+    for entities in args.entities:
+        sample = make_result(random.Random(entities), entities)
+        pickle_bytes = len(pickle.dumps(sample, protocol=pickle.HIGHEST_PROTOCOL))
+        arena_bytes = len(encode_result(sample))
+        tasks = max(args.tasks * 10 // max(entities, 10), 50)
+        wall_pipe, cpu_pipe, count_pipe, _ = run(tasks, args.workers, entities, False)
+        wall_arena, cpu_arena, count_arena, shared = run(
+            tasks, args.workers, entities, True
+        )
+        assert count_pipe == count_arena
+        print(
+            f"{entities:>9} {pickle_bytes:>12} {arena_bytes:>11} "
+            f"{wall_pipe:>9.3f} {wall_arena:>9.3f} {cpu_pipe:>9.3f} {cpu_arena:>9.3f} "
+            f"{shared:>4}/{tasks}"
+        )
+
+
+if __name__ == "__main__":
+    main()
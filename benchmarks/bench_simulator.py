@@ -0,0 +1,150 @@
+"""
+Benchmark del motor de simulación (`src/simulator.py`): compara una
+simulación que avanza de a un tick (como hacía `simulation_step_visual` en la
+GUI, sin dibujar) contra el motor por eventos, que salta entre llegadas,
+finalizaciones y vencimientos de quantum.
+
+Primero verifica, con cargas aleatorias chicas, que ambas den los mismos
+tiempos de inicio y fin para cada algoritmo y cantidad de CPUs, y que los
+tramos de la línea de tiempo sumen la ráfaga de cada proceso. Después mide
+ambas con cargas más grandes (la de ticks solo hasta 2000 procesos).
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_simulator [--processes 1000 100000] [--cpus 4]
+                                         [--max-burst 100]
+"""
+
+import argparse
+import heapq
+import random
+import time
+
+from src.process import Process
+from src.scheduler import AVAILABLE_SCHEDULERS, SchedulerMLFQ, SchedulerRR
+from src.simulator import reset_process, simulate
+
+
+def make_processes(count, seed, max_burst=20):
+    rng = random.Random(seed)
+    return [
+        Process(
+            pid=i,
+            filename=f"archivo_{i}.txt",
+            arrival_time=rng.randint(0, count * max_burst // 8),
+            burst_time=rng.randint(1, max_burst),
+            priority=rng.randint(0, 5),
+        )
+        for i in range(count)
+    ]
+
+
+def make_scheduler(name):
+    if name == "RR":
+        return SchedulerRR(quantum=3)
+    if name == "MLFQ":
+        return SchedulerMLFQ(levels=3, quantum=2, boost_interval=15)
+    return AVAILABLE_SCHEDULERS[name]()
+
+
+def simulate_by_ticks(processes, scheduler, num_cpus):
+    """Referencia: un tick por iteración, con el mismo orden que el motor."""
+    pending = sorted(processes, key=lambda p: p.arrival_time)
+    for process in pending:
+        reset_process(process)
+    ready = scheduler.create_ready_queue()
+    running = [None] * num_cpus  # [proceso, ticks en el tramo, quantum del tramo]
+    free_cpus = list(range(num_cpus))
+    now = next_arrival = done = 0
+    while done < len(pending):
+        for cpu, slot in enumerate(running):
+            if slot is None:
+                continue
+            process, ticks, quantum = slot
+            if process.remaining_burst_time == 0:
+                process.completion_time = now
+                done += 1
+            elif quantum is not None and ticks == quantum:
+                process.ticks_in_current_burst = ticks
+                ready.push(process)
+            else:
+                continue
+            running[cpu] = None
+            heapq.heappush(free_cpus, cpu)
+        while next_arrival < len(pending) and pending[next_arrival].arrival_time <= now:
+            ready.push(pending[next_arrival])
+            next_arrival += 1
+        while free_cpus and ready:
+            running_now = [slot[0] for slot in running if slot is not None]
+            process = scheduler.schedule(ready, now, running_now, len(free_cpus))
+            cpu = heapq.heappop(free_cpus)
+            running[cpu] = [process, 0, scheduler.time_slice(process)]
+        if scheduler.preemptive:
+            while ready and not free_cpus:
+                worst_cpu = max(
+                    range(num_cpus), key=lambda c: scheduler.sort_key(running[c][0])
+                )
+                worst = running[worst_cpu][0]
+                if not scheduler.sort_key(ready.peek()) < scheduler.sort_key(worst):
+                    break
+                worst.ticks_in_current_burst = running[worst_cpu][1]
+                ready.push(worst)
+                process = ready.pop()
+                running[worst_cpu] = [process, 0, scheduler.time_slice(process)]
+        for slot in running:
+            if slot is not None:
+                if slot[0].start_time == -1:
+                    slot[0].start_time = now
+                slot[0].remaining_burst_time -= 1
+                slot[1] += 1
+        now += 1
+    return {p.pid: (p.start_time, p.completion_time) for p in pending}
+
+
+def check_equivalence(seed):
+    rng = random.Random(seed)
+    cases = 0
+    for name in AVAILABLE_SCHEDULERS:
+        for num_cpus in (1, 2, 3):
+            for _ in range(20):
+                processes = make_processes(rng.randint(1, 40), rng.randrange(10**6))
+                expected = simulate_by_ticks(processes, make_scheduler(name), num_cpus)
+                result = simulate(processes, make_scheduler(name), num_cpus)
+                ran = {}
+                for segment in result.timeline:
+                    duration = segment.end - segment.start
+                    ran[segment.pid] = ran.get(segment.pid, 0) + duration
+                assert ran == {p.pid: p.burst_time for p in processes}
+                actual = {p.pid: (p.start_time, p.completion_time) for p in processes}
+                assert actual == expected, f"{name} con {num_cpus} CPUs: distinto"
+                cases += 1
+    return cases
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--processes", type=int, nargs="+", default=[1000, 100000])
+    parser.add_argument("--cpus", type=int, default=4)
+    parser.add_argument("--max-burst", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+
+    cases = check_equivalence(args.seed)
+    print(f"{cases} cargas aleatorias: mismo resultado por ticks y por eventos")
+
+    print(f"{'algoritmo':<12} {'procesos':>9} {'ticks (s)':>10} {'eventos (s)':>12}")
+    for count in args.processes:
+        for name in AVAILABLE_SCHEDULERS:
+            processes = make_processes(count, args.seed, args.max_burst)
+            tick_seconds = float("nan")
+            if count <= 2000:
+                start = time.perf_counter()
+                simulate_by_ticks(processes, make_scheduler(name), args.cpus)
+                tick_seconds = time.perf_counter() - start
+            start = time.perf_counter()
+            simulate(processes, make_scheduler(name), args.cpus, record_events=False)
+            event_seconds = time.perf_counter() - start
+            print(f"{name:<12} {count:>9} {tick_seconds:>10.3f} {event_seconds:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark del modo "threads" del servidor según cómo se ejecuta
+(`THREADS_BACKEND` en `src/server.py`): hilos con el GIL, subintérpretes con
+su propio GIL (Python 3.14+), procesos, y como referencia el modo "forks".
+
+Matriz modo × cantidad de workers × tamaño de archivo: para cada celda se
+procesan `--files` archivos de ese tamaño con un pool de `WorkerPoolManager`
+(ya caliente) y se informa el tiempo y la aceleración respecto de 1 worker
+del mismo modo. Con el GIL, "threads con hilos" se queda cerca de 1x aunque
+haya varias CPUs. Verifica además que todos los modos den los mismos
+resultados.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_threads_backend [--workers 1 2 4 8]
+        [--sizes-kb 64 512 2048] [--files 16]
+"""
+
+import argparse
+import concurrent.futures
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_extractor import generate_text_file
+from src.server import WorkerPoolManager, resolve_result, resolve_threads_backend
+from src.worker import gil_enabled, process_file_task
+
+
+def available_modes():
+    """(etiqueta, modo del cliente, ejecución del modo threads)."""
+    modes = [
+        ("threads (hilos)", "threads", "threads"),
+        ("threads (procesos)", "threads", "processes"),
+    ]
+    if hasattr(concurrent.futures, "InterpreterPoolExecutor"):
+        modes.insert(1, ("threads (subintérpretes)", "threads", "interpreters"))
+    modes.append(("forks", "forks", "processes"))
+    return modes
+
+
+def run(manager, mode, workers, paths):
+    tasks = [(path, mode) for path in paths]
+    with manager.lease(mode, workers, len(tasks)) as executor:
+        list(executor.map(process_file_task, tasks[:workers]))  # calentar
+        start = time.perf_counter()
+        results = [
+            resolve_result(shared)
+            for shared, _, _ in executor.map(process_file_task, tasks)
+        ]
+        seconds = time.perf_counter() - start
+    return seconds, [r["data"] for r in results]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--sizes-kb", type=int, nargs="+", default=[64, 512, 2048])
+    parser.add_argument("--files", type=int, default=16)
+    args = parser.parse_args()
+
+    print(
+        f"Python {sys.version.split()[0]}, {os.cpu_count()} CPUs, "
+        f"GIL {'activo' if gil_enabled() else 'desactivado'}, "
+        f"THREADS_BACKEND='auto' -> {resolve_threads_backend('auto')}"
+    )
+    header = f"{'modo':<26} {'KB':>6}" + "".join(
+        f" {f'x{w} (s)':>9} {'acel.':>6}" for w in args.workers
+    )
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size_kb in args.sizes_kb:
+            paths = []
+            for i in range(args.files):
+                path = os.path.join(tmp_dir, f"{size_kb}kb_{i}.txt")
+                generate_text_file(path, size_kb * 1024, seed=i)
+                paths.append(path)
+
+            print(f"\n{header}")
+            expected = None
+            for label, mode, backend in available_modes():
+                manager = WorkerPoolManager(
+                    idle_timeout=600,
+                    max_tasks_per_process=10**6,
+                    result_arena_bytes=16 * 1024 * 1024,
+                    threads_backend=backend,
+                )
+                row, base = f"{label:<26} {size_kb:>6}", None
+                try:
+                    for workers in args.workers:
+                        seconds, data = run(manager, mode, workers, paths)
+                        if expected is None:
+                            expected = data
+                        assert data == expected, f"resultados distintos en {label}"
+                        base = base or seconds
+                        row += f" {seconds:>9.3f} {base / seconds:>5.2f}x"
+                finally:
+                    manager.shutdown()
+                if manager.threads_backend != backend:
+                    row += f"  (se usó {manager.threads_backend})"
+                print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,14 +9,16 @@ import os
 import sys
 
 from .process import Process
-from .scheduler import (
-    AVAILABLE_SCHEDULERS,
-    SchedulerFCFS,
-    SchedulerRR,
-    SchedulerSJF,
-    SchedulerHRRN,
-    SchedulerPriorityNP,
+from .protocol import (
+    COMPRESSION_ZLIB,
+    PROTOCOL_V1,
+    PROTOCOL_V2,
+    MessageReader,
+    ProtocolError,
+    encode_message,
 )
+from .scheduler import AVAILABLE_SCHEDULERS, SchedulerFCFS
+from .simulator import EVENT_COMPLETE, EVENT_DISPATCH, simulate
 
 
 class ClientApp:
@@ -33,6 +35,9 @@ class ClientApp:
         self.receive_thread = None
         self.client_socket = None
         self.connected = False
+        # Versión de protocolo y compresión para los envíos (ver protocol.py)
+        self.send_lock = threading.Lock()
+        self.send_protocol = (PROTOCOL_V1, False)
         self.server_addr = tk.StringVar(value="127.0.0.1")
         self.server_port = tk.StringVar(value="65432")
         self.event_name_var = tk.StringVar(value="data_event")
@@ -58,15 +63,22 @@ class ClientApp:
             "MsgErrorServidor",
         ]
         self.server_results_for_csv = []
+        # Filas de la tabla de resultados de cada evento: (resultado, id de fila)
+        self.result_rows_by_event = {}
 
         # Variables para la simulación visual
         self.server_assigned_files = []
         self.files_for_simulation_vars = {}
         self.process_params_entries = {}
         self.processes_to_simulate = []
-        self.ready_queue_sim = []
-        self.running_processes_sim = []
         self.completed_processes_sim = []
+        # Reproducción de la línea de tiempo calculada por simulator.py
+        self.simulation_result_sim = None
+        self.processes_by_pid_sim = {}
+        self.replay_events_sim = {}
+        self.replay_ticks_sim = {}
+        self.replay_times_sim = []
+        self.replay_index_sim = 0
         self.simulation_time_sim = 0
         self.simulation_running_sim = False
         self.process_pid_counter_sim = 0
@@ -914,6 +926,7 @@ class ClientApp:
             port = int(port_str)
             self.client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             self.client_socket.connect((ip, port))
+            self.send_protocol = (PROTOCOL_V1, False)
             self.connected = True
             self.status_label.config(text=f"Conectado a {ip}:{port}")
 
@@ -967,8 +980,11 @@ class ClientApp:
         """Envía un mensaje JSON al servidor."""
         if self.connected and self.client_socket:
             try:
-                payload = json.dumps(message) + "\n"
-                self.client_socket.sendall(payload.encode("utf-8"))
+                with self.send_lock:
+                    version, compress = self.send_protocol
+                    self.client_socket.sendall(
+                        encode_message(message, version, compress)
+                    )
             except (BrokenPipeError, ConnectionResetError):
                 self.disconnect_server()
                 messagebox.showerror(
@@ -981,30 +997,57 @@ class ClientApp:
         else:
             messagebox.showwarning("Envío", "No estás conectado.")
 
+    def request_protocol_upgrade(self, welcome_payload):
+        """
+        Si el WELCOME anuncia el protocolo v2, envía HELLO (última línea v1) y
+        pasa a enviar frames v2. Se llama desde el hilo de escucha.
+        """
+        server_info = welcome_payload.get("server_info", {})
+        if PROTOCOL_V2 not in server_info.get("protocols", [PROTOCOL_V1]):
+            return
+        compression = None
+        if COMPRESSION_ZLIB in server_info.get("compression", []):
+            compression = COMPRESSION_ZLIB
+
+        hello = {
+            "type": "HELLO",
+            "payload": {"version": PROTOCOL_V2, "compression": compression},
+        }
+        with self.send_lock:
+            self.client_socket.sendall(encode_message(hello))
+            self.send_protocol = (PROTOCOL_V2, compression is not None)
+
     def listen_to_server(self):
         """Hilo para escuchar mensajes del servidor."""
-        buffer = ""
+        reader = MessageReader()
         while self.connected and self.client_socket:
             try:
-                data = self.client_socket.recv(4096)
-                if not data:
+                received = reader.recv_from(self.client_socket)
+                if not received:
                     if self.connected:
                         self.message_queue.put(
                             {"type": "ERROR", "payload": "Servidor desconectado."}
                         )
                     break
 
-                buffer += data.decode("utf-8")
-
-                while "\n" in buffer:
-                    message_str, buffer = buffer.split("\n", 1)
-                    if not message_str.strip():
+                for message_bytes in reader.messages():
+                    if not message_bytes.strip():
                         continue
                     try:
-                        message = json.loads(message_str)
-                        self.message_queue.put(message)
+                        message = json.loads(message_bytes)
                     except json.JSONDecodeError:
-                        print(f"Error decodificando parte del mensaje: {message_str}")
+                        print(f"Error decodificando parte del mensaje: {message_bytes!r}")
+                        continue
+
+                    # La negociación del protocolo se resuelve en este hilo.
+                    if message.get("type") == "WELCOME":
+                        self.request_protocol_upgrade(message.get("payload", {}))
+                    elif message.get("type") == "ACK_HELLO":
+                        reader.version = message.get("payload", {}).get(
+                            "version", PROTOCOL_V1
+                        )
+                        continue
+                    self.message_queue.put(message)
 
             except (ConnectionResetError, BrokenPipeError):
                 if self.connected:
@@ -1012,6 +1055,12 @@ class ClientApp:
                         {"type": "ERROR", "payload": "Conexión perdida."}
                     )
                 break
+            except ProtocolError as e:
+                if self.connected:
+                    self.message_queue.put(
+                        {"type": "ERROR", "payload": f"Error de protocolo: {e}"}
+                    )
+                break
             except socket.error as e:
                 if self.connected:
                     self.message_queue.put(
@@ -1107,6 +1156,9 @@ class ClientApp:
             elif msg_type == "START_PROCESSING":
                 self.server_assigned_files = payload.get("files", [])
                 event = payload.get("event")
+                # Solo se reemplazan los resultados anteriores de este evento:
+                # los de otros lotes en curso siguen en la tabla.
+                self.clear_event_results(event)
                 num_files = len(self.server_assigned_files)
                 self.status_label.config(
                     text=f"Servidor inició proc. evento '{event}'. Archivos: {num_files}"
@@ -1114,6 +1166,21 @@ class ClientApp:
                 if self.server_assigned_files:
                     self.display_file_selection_ui()
 
+            elif msg_type == "FILE_RESULT":
+                # Resultado de un archivo, enviado apenas el servidor lo termina.
+                result = payload.get("result", {})
+                done = payload.get("done", 0)
+                total = payload.get("total", 0)
+                self.server_results_for_csv.append(result)
+                row = self.insert_result_row(result)
+                self.result_rows_by_event.setdefault(payload.get("event"), []).append(
+                    (result, row)
+                )
+                self.save_csv_button.config(state=tk.NORMAL)
+                self.status_label.config(
+                    text=f"Resultados de '{payload.get('event')}': {done}/{total} archivos."
+                )
+
             elif msg_type == "PROCESSING_COMPLETE":
                 event = payload.get("event")
                 status = payload.get("status")
@@ -1121,7 +1188,33 @@ class ClientApp:
                     text=f"Servidor completó proc. '{event}'. Estado: {status}"
                 )
 
-                if status == "success":
+                files = payload.get("files")
+                if files is not None and files != self.server_assigned_files:
+                    # Reparto dinámico: los archivos que este cliente terminó
+                    # procesando (con los robados a otros lotes).
+                    selected = {
+                        name
+                        for name, var in self.files_for_simulation_vars.items()
+                        if var.get()
+                    }
+                    self.server_assigned_files = files
+                    self.display_file_selection_ui()
+                    for name in selected & set(files):
+                        self.files_for_simulation_vars[name].set(True)
+
+                if status == "success" and payload.get("streamed"):
+                    # Los resultados ya llegaron uno a uno por FILE_RESULT.
+                    stolen = payload.get("stolen_count")
+                    self.status_label.config(
+                        text=(
+                            f"Servidor completó proc. '{event}': "
+                            f"{payload.get('success_count', 0)} OK, "
+                            f"{payload.get('error_count', 0)} con error, "
+                            f"{payload.get('duration_seconds', 0):.2f}s"
+                            + (f", {stolen} robados." if stolen else ".")
+                        )
+                    )
+                elif status == "success":
                     self.server_results_for_csv = payload.get("results", [])
                     self.display_server_results()
                     self.save_csv_button.config(state=tk.NORMAL)
@@ -1350,7 +1443,8 @@ class ClientApp:
         show_quantum = False
 
         if scheduler_class:
-            if algo == "RR":
+            if algo in ("RR", "MLFQ"):
+                # En MLFQ es el quantum del nivel 0; cada nivel lo duplica.
                 quantum_val = self.quantum_var.get()
                 self.scheduler_sim = scheduler_class(
                     quantum=quantum_val if quantum_val > 0 else 2
@@ -1383,23 +1477,41 @@ class ClientApp:
                     widget.pack_forget()
 
         if show_quantum:
+            self.quantum_label.config(
+                text="Quantum (RR):" if algo == "RR" else "Quantum nivel 0:"
+            )
             self.quantum_label.grid(row=1, column=0, padx=5, pady=2, sticky="w")
             self.quantum_spinbox.grid(row=1, column=1, padx=5, pady=2, sticky="w")
         else:
             self.quantum_label.grid_forget()
             self.quantum_spinbox.grid_forget()
 
+        # Cambiar de algoritmo descarta la reproducción en curso.
+        self.simulation_running_sim = False
+        self.simulation_result_sim = None
+        self.start_sim_button.config(text="Iniciar Simulación")
+
         self.status_label.config(text=f"Algoritmo simulación: {self.scheduler_sim}")
         self.root.update_idletasks()
         if hasattr(self, "scrollable_params_frame"):
             self.params_canvas.config(scrollregion=self.params_canvas.bbox("all"))
 
     def start_simulation_visual(self):
-        """Inicia o pausa la simulación visual de scheduling."""
+        """Inicia, pausa o reanuda la simulación visual de scheduling."""
+        if self.simulation_running_sim:
+            self.simulation_running_sim = False
+            self.start_sim_button.config(text="Reanudar Sim. Visual")
+            self.status_label.config(text="Simulación visual pausada.")
+            return
+
+        if self.simulation_result_sim is not None:
+            self.simulation_running_sim = True
+            self.start_sim_button.config(text="Pausar Sim. Visual")
+            self.simulation_step_visual()
+            return
+
         self.processes_to_simulate.clear()
         self.proc_tree_sim.delete(*self.proc_tree_sim.get_children())
-        self.ready_queue_sim.clear()
-        self.running_processes_sim.clear()
         self.completed_processes_sim.clear()
         self.gantt_canvas.delete("all")
         self.simulation_time_sim = 0
@@ -1455,183 +1567,98 @@ class ClientApp:
             self.start_sim_button.config(state=tk.NORMAL)
             return
 
-        if not self.simulation_running_sim:
-            self.simulation_running_sim = True
-            self.start_sim_button.config(text="Pausar Sim. Visual")
-            self.status_label.config(text="Simulación visual iniciada...")
-            self.simulation_step_visual()
+        # La simulación completa se calcula de una vez; la GUI la reproduce.
+        result = simulate(
+            self.processes_to_simulate,
+            self.scheduler_sim,
+            self.num_workers_for_sim_display,
+        )
+        self.prepare_replay_sim(result)
 
-            if hasattr(self, "selected_files_for_processing"):
-                self.send_message(
-                    {
-                        "type": "PROCESS_FILES",
-                        "payload": {
-                            "event": self.event_name_var.get(),
-                            "files": self.selected_files_for_processing,
-                        },
-                    }
+        self.simulation_running_sim = True
+        self.start_sim_button.config(text="Pausar Sim. Visual")
+        self.status_label.config(text="Simulación visual iniciada...")
+        self.update_gantt_display_sim(0, [])
+        self.simulation_step_visual()
+
+        if hasattr(self, "selected_files_for_processing"):
+            event = self.event_name_var.get()
+            # PROCESS_FILES no recibe START_PROCESSING: los resultados
+            # anteriores del evento se quitan al pedirlo.
+            self.clear_event_results(event)
+            self.send_message(
+                {
+                    "type": "PROCESS_FILES",
+                    "payload": {
+                        "event": event,
+                        "files": self.selected_files_for_processing,
+                    },
+                }
+            )
+
+    def prepare_replay_sim(self, result):
+        """Indexa por instante la línea de tiempo calculada por el simulador."""
+        self.simulation_result_sim = result
+        self.processes_by_pid_sim = {p.pid: p for p in result.processes}
+
+        self.replay_events_sim = {}
+        for event in result.events:
+            self.replay_events_sim.setdefault(event.time, []).append(event)
+
+        self.replay_ticks_sim = {}
+        for segment in result.timeline:
+            for tick in range(segment.start, segment.end):
+                self.replay_ticks_sim.setdefault(tick, []).append(
+                    (segment.pid, segment.cpu)
                 )
 
-        else:
-            self.simulation_running_sim = False
-            self.start_sim_button.config(text="Reanudar Sim. Visual")
-            self.status_label.config(text="Simulación visual pausada.")
+        self.replay_times_sim = sorted(self.replay_events_sim)
+        self.replay_index_sim = 0
 
     def simulation_step_visual(self):
-        """Ejecuta un paso (tick) de la simulación visual."""
-        if not self.simulation_running_sim:
+        """
+        Reproduce un paso de la simulación: aplica los eventos de un instante y
+        dibuja el Gantt hasta el instante con eventos siguiente.
+        """
+        if not self.simulation_running_sim or self.simulation_result_sim is None:
             return
 
-        current_time = self.simulation_time_sim
+        times = self.replay_times_sim
+        current_time = times[self.replay_index_sim]
+        self.simulation_time_sim = current_time
         self.status_label.config(text=f"Tiempo Sim: {current_time}")
 
-        remaining_to_schedule = []
-        for proc in self.processes_to_simulate:
-            if proc.arrival_time <= current_time:
-                proc.state = "Ready"
-                self.ready_queue_sim.append(proc)
-                self.update_process_table_sim(proc.pid, {"state": "Ready"})
-            else:
-                remaining_to_schedule.append(proc)
-        self.processes_to_simulate = remaining_to_schedule
-
-        temp_running = []
-        for proc in self.running_processes_sim:
-            if proc.remaining_burst_time <= 0:
-                self.handle_process_completion_sim(proc, current_time)
-            else:
-                temp_running.append(proc)
-        self.running_processes_sim = temp_running
-
-        available_threads_sim = self.num_workers_for_sim_display - len(
-            self.running_processes_sim
-        )
-
-        if (
-            isinstance(self.scheduler_sim, SchedulerHRRN)
-            or isinstance(self.scheduler_sim, SchedulerSJF)
-            or isinstance(self.scheduler_sim, SchedulerFCFS)
-            or isinstance(self.scheduler_sim, SchedulerPriorityNP)
-        ):
-            if not self.running_processes_sim and self.ready_queue_sim:
-                arrived = [
-                    p for p in self.ready_queue_sim if p.arrival_time <= current_time
-                ]
-                if not arrived:
-                    next_arrival = min(p.arrival_time for p in self.ready_queue_sim)
-                    self.simulation_time_sim = next_arrival
-                    self.root.after(
-                        self.simulation_update_ms, self.simulation_step_visual
-                    )
-                    return
-
-                next_process = self.scheduler_sim.schedule(
-                    self.ready_queue_sim,
-                    self.simulation_time_sim,
-                    self.running_processes_sim,
-                    1,
+        for event in self.replay_events_sim[current_time]:
+            process = self.processes_by_pid_sim[event.pid]
+            if event.kind == EVENT_COMPLETE:
+                self.handle_process_completion_sim(process)
+            elif event.kind == EVENT_DISPATCH:
+                self.update_process_table_sim(
+                    process.pid, {"state": "Running", "start": process.start_time}
                 )
-                if next_process:
-                    next_process.state = "Running"
-                    if next_process.start_time == -1:
-                        next_process.start_time = self.simulation_time_sim
-                    self.running_processes_sim.append(next_process)
-                    self.update_process_table_sim(
-                        next_process.pid,
-                        {"state": "Running", "start": next_process.start_time},
-                    )
-                    next_process.remaining_burst_time = 0
-                    for t in range(
-                        next_process.start_time,
-                        next_process.start_time + next_process.burst_time,
-                    ):
-                        self.update_gantt_display_sim(t, [(next_process.pid, 0)])
-                    self.handle_process_completion_sim(
-                        next_process, next_process.start_time + next_process.burst_time
-                    )
-                    self.simulation_time_sim = (
-                        next_process.start_time + next_process.burst_time
-                    )
-                    self.root.after(
-                        self.simulation_update_ms, self.simulation_step_visual
-                    )
-                    return
-        else:
-            while available_threads_sim > 0 and self.ready_queue_sim:
-                next_process = self.scheduler_sim.schedule(
-                    self.ready_queue_sim,
-                    current_time,
-                    self.running_processes_sim,
-                    available_threads_sim,
-                )
-                if next_process:
-                    next_process.state = "Running"
-                    if next_process.start_time == -1:
-                        next_process.start_time = current_time
-                    self.running_processes_sim.append(next_process)
-                    self.update_process_table_sim(
-                        next_process.pid,
-                        {"state": "Running", "start": next_process.start_time},
-                    )
-                    available_threads_sim -= 1
-                else:
-                    break
-
-        gantt_current_tick_sim = []
-        processes_to_requeue_rr = []
-
-        for i, proc in enumerate(self.running_processes_sim):
-            proc.remaining_burst_time -= 1
-            gantt_current_tick_sim.append((proc.pid, i))
-            self.update_process_table_sim(
-                proc.pid, {"Restante": proc.remaining_burst_time}
-            )
-
-            if isinstance(self.scheduler_sim, SchedulerRR):
-                if not hasattr(proc, "ticks_in_current_burst"):
-                    proc.ticks_in_current_burst = 0
-                proc.ticks_in_current_burst += 1
-
-                if (
-                    proc.ticks_in_current_burst >= self.scheduler_sim.quantum
-                    and proc.remaining_burst_time > 0
-                ):
-                    processes_to_requeue_rr.append(proc)
-
-        if processes_to_requeue_rr:
-            for proc_rr in processes_to_requeue_rr:
-                self.running_processes_sim.remove(proc_rr)
-                proc_rr.state = "Ready"
-                proc_rr.ticks_in_current_burst = 0
-                self.ready_queue_sim.append(proc_rr)
-                self.update_process_table_sim(proc_rr.pid, {"state": "Ready"})
-
-        if gantt_current_tick_sim:
-            self.update_gantt_display_sim(current_time, gantt_current_tick_sim)
-
-        self.simulation_time_sim += 1
-
-        if (
-            not self.processes_to_simulate
-            and not self.ready_queue_sim
-            and not self.running_processes_sim
-        ):
-            self.simulation_running_sim = False
-            self.start_sim_button.config(text="Sim. Visual Completa", state=tk.DISABLED)
-            self.status_label.config(
-                text=f"Sim. visual completada en {current_time} ticks."
-            )
-            self.calculate_and_display_averages_sim()
-        else:
+            else:
+                # Llegada, vencimiento de quantum o preempción: vuelve a Ready
+                self.update_process_table_sim(process.pid, {"state": "Ready"})
+
+        self.replay_index_sim += 1
+        if self.replay_index_sim < len(times):
+            for tick in range(current_time, times[self.replay_index_sim]):
+                running_pids_with_threads = self.replay_ticks_sim.get(tick)
+                if running_pids_with_threads:
+                    self.update_gantt_display_sim(tick, running_pids_with_threads)
             self.root.after(self.simulation_update_ms, self.simulation_step_visual)
+            return
 
-    def handle_process_completion_sim(self, process, completion_time):
-        """Maneja la finalización de un proceso en la simulación visual."""
-        process.state = "Terminated"
-        process.completion_time = completion_time
-        process.turnaround_time = process.completion_time - process.arrival_time
-        process.waiting_time = process.turnaround_time - process.burst_time
+        self.simulation_running_sim = False
+        self.simulation_result_sim = None
+        self.start_sim_button.config(text="Sim. Visual Completa", state=tk.DISABLED)
+        self.status_label.config(
+            text=f"Sim. visual completada en {current_time} ticks."
+        )
+        self.calculate_and_display_averages_sim()
 
+    def handle_process_completion_sim(self, process):
+        """Muestra la finalización de un proceso en la simulación visual."""
         process.turnaround_formula = (
             f"{process.completion_time} - {process.arrival_time} = "
             f"{process.turnaround_time}"
@@ -1858,59 +1885,80 @@ class ClientApp:
 
         for item in self.results_tree.get_children():
             self.results_tree.delete(item)
+        self.result_rows_by_event = {}
 
         for result in self.server_results_for_csv:
-            try:
-                pid_server = result.get("pid_server", "N/A")
-                filename = result.get("filename", "")
-
-                data = result.get("data", {})
-                nombres_raw = data.get("nombres_encontrados", [])
-                lugares_raw = data.get("lugares_encontrados", [])
-                fechas_raw = data.get("dates_found", [])
-                word_count = str(data.get("word_count", 0))
-
-                nombres = (
-                    ", ".join(nombres_raw)[:50] + "..."
-                    if len(nombres_raw) > 3
-                    else ", ".join(nombres_raw)
-                )
-                lugares = (
-                    ", ".join(lugares_raw)[:50] + "..."
-                    if len(lugares_raw) > 3
-                    else ", ".join(lugares_raw)
-                )
-                fechas = (
-                    ", ".join(fechas_raw)[:50] + "..."
-                    if len(fechas_raw) > 3
-                    else ", ".join(fechas_raw)
-                )
-
-                status = result.get("status", "")
-                error = result.get("error", "")
-
-                self.results_tree.insert(
-                    "",
-                    "end",
-                    values=(
-                        pid_server,
-                        filename,
-                        nombres,
-                        lugares,
-                        fechas,
-                        word_count,
-                        status,
-                        error,
-                    ),
-                )
-
-            except Exception as e:
-                print(f"Error al mostrar resultado: {e}")
+            self.insert_result_row(result)
 
         self.status_label.config(
             text=f"{len(self.server_results_for_csv)} resultados recibidos del servidor."
         )
 
+    def clear_event_results(self, event):
+        """Quita de la tabla (y del CSV) los resultados recibidos para `event`."""
+        rows = self.result_rows_by_event.pop(event, [])
+        if not rows:
+            return
+        removed = {id(result) for result, _ in rows}
+        self.server_results_for_csv = [
+            r for r in self.server_results_for_csv if id(r) not in removed
+        ]
+        for _, row in rows:
+            if row is not None and self.results_tree.exists(row):
+                self.results_tree.delete(row)
+
+    def insert_result_row(self, result):
+        """
+        Agrega una fila con el resultado de un archivo a la tabla de resultados
+        y devuelve su id (None si no se pudo mostrar).
+        """
+        try:
+            pid_server = result.get("pid_server", "N/A")
+            filename = result.get("filename", "")
+
+            data = result.get("data", {})
+            nombres_raw = data.get("nombres_encontrados", [])
+            lugares_raw = data.get("lugares_encontrados", [])
+            fechas_raw = data.get("fechas_encontradas", data.get("dates_found", []))
+            word_count = str(data.get("word_count", 0))
+
+            nombres = (
+                ", ".join(nombres_raw)[:50] + "..."
+                if len(nombres_raw) > 3
+                else ", ".join(nombres_raw)
+            )
+            lugares = (
+                ", ".join(lugares_raw)[:50] + "..."
+                if len(lugares_raw) > 3
+                else ", ".join(lugares_raw)
+            )
+            fechas = (
+                ", ".join(fechas_raw)[:50] + "..."
+                if len(fechas_raw) > 3
+                else ", ".join(fechas_raw)
+            )
+
+            status = result.get("status", "")
+            error = result.get("error", "")
+
+            return self.results_tree.insert(
+                "",
+                "end",
+                values=(
+                    pid_server,
+                    filename,
+                    nombres,
+                    lugares,
+                    fechas,
+                    word_count,
+                    status,
+                    error,
+                ),
+            )
+
+        except Exception as e:
+            print(f"Error al mostrar resultado: {e}")
+
     def save_results_to_csv(self):
         """Guarda los resultados en un archivo CSV."""
         if not self.server_results_for_csv:
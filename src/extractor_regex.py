@@ -1,8 +1,610 @@
+import array
+import codecs
+import functools
+import io
+import mmap
+import os
 import re
-from typing import Dict
+import string
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
 
 
-def parse_file_regex(filepath: str, pid: str) -> Dict:
+# Versión de las reglas de extracción. Cambiarla al modificar patrones o el
+# conteo de palabras, para que la caché del servidor descarte resultados viejos.
+EXTRACTOR_VERSION = "3"
+
+
+# --- Patrones de extracción ---
+# Se definen y compilan una sola vez al importar el módulo, en lugar de
+# reconstruirlos en cada llamada a parse_file_regex.
+
+# Nombres (ej: John Smith, Anna Karlsson): palabras que empiezan con mayúscula,
+# seguidas de minúsculas, y que pueden tener más palabras así (para apellidos).
+PATRON_NOMBRES = (
+    r"\b[A-ZÁÉÍÓÚÑÅÄÖ][a-záéíóúñåäö]+(?:\s+[A-ZÁÉÍÓÚÑÅÄÖ][a-záéíóúñåäö]+)+\b"
+)
+
+# Fechas textuales como "12 de enero de 1945" o "Jan 12, 1945" (es/en/sv).
+SUFIJOS_ORDINALES = ("st", "nd", "rd", "th")
+MESES = (
+    "enero", "febrero", "marzo", "abril", "mayo", "junio", "julio", "agosto",
+    "septiembre", "octubre", "noviembre", "diciembre",
+    "jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov",
+    "dec", "maj",
+)
+PATRON_FECHAS_TEXTUALES = (
+    r"\b(?:\d{1,2}(?:" + "|".join(SUFIJOS_ORDINALES) + r")?(?:\s*(?:de\s+)?(?:"
+    + "|".join(MESES) + r"))?(?:\s*[\.,]?\s*\d{2,4})?)\b"
+)
+
+# Fechas numéricas como 12/03/1945 o 1945-03-12.
+PATRON_FECHAS_NUMERICAS = (
+    r"\b(?:\d{1,2}[/\-]\d{1,2}[/\-]\d{2,4}|\d{4}[/\-]\d{1,2}[/\-]\d{1,2})\b"
+)
+
+# Lista de ciudades comunes para buscar.
+CIUDADES_COMUNES = [
+    "New York", "Chicago", "Los Angeles", "San Francisco", "Boston",
+    "Minneapolis", "Detroit", "Miami", "Stockholm", "Göteborg",
+    "Malmö", "Uppsala", "Lund", "Karlstad", "Örebro",
+    "Västerås", "Linköping", "Madrid", "Barcelona", "Sevilla",
+    "Valencia", "Bilbao", "Zaragoza", "Málaga", "Murcia",
+    "Granada", "Córdoba", "Alicante", "Valladolid", "Gijón",
+    "Vigo", "A Coruña", "Oviedo", "Pamplona", "Salamanca"
+]
+PATRON_CIUDADES = (
+    r"\b(?:" + "|".join(re.escape(city) for city in CIUDADES_COMUNES) + r")\b"
+)
+
+# Todas las entidades empiezan al inicio de una palabra con una mayúscula o un
+# dígito. El escaneo combinado se detiene solo en esas posiciones y prueba los
+# cuatro patrones con lookaheads (cada uno en su propio grupo con nombre), de
+# modo que una misma palabra puede aportar a varias categorías, igual que con
+# búsquedas separadas. Luego consume la palabra completa y sigue.
+_ENTITY_SCAN_RE = re.compile(
+    r"(?=[A-ZÁÉÍÓÚÑÅÄÖ\d])(?<!\w)"
+    r"(?:(?=(?P<nombre>" + PATRON_NOMBRES + r")))?"
+    r"(?:(?=(?P<fecha_textual>(?i:" + PATRON_FECHAS_TEXTUALES + r"))))?"
+    r"(?:(?=(?P<fecha_numerica>" + PATRON_FECHAS_NUMERICAS + r")))?"
+    r"(?:(?=(?P<lugar>" + PATRON_CIUDADES + r")))?"
+    r"\w+"
+)
+
+# Inicio de palabra: una por cada secuencia de caracteres alfanuméricos.
+_WORD_START_RE = re.compile(r"\b\w")
+
+# --- Lectura por bloques (modo streaming) ---
+# Tamaño de bloque por defecto (en bytes) para parse_file_regex_streaming.
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+# Un bloque solo se corta al inicio de una palabra que ninguna entidad puede
+# usar como continuación: no empieza con mayúscula/dígito (nombres, ciudades,
+# fechas numéricas) ni con "de" o un mes (fechas textuales). Ninguna
+# coincidencia puede cruzar ese punto, así que cada segmento se analiza por
+# separado con el mismo resultado que el archivo completo.
+_SAFE_CUT_RE = re.compile(
+    r"(?<!\w)(?![A-ZÁÉÍÓÚÑÅÄÖ\d])(?!(?i:de|enero|febrero|marzo|abril|mayo|junio|"
+    r"julio|agosto|septiembre|octubre|noviembre|diciembre|jan|feb|mar|apr|may|"
+    r"jun|jul|aug|sep|oct|nov|dec|maj))\w"
+)
+# Caracteres que deben seguir al punto de corte para poder evaluarlo (el mes
+# más largo, "septiembre", tiene 10).
+_SAFE_CUT_LOOKAHEAD = 16
+# Si el texto pendiente crece más allá de este múltiplo del bloque sin hallar
+# un corte seguro, se corta en el último inicio de palabra para acotar memoria.
+_MAX_CARRY_FACTOR = 4
+
+# --- Rangos de bytes (un archivo repartido entre varios workers) ---
+# Bytes que se leen a partir de cada límite nominal para buscar un corte seguro.
+_RANGE_CUT_WINDOW = 64 * 1024
+# Caracteres que `surrogateescape` usa para los bytes que no son UTF-8 válido.
+_SURROGATE_RE = re.compile("[\ud800-\udfff]")
+
+
+# --- Patrones sobre bytes (modo mmap) ---
+# Equivalentes en bytes UTF-8 de los patrones anteriores, para buscar
+# directamente sobre un mmap del archivo sin decodificarlo. En bytes, `\w`,
+# `\s`, `\d`, `\b` y `(?i)` solo conocen ASCII, así que se reemplazan por
+# expresiones que reconocen exactamente los mismos caracteres que en `str`.
+
+# Caracteres que se codifican con 1, 2, 3 y 4 bytes en UTF-8.
+_UTF8_LENGTH_RANGES = ((0x0, 0x7F), (0x80, 0x7FF), (0x800, 0xFFFF), (0x10000, 0x10FFFF))
+
+
+def _unicode_classes() -> Dict[str, List[Tuple[int, int]]]:
+    r"""
+    Rangos (primero, último) de los caracteres que reconocen `\w`, `\W`, `\s`
+    y `\d` en un patrón `str`, sin los surrogates (no aparecen en UTF-8
+    válido). Se obtienen aplicando esos patrones a todos los caracteres
+    Unicode, así que siguen la misma base de datos que el modo normal. Agrega
+    también, por cada letra ASCII, los caracteres que `(?i)` empareja con ella
+    (ej. "ſ" con "s", "İ" con "i").
+    """
+    all_chars = (
+        array.array("I", range(0x110000))
+        .tobytes()
+        .decode("utf-32-le", errors="surrogatepass")
+    )
+    classes = {}
+    for pattern in (r"\w", r"\W", r"\s", r"\d"):
+        ranges = classes[pattern] = []
+        for match in re.finditer(pattern + "+", all_chars):
+            first, last = match.start(), match.end() - 1
+            for low, high in ((first, min(last, 0xD7FF)), (max(first, 0xE000), last)):
+                if low <= high:
+                    ranges.append((low, high))
+    for letter in string.ascii_lowercase:
+        classes[letter] = [(ord(letter.upper()),) * 2, (ord(letter),) * 2]
+    for match in re.finditer(r"(?i)[a-z]", all_chars[0x80:]):
+        for letter in string.ascii_lowercase:
+            if re.fullmatch(f"(?i:{letter})", match.group()):
+                classes[letter].append((ord(match.group()),) * 2)
+    return classes
+
+
+def _char_ranges(chars: Iterable[str]) -> List[Tuple[int, int]]:
+    """Rangos (primero, último) de exactamente los caracteres dados."""
+    return [(ord(char),) * 2 for char in sorted(set(chars))]
+
+
+def _utf8_sequences(first: int, last: int) -> List[Tuple[Tuple[int, int], ...]]:
+    """
+    Secuencias de rangos de bytes que codifican exactamente los caracteres
+    `first`..`last` (todos de la misma longitud en UTF-8). El rango se parte
+    hasta que cada byte de una secuencia recorre un rango completo.
+    """
+    for i in range(1, len(chr(first).encode("utf-8"))):
+        mask = (1 << 6 * i) - 1
+        if first & ~mask != last & ~mask:
+            if first & mask:
+                split = first | mask
+                return _utf8_sequences(first, split) + _utf8_sequences(split + 1, last)
+            if last & mask != mask:
+                split = (last & ~mask) - 1
+                return _utf8_sequences(first, split) + _utf8_sequences(split + 1, last)
+    return [tuple(zip(chr(first).encode("utf-8"), chr(last).encode("utf-8")))]
+
+
+def _utf8_sequences_by_length(ranges: Iterable[Tuple[int, int]]) -> Dict[int, List]:
+    """Secuencias de bytes de los caracteres de `ranges`, por longitud en UTF-8."""
+    by_length = defaultdict(list)
+    for first, last in ranges:
+        for low, high in _UTF8_LENGTH_RANGES:
+            if max(first, low) <= min(last, high):
+                sequences = _utf8_sequences(max(first, low), min(last, high))
+                by_length[len(sequences[0])].extend(sequences)
+    return dict(sorted(by_length.items()))
+
+
+def _byte_range(low: int, high: int) -> bytes:
+    """Rango de bytes para una clase `[...]`."""
+    if low == high:
+        return re.escape(bytes([low]))
+    return re.escape(bytes([low])) + b"-" + re.escape(bytes([high]))
+
+
+def _sequences_pattern(sequences: List[Tuple[Tuple[int, int], ...]]) -> bytes:
+    """
+    Expresión de bytes que reconoce las secuencias dadas (todas de la misma
+    longitud), agrupadas por su primer byte como un árbol: para cada carácter
+    solo se siguen las ramas de su byte inicial.
+    """
+    if len(sequences[0]) == 1:
+        return b"[" + b"".join(_byte_range(*seq[0]) for seq in sequences) + b"]"
+    groups = defaultdict(list)
+    for sequence in sequences:
+        groups[sequence[0]].append(sequence[1:])
+    return b"|".join(
+        b"[" + _byte_range(*head) + b"](?:" + _sequences_pattern(rest) + b")"
+        for head, rest in groups.items()
+    )
+
+
+def _utf8_by_length(ranges: Iterable[Tuple[int, int]]) -> Dict[int, bytes]:
+    """
+    Por cada longitud en UTF-8, una expresión de bytes que reconoce
+    exactamente los caracteres de `ranges` de esa longitud.
+    """
+    return {
+        length: _sequences_pattern(sequences)
+        for length, sequences in _utf8_sequences_by_length(ranges).items()
+    }
+
+
+def _utf8_class(ranges: Iterable[Tuple[int, int]]) -> bytes:
+    """Grupo no capturante que reconoce cualquiera de los caracteres de `ranges`."""
+    return b"(?:" + b"|".join(_utf8_by_length(ranges).values()) + b")"
+
+
+def _utf8_ignorecase(classes, word: str) -> bytes:
+    """`word` como la reconoce `(?i:word)` en un patrón `str`."""
+    return b"".join(_utf8_class(classes[char]) for char in word)
+
+
+def _is_word_char(char: str) -> bool:
+    r"""Misma definición que `\w` en patrones str."""
+    return char.isalnum() or char == "_"
+
+
+# Conteo de palabras sobre bytes: se traduce cada byte a b"a" (palabra) o b" "
+# (separador) y se cuentan los inicios de palabra con bytes.count. Los bytes no
+# ASCII se marcan como palabra y luego se corrigen los caracteres no-palabra
+# multibyte (¿, «, —, emojis...), que se localizan con búsquedas de subcadenas.
+_BYTES_WORD_TABLE = bytes(
+    ord("a") if b >= 0x80 or _is_word_char(chr(b)) else ord(" ") for b in range(256)
+)
+
+
+def _non_word_search_keys(non_word_ranges) -> Tuple[bytes, ...]:
+    """
+    Subcadenas a buscar para localizar caracteres no-palabra multibyte: el byte
+    inicial (ej. 0xC2, 0xE2, 0xF0), o cada carácter completo cuando son muy
+    pocos bajo ese byte (ej. × y ÷ bajo 0xC3, que comparten byte inicial con
+    las vocales acentuadas y buscar solo 0xC3 daría un candidato por cada
+    vocal).
+    """
+    keys = []
+    for lead in range(0xC2, 0xF5):
+        length = 2 if lead < 0xE0 else 3 if lead < 0xF0 else 4
+        bits = 6 * (length - 1)
+        low = (lead & (0xFF >> (length + 1))) << bits
+        low = max(low, _UTF8_LENGTH_RANGES[length - 1][0])
+        high = min(low | ((1 << bits) - 1), _UTF8_LENGTH_RANGES[length - 1][1])
+        overlaps = [
+            (max(first, low), min(last, high))
+            for first, last in non_word_ranges
+            if max(first, low) <= min(last, high)
+        ]
+        if sum(last - first + 1 for first, last in overlaps) > 4:
+            keys.append(bytes([lead]))
+        else:
+            keys.extend(
+                chr(c).encode("utf-8")
+                for first, last in overlaps
+                for c in range(first, last + 1)
+            )
+    return tuple(keys)
+
+
+class _BytesPatterns(NamedTuple):
+    """Patrones del modo mmap (ver `_bytes_patterns`)."""
+
+    entity_scan: "re.Pattern[bytes]"
+    non_word_multibyte: "re.Pattern[bytes]"
+    non_word_search_keys: Tuple[bytes, ...]
+
+
+@functools.lru_cache(maxsize=None)
+def _bytes_patterns() -> _BytesPatterns:
+    """
+    Arma los patrones de bytes la primera vez que se usan, no al importar el
+    módulo: recorrer todos los caracteres Unicode y compilar el escaneo tarda
+    unos 0.4 s, y solo los necesitan los archivos que se leen con mmap.
+    """
+    classes = _unicode_classes()
+    non_word_ranges = classes[r"\W"]
+    non_word_by_length = _utf8_by_length(non_word_ranges)
+    non_word = b"(?:" + b"|".join(non_word_by_length.values()) + b")"
+    # Equivalente a `\b` antes de una palabra (el lookbehind debe tener ancho fijo,
+    # así que hay uno por cada longitud) y después de una palabra.
+    word_start = (
+        rb"(?:\A|"
+        + b"|".join(b"(?<=" + alts + b")" for alts in non_word_by_length.values())
+        + b")"
+    )
+    word_end = rb"(?=" + non_word + rb"|\Z)"
+    word_char = _utf8_class(classes[r"\w"])
+    space = _utf8_class(classes[r"\s"])
+    digit = _utf8_class(classes[r"\d"])
+    upper_ranges = _char_ranges("ABCDEFGHIJKLMNOPQRSTUVWXYZÁÉÍÓÚÑÅÄÖ")
+    upper = _utf8_class(upper_ranges)
+    lower = _utf8_class(_char_ranges("abcdefghijklmnopqrstuvwxyzáéíóúñåäö"))
+
+    nombres = (
+        upper + lower + b"+(?:" + space + b"+" + upper + lower + b"+)+"
+        + word_end
+    )
+    fechas_textuales = (
+        digit + b"{1,2}(?:"
+        + b"|".join(_utf8_ignorecase(classes, sufijo) for sufijo in SUFIJOS_ORDINALES)
+        + b")?(?:" + space + b"*(?:" + _utf8_ignorecase(classes, "de") + space + b"+)?"
+        + b"(?:" + b"|".join(_utf8_ignorecase(classes, mes) for mes in MESES) + b"))?"
+        + b"(?:" + space + b"*[.,]?" + space + b"*" + digit + b"{2,4})?"
+        + word_end
+    )
+    fechas_numericas = (
+        b"(?:" + digit + b"{1,2}[/\\-]" + digit + b"{1,2}[/\\-]" + digit
+        + b"{2,4}|" + digit + b"{4}[/\\-]" + digit + b"{1,2}[/\\-]" + digit
+        + b"{1,2})" + word_end
+    )
+    ciudades = (
+        b"(?:" + b"|".join(re.escape(city.encode("utf-8")) for city in CIUDADES_COMUNES)
+        + b")" + word_end
+    )
+    # Bytes iniciales de las mayúsculas y los dígitos: toda entidad empieza con uno.
+    entity_start = (
+        b"["
+        + b"".join(
+            _byte_range(*head)
+            for head in sorted(
+                {
+                    sequence[0]
+                    for ranges in (upper_ranges, classes[r"\d"])
+                    for sequences in _utf8_sequences_by_length(ranges).values()
+                    for sequence in sequences
+                }
+            )
+        )
+        + b"]"
+    )
+
+    entity_scan = re.compile(
+        b"(?=" + entity_start + b")" + word_start
+        + b"(?:(?=(?P<nombre>" + nombres + b")))?"
+        + b"(?:(?=(?P<fecha_textual>" + fechas_textuales + b")))?"
+        + b"(?:(?=(?P<fecha_numerica>" + fechas_numericas + b")))?"
+        + b"(?:(?=(?P<lugar>" + ciudades + b")))?"
+        + word_char + b"+"
+    )
+    non_word_multibyte = re.compile(
+        b"|".join(alts for length, alts in non_word_by_length.items() if length > 1)
+    )
+    return _BytesPatterns(
+        entity_scan, non_word_multibyte, _non_word_search_keys(non_word_ranges)
+    )
+
+
+_WORD_COUNT_BLOCK = 1024 * 1024
+
+
+def scan_entities(content: str) -> Tuple[Set[str], Set[str], Set[str]]:
+    """
+    Busca nombres, fechas y lugares en una sola pasada sobre el contenido.
+
+    Reproduce exactamente el resultado de aplicar `re.findall` por separado con
+    cada patrón: para cada categoría se descartan las coincidencias que empiezan
+    antes del final de la última aceptada (las de findall no se solapan).
+
+    Args:
+        content (str): Texto a analizar.
+
+    Returns:
+        Tuple[Set[str], Set[str], Set[str]]: Conjuntos de nombres, fechas y lugares.
+    """
+    nombres, fechas, lugares = set(), set(), set()
+    fin_nombre = fin_textual = fin_numerica = fin_lugar = 0
+
+    for match in _ENTITY_SCAN_RE.finditer(content):
+        if match.lastindex is None:
+            continue
+        inicio = match.start()
+        nombre, textual, numerica, lugar = match.group(
+            "nombre", "fecha_textual", "fecha_numerica", "lugar"
+        )
+        if nombre is not None and inicio >= fin_nombre:
+            nombres.add(nombre)
+            fin_nombre = match.end("nombre")
+        if textual is not None and inicio >= fin_textual:
+            fechas.add(textual)
+            fin_textual = match.end("fecha_textual")
+        if numerica is not None and inicio >= fin_numerica:
+            fechas.add(numerica)
+            fin_numerica = match.end("fecha_numerica")
+        if lugar is not None and inicio >= fin_lugar:
+            lugares.add(lugar)
+            fin_lugar = match.end("lugar")
+
+    return nombres, fechas, lugares
+
+
+def count_words(content: str) -> int:
+    """Cuenta las secuencias de caracteres alfanuméricos (palabras) del texto."""
+    return len(_WORD_START_RE.findall(content))
+
+
+def scan_entities_bytes(buffer) -> Tuple[Set[str], Set[str], Set[str]]:
+    """
+    Versión de `scan_entities` sobre bytes UTF-8 (ej. un `mmap.mmap`).
+
+    Las coincidencias se acumulan como bytes y se decodifican solo al final.
+    Los saltos de línea CRLF y CR de una coincidencia (un nombre o una fecha
+    pueden cruzar un salto de línea) se convierten a LF, como al leer el
+    archivo en modo texto.
+    """
+    nombres, fechas, lugares = set(), set(), set()
+    fin_nombre = fin_textual = fin_numerica = fin_lugar = 0
+
+    for match in _bytes_patterns().entity_scan.finditer(buffer):
+        if match.lastindex is None:
+            continue
+        inicio = match.start()
+        nombre, textual, numerica, lugar = match.group(
+            "nombre", "fecha_textual", "fecha_numerica", "lugar"
+        )
+        if nombre is not None and inicio >= fin_nombre:
+            nombres.add(nombre)
+            fin_nombre = match.end("nombre")
+        if textual is not None and inicio >= fin_textual:
+            fechas.add(textual)
+            fin_textual = match.end("fecha_textual")
+        if numerica is not None and inicio >= fin_numerica:
+            fechas.add(numerica)
+            fin_numerica = match.end("fecha_numerica")
+        if lugar is not None and inicio >= fin_lugar:
+            lugares.add(lugar)
+            fin_lugar = match.end("lugar")
+
+    def decode(values):
+        return {
+            value.decode("utf-8", errors="ignore")
+            .replace("\r\n", "\n")
+            .replace("\r", "\n")
+            for value in values
+        }
+
+    return decode(nombres), decode(fechas), decode(lugares)
+
+
+def count_words_bytes(buffer) -> int:
+    """Versión de `count_words` sobre bytes UTF-8 (procesa bloques acotados)."""
+    total = 0
+    previous = b" "
+    for start in range(0, len(buffer), _WORD_COUNT_BLOCK):
+        block = buffer[start:start + _WORD_COUNT_BLOCK].translate(_BYTES_WORD_TABLE)
+        total += block.count(b" a")
+        if previous == b" " and block[:1] == b"a":
+            total += 1
+        previous = block[-1:]
+
+    # Cada secuencia de caracteres no-palabra multibyte se contó como parte de
+    # una palabra: en realidad separa la palabra de la izquierda de la derecha.
+    patterns = _bytes_patterns()
+    spans = []
+    for key in patterns.non_word_search_keys:
+        position = buffer.find(key)
+        while position != -1:
+            match = patterns.non_word_multibyte.match(buffer, position)
+            if match:
+                spans.append(match.span())
+            position = buffer.find(key, position + 1)
+    spans.sort()
+
+    size = len(buffer)
+    word = ord("a")
+    index = 0
+    while index < len(spans):
+        start, end = spans[index]
+        index += 1
+        while index < len(spans) and spans[index][0] == end:
+            end = spans[index][1]
+            index += 1
+        left = start > 0 and _BYTES_WORD_TABLE[buffer[start - 1]] == word
+        right = end < size and _BYTES_WORD_TABLE[buffer[end]] == word
+        total += left + right - 1
+    return total
+
+
+def _is_utf8(buffer) -> bool:
+    """True si `buffer` es UTF-8 válido (se decodifica por bloques acotados)."""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    try:
+        for start in range(0, len(buffer), _WORD_COUNT_BLOCK):
+            decoder.decode(buffer[start:start + _WORD_COUNT_BLOCK])
+        decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
+def _find_safe_cut(buffer: str, force: bool = False) -> int:
+    """
+    Devuelve la última posición de `buffer` donde se puede cortar sin partir
+    una entidad, o 0 si no hay ninguna. Con `force=True` acepta cualquier
+    inicio de palabra (pierde exactitud solo en textos patológicos).
+    """
+    limit = len(buffer) - _SAFE_CUT_LOOKAHEAD
+    pattern = _WORD_START_RE if force else _SAFE_CUT_RE
+    start = max(0, limit - 4096)
+    while True:
+        cut = 0
+        for match in pattern.finditer(buffer, start):
+            if match.start() > limit:
+                break
+            cut = match.start()
+        if cut > 0 or start == 0:
+            return cut
+        start = max(0, start - 65536)
+
+
+def _scan_blocks(
+    blocks: Iterable[str], chunk_size: int
+) -> Tuple[Set[str], Set[str], Set[str], int]:
+    """
+    Analiza un texto que llega en bloques: cada bloque se junta con lo que
+    quedó después del último corte seguro del anterior (ver `_SAFE_CUT_RE`).
+
+    Returns:
+        Tuple[Set[str], Set[str], Set[str], int]: Nombres, fechas, lugares y
+        cantidad de palabras.
+    """
+    nombres, fechas, lugares = set(), set(), set()
+    num_palabras = 0
+
+    def consume(segment: str) -> None:
+        nonlocal num_palabras
+        seg_nombres, seg_fechas, seg_lugares = scan_entities(segment)
+        nombres.update(seg_nombres)
+        fechas.update(seg_fechas)
+        lugares.update(seg_lugares)
+        num_palabras += count_words(segment)
+
+    pending = ""
+    for chunk in blocks:
+        pending += chunk
+        cut = _find_safe_cut(pending)
+        if not cut and len(pending) > _MAX_CARRY_FACTOR * chunk_size:
+            cut = _find_safe_cut(pending, force=True)
+        if cut:
+            consume(pending[:cut])
+            pending = pending[cut:]
+    consume(pending)
+    return nombres, fechas, lugares, num_palabras
+
+
+def _timed_blocks(blocks: Iterable[str], timings: Dict) -> Iterator[str]:
+    """Pasa los bloques de `blocks` sumando en timings["read"] lo que tarda cada uno."""
+    timings["read"] = 0.0
+    blocks = iter(blocks)
+    while True:
+        start = time.monotonic()
+        block = next(blocks, None)
+        timings["read"] += time.monotonic() - start
+        if block is None:
+            return
+        yield block
+
+
+def _finish_timings(timings: Optional[Dict], start: float) -> None:
+    """Completa `timings`: el tiempo desde `start` que no fue lectura es "regex"."""
+    if timings is not None:
+        timings.setdefault("read", 0.0)
+        timings["regex"] = time.monotonic() - start - timings["read"]
+
+
+def _error_result(filepath: str, pid: str, e: Exception) -> Dict:
+    """Diccionario de resultado cuando el archivo no se puede leer."""
+    return {
+        "pid": pid,
+        "archivo": filepath.split("/")[-1],
+        "nombres": [],
+        "fechas": [],
+        "lugares": [],
+        "num_palabras": 0,
+        "status": "error_lectura",
+        "error": f"Error al leer archivo: {str(e)}",
+    }
+
+
+def _success_result(
+    filepath: str, nombres: Set[str], fechas: Set[str], lugares: Set[str], num_palabras: int
+) -> Dict:
+    """Diccionario de resultado con los datos extraídos."""
+    return {
+        "Nombres": sorted(nombres),
+        "Fechas": sorted(fechas),
+        "Lugares": sorted(lugares),
+        "ConteoPalabras": num_palabras,
+        "filename": os.path.basename(filepath), # Usar os.path.basename para consistencia
+        "status": "success",
+        "error": "",
+    }
+
+
+def parse_file_regex(
+    filepath: str, pid: str, timings: Optional[Dict] = None, digest=None
+) -> Dict:
     """
     Extrae información específica de un archivo de texto utilizando expresiones regulares.
 
@@ -10,79 +612,279 @@ def parse_file_regex(filepath: str, pid: str) -> Dict:
         filepath (str): La ruta completa del archivo de texto a procesar.
         pid (str): Un identificador del proceso/hilo que realiza la extracción
                    (ej. "FORK PID_12345").
+        timings (Optional[Dict]): Si se pasa, se guardan en "read" y "regex"
+                   los segundos de lectura y de análisis (ver `src/metrics.py`).
+        digest: Si se pasa (un objeto de `hashlib`), se actualiza con los
+                   bytes leídos, para que la caché de resultados no tenga que
+                   volver a leer el archivo (ver `src/result_cache.py`).
 
     Returns:
         Dict: Un diccionario con los datos extraídos (nombres, fechas, lugares,
               conteo de palabras) y el estado del procesamiento.
     """
+    start = time.monotonic()
     try:
-        with open(filepath, "r", encoding="utf-8", errors="ignore") as f:
-            content = f.read()
+        with open(filepath, "rb") as f:
+            data = f.read()
     except Exception as e:
-        return {
-            "pid": pid,
-            "archivo": filepath.split("/")[-1],
-            "nombres": [],
-            "fechas": [],
-            "lugares": [],
-            "num_palabras": 0,
-            "status": "error_lectura",
-            "error": f"Error al leer archivo: {str(e)}",
-        }
+        return _error_result(filepath, pid, e)
+    if digest is not None:
+        digest.update(data)
+    content = _text_decoder().decode(data, final=True)
+    del data
+    if timings is not None:
+        timings["read"] = time.monotonic() - start
 
-    # --- Nombres (ej: John Smith, Anna Karlsson) ---
-    # Busca palabras que empiezan con mayúscula, seguidas de minúsculas,
-    # y que pueden tener más palabras así (para apellidos).
-    nombres = re.findall(
-        r"\b[A-ZÁÉÍÓÚÑÅÄÖ][a-záéíóúñåäö]+(?:\s+[A-ZÁÉÍÓÚÑÅÄÖ][a-záéíóúñåäö]+)+\b",
-        content,
-    )
+    nombres, fechas, lugares = scan_entities(content)
+    num_palabras = count_words(content)
+    _finish_timings(timings, start)
 
-    # --- Fechas en formatos comunes y naturales (es/en/sv) ---
-    # Busca fechas textuales como "12 de enero de 1945" o "Jan 12, 1945"
-    fechas_textuales = re.findall(
-        r"\b(?:\d{1,2}(?:st|nd|rd|th)?(?:\s*(?:de\s+)?(?:enero|febrero|marzo|abril|mayo|junio|julio|agosto|septiembre|octubre|noviembre|diciembre|"
-        r"jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec|maj))?(?:\s*[\.,]?\s*\d{2,4})?)\b",
-        content,
-        flags=re.IGNORECASE,
-    )
+    return _success_result(filepath, nombres, fechas, lugares, num_palabras)
 
-    # Busca fechas numéricas como 12/03/1945 o 1945-03-12
-    fechas_numericas = re.findall(
-        r"\b(?:\d{1,2}[/\-]\d{1,2}[/\-]\d{2,4}|\d{4}[/\-]\d{1,2}[/\-]\d{1,2})\b",
-        content,
-    )
-    fechas = fechas_textuales + fechas_numericas
-
-
-    # --- Lugares/Ciudades ---
-    # Lista de ciudades comunes para buscar.
-    ciudades_comunes = [
-        "New York", "Chicago", "Los Angeles", "San Francisco", "Boston",
-        "Minneapolis", "Detroit", "Miami", "Stockholm", "Göteborg",
-        "Malmö", "Uppsala", "Lund", "Karlstad", "Örebro",
-        "Västerås", "Linköping", "Madrid", "Barcelona", "Sevilla",
-        "Valencia", "Bilbao", "Zaragoza", "Málaga", "Murcia",
-        "Granada", "Córdoba", "Alicante", "Valladolid", "Gijón",
-        "Vigo", "A Coruña", "Oviedo", "Pamplona", "Salamanca"
-    ]
-    # Crea una regex para buscar cualquiera de estas ciudades.
-    ciudades_regex = (
-        r"\b(?:" + "|".join(re.escape(city) for city in ciudades_comunes) + r")\b"
+
+def parse_file_regex_streaming(
+    filepath: str,
+    pid: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    timings: Optional[Dict] = None,
+    digest=None,
+) -> Dict:
+    """
+    Igual que `parse_file_regex`, pero lee el archivo por bloques de
+    `chunk_size` bytes para que la memoria usada no dependa del tamaño
+    del archivo.
+
+    El final de cada bloque se guarda hasta el último punto de corte seguro
+    (ver `_SAFE_CUT_RE`) y se antepone al bloque siguiente, de modo que las
+    entidades que cruzan el límite entre bloques se detectan igual.
+
+    Args:
+        filepath (str): La ruta completa del archivo de texto a procesar.
+        pid (str): Identificador del proceso/hilo que realiza la extracción.
+        chunk_size (int): Cantidad de bytes leídos por bloque.
+        timings (Optional[Dict]): Como en `parse_file_regex`; la lectura es
+            la suma de los bloques.
+        digest: Como en `parse_file_regex`.
+
+    Returns:
+        Dict: El mismo diccionario que devuelve `parse_file_regex`.
+    """
+    start = time.monotonic()
+    try:
+        with open(filepath, "rb") as f:
+            blocks = _read_range_text(f, 0, None, chunk_size, digest)
+            if timings is not None:
+                blocks = _timed_blocks(blocks, timings)
+            nombres, fechas, lugares, num_palabras = _scan_blocks(blocks, chunk_size)
+    except Exception as e:
+        return _error_result(filepath, pid, e)
+    _finish_timings(timings, start)
+
+    return _success_result(filepath, nombres, fechas, lugares, num_palabras)
+
+
+def parse_file_regex_mmap(
+    filepath: str, pid: str, timings: Optional[Dict] = None, digest=None
+) -> Dict:
+    r"""
+    Igual que `parse_file_regex`, pero busca con patrones de bytes directamente
+    sobre un `mmap` del archivo, sin leerlo ni decodificarlo a `str`.
+
+    Las páginas del archivo se comparten con la caché del sistema operativo,
+    por lo que varios workers que procesan el mismo archivo no duplican su
+    contenido en memoria. Solo las coincidencias se decodifican, al final.
+
+    El resultado es el mismo que el de `parse_file_regex`: los patrones de
+    bytes reconocen los mismos caracteres que `\w`, `\s`, `\d` y `(?i)` en
+    `str`, y los saltos de línea CRLF y CR dentro de una coincidencia se
+    convierten a LF como en modo texto. Los bytes que no son UTF-8 válido se
+    descartan al leer en modo texto y cambiarían el contexto de las
+    coincidencias: si el archivo tiene alguno, se analiza con
+    `parse_file_regex_streaming`.
+
+    Args:
+        filepath (str): La ruta completa del archivo de texto a procesar.
+        pid (str): Identificador del proceso/hilo que realiza la extracción.
+        timings (Optional[Dict]): Como en `parse_file_regex`, pero las
+            páginas se leen durante la búsqueda: todo cuenta como "regex".
+        digest: Como en `parse_file_regex`; se actualiza directamente desde
+            el `mmap`.
+
+    Returns:
+        Dict: El mismo diccionario que devuelve `parse_file_regex`.
+    """
+    start = time.monotonic()
+    try:
+        with open(filepath, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return _success_result(filepath, set(), set(), set(), 0)
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                valid = _is_utf8(buffer)
+                if valid:
+                    if digest is not None:
+                        digest.update(buffer)
+                    nombres, fechas, lugares = scan_entities_bytes(buffer)
+                    num_palabras = count_words_bytes(buffer)
+    except Exception as e:
+        return _error_result(filepath, pid, e)
+    if not valid:
+        return parse_file_regex_streaming(
+            filepath, pid, timings=timings, digest=digest
+        )
+    _finish_timings(timings, start)
+
+    return _success_result(filepath, nombres, fechas, lugares, num_palabras)
+
+
+def _find_range_cut(f, position: int, size: int) -> Optional[int]:
+    """
+    Primer punto de corte seguro de `f` (abierto en binario) en la posición
+    en bytes `position` o después, buscado en los `_RANGE_CUT_WINDOW` bytes
+    siguientes; None si no hay ninguno.
+
+    La ventana se decodifica con `surrogateescape` para poder volver a
+    convertir el corte en una posición en bytes. Se descartan los cortes con
+    bytes inválidos justo antes o en los caracteres que mira `_SAFE_CUT_RE`:
+    al leer el archivo completo esos bytes se ignoran y el contexto sería otro.
+    """
+    base = max(position - 4, 0)
+    f.seek(base)
+    data = f.read(position - base + _RANGE_CUT_WINDOW)
+    at_eof = base + len(data) >= size
+    text = data.decode("utf-8", errors="surrogateescape")
+    for match in _SAFE_CUT_RE.finditer(text, 1):
+        cut = match.start()
+        if not at_eof and cut + _SAFE_CUT_LOOKAHEAD > len(text):
+            break
+        if _SURROGATE_RE.search(text, cut - 1, cut + _SAFE_CUT_LOOKAHEAD):
+            continue
+        offset = base + len(text[:cut].encode("utf-8", errors="surrogateescape"))
+        if offset >= position:
+            return offset
+    return None
+
+
+def split_file_ranges(filepath: str, parts: int) -> List[Tuple[int, int]]:
+    """
+    Divide un archivo en hasta `parts` rangos de bytes `(inicio, fin)`
+    contiguos y de tamaño parecido, para que varios workers lo analicen a la
+    vez con `parse_file_regex_range`.
+
+    Cada límite se mueve al siguiente punto de corte seguro (ver
+    `_SAFE_CUT_RE`), que siempre es el inicio de una palabra después de un
+    separador: ninguna entidad ni palabra cruza de un rango al siguiente. Si
+    cerca de un límite no hay un corte seguro, ese límite se omite y el rango
+    queda más largo.
+
+    Args:
+        filepath (str): La ruta completa del archivo de texto.
+        parts (int): Cantidad máxima de rangos.
+
+    Returns:
+        List[Tuple[int, int]]: Los rangos, en orden; cubren todo el archivo.
+    """
+    size = os.path.getsize(filepath)
+    cuts = [0]
+    with open(filepath, "rb") as f:
+        for i in range(1, parts):
+            position = max(size * i // parts, cuts[-1] + 1)
+            if position >= size:
+                break
+            cut = _find_range_cut(f, position, size)
+            if cut is not None and cut < size:
+                cuts.append(cut)
+    cuts.append(size)
+    return list(zip(cuts, cuts[1:]))
+
+
+def _text_decoder() -> io.IncrementalNewlineDecoder:
+    """
+    Decodificador incremental equivalente a abrir el archivo con
+    `open(..., "r", encoding="utf-8", errors="ignore")`, incluida la
+    conversión de saltos de línea.
+    """
+    return io.IncrementalNewlineDecoder(
+        codecs.getincrementaldecoder("utf-8")(errors="ignore"), translate=True
     )
-    lugares = re.findall(ciudades_regex, content)
 
-    # --- Conteo de palabras ---
-    # Busca secuencias de caracteres alfanuméricos como palabras.
-    palabras = re.findall(r"\b\w+\b", content)
-    num_palabras = len(palabras)
 
-    return {
-        "Nombres": sorted(list(set(nombres))) if nombres else [],
-        "Fechas": sorted(list(set(fechas))) if fechas else [],
-        "Lugares": sorted(list(set(lugares))) if lugares else [],
-        "ConteoPalabras": num_palabras,
-        "filename": os.path.basename(filepath), # Usar os.path.basename para consistencia
-        "status": "success",
-        "error": "",
-    }
+def _read_range_text(
+    f, start: int, end: Optional[int], block_size: int, digest=None
+) -> Iterable[str]:
+    """
+    Bloques de texto de los bytes `[start, end)` de `f` (abierto en binario;
+    hasta el final si `end` es None), decodificados con `_text_decoder`. Si
+    se pasa `digest`, se actualiza con los bytes leídos.
+    """
+    decoder = _text_decoder()
+    f.seek(start)
+    remaining = None if end is None else end - start
+    while remaining is None or remaining > 0:
+        data = f.read(block_size if remaining is None else min(block_size, remaining))
+        if not data:
+            break
+        if remaining is not None:
+            remaining -= len(data)
+        if digest is not None:
+            digest.update(data)
+        yield decoder.decode(data)
+    yield decoder.decode(b"", final=True)
+
+
+def parse_file_regex_range(
+    filepath: str,
+    pid: str,
+    start: int,
+    end: int,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    timings: Optional[Dict] = None,
+) -> Dict:
+    """
+    Igual que `parse_file_regex_streaming`, pero solo sobre los bytes
+    `[start, end)` del archivo, un rango de `split_file_ranges`.
+
+    Unir con `merge_results` los resultados de todos los rangos de un archivo
+    da el mismo diccionario que analizar el archivo completo.
+
+    Args:
+        filepath (str): La ruta completa del archivo de texto a procesar.
+        pid (str): Identificador del proceso/hilo que realiza la extracción.
+        start (int): Primer byte del rango.
+        end (int): Byte siguiente al último del rango.
+        chunk_size (int): Cantidad de bytes leídos por bloque.
+        timings (Optional[Dict]): Como en `parse_file_regex_streaming` (la
+            lectura incluye decodificar los bloques).
+
+    Returns:
+        Dict: El mismo formato que devuelve `parse_file_regex`, con los datos
+        del rango.
+    """
+    started = time.monotonic()
+    try:
+        with open(filepath, "rb") as f:
+            blocks = _read_range_text(f, start, end, chunk_size)
+            if timings is not None:
+                blocks = _timed_blocks(blocks, timings)
+            nombres, fechas, lugares, num_palabras = _scan_blocks(blocks, chunk_size)
+    except Exception as e:
+        return _error_result(filepath, pid, e)
+    _finish_timings(timings, started)
+
+    return _success_result(filepath, nombres, fechas, lugares, num_palabras)
+
+
+def merge_results(filepath: str, results: List[Dict]) -> Dict:
+    """
+    Une los resultados de los rangos de un archivo: unión de nombres, fechas
+    y lugares y suma de las palabras. Si algún rango falló, devuelve su error.
+    """
+    for result in results:
+        if result.get("status") != "success":
+            return result
+    return _success_result(
+        filepath,
+        {nombre for result in results for nombre in result["Nombres"]},
+        {fecha for result in results for fecha in result["Fechas"]},
+        {lugar for result in results for lugar in result["Lugares"]},
+        sum(result["ConteoPalabras"] for result in results),
+    )
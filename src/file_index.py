@@ -0,0 +1,301 @@
+"""
+Índice en memoria de los archivos de un directorio (nombre, tamaño, mtime),
+para que el servidor no recorra el directorio en cada `trigger`.
+
+El índice se carga con un `os.scandir` y después se mantiene actualizado en
+segundo plano:
+
+*   En Linux, con inotify (vía ctypes, sin dependencias): el kernel avisa qué
+    nombres se crearon, borraron, movieron o modificaron, y solo esos se
+    vuelven a leer con `os.stat`. Si la cola de eventos del kernel se desborda,
+    se vuelve a recorrer el directorio completo.
+*   En otros sistemas (o si inotify no está disponible), recorriendo el
+    directorio cada `poll_interval` segundos y aplicando la diferencia.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import stat
+import struct
+import sys
+import threading
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+
+# Constantes de <sys/inotify.h>.
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (
+    IN_MODIFY
+    | IN_ATTRIB
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+    | IN_ONLYDIR
+)
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+
+class FileEntry(NamedTuple):
+    """Un archivo del índice."""
+
+    size: int
+    mtime_ns: int
+
+
+def _load_inotify():
+    """La libc con inotify, o None si no está disponible."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [
+            ctypes.c_int,
+            ctypes.c_char_p,
+            ctypes.c_uint32,
+        ]
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+class FileIndex:
+    """
+    Índice de los archivos con sufijo `suffix` de un directorio.
+
+    `snapshot()` devuelve los pares (nombre, tamaño) sin tocar el disco (salvo
+    la primera vez, si el índice todavía no se cargó). Es seguro usarlo desde
+    varios hilos.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        suffix: str = ".txt",
+        poll_interval: float = 2.0,
+        use_inotify: bool = True,
+    ):
+        """
+        Args:
+            directory (str): Directorio a indexar (sin subdirectorios).
+            suffix (str): Solo se indexan los archivos con este sufijo.
+            poll_interval (float): Segundos entre recorridos sin inotify.
+            use_inotify (bool): Con False se recorre siempre el directorio.
+        """
+        self.directory = directory
+        self.suffix = suffix
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self.mode = "sin iniciar"
+        self.rescans = 0
+        self._entries: Dict[str, FileEntry] = {}
+        self._loaded = False
+        self._version = 0
+        self._snapshot: Tuple[int, List[Tuple[str, int]]] = (-1, [])
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # --- Consulta ---
+
+    def _ensure_loaded(self):
+        if not self._loaded:
+            self.rescan()
+
+    def snapshot(self) -> List[Tuple[str, int]]:
+        """
+        Pares (nombre, tamaño) de todos los archivos indexados. La lista se
+        reutiliza mientras el índice no cambie: no hay que modificarla.
+        """
+        self._ensure_loaded()
+        with self._lock:
+            version, files = self._snapshot
+            if version != self._version:
+                files = [(name, entry.size) for name, entry in self._entries.items()]
+                self._snapshot = (self._version, files)
+            return files
+
+    def get(self, name: str) -> Optional[FileEntry]:
+        """La entrada de `name`, o None si no está en el índice."""
+        self._ensure_loaded()
+        with self._lock:
+            return self._entries.get(name)
+
+    def __contains__(self, name: str) -> bool:
+        return self.get(name) is not None
+
+    def __len__(self) -> int:
+        self._ensure_loaded()
+        with self._lock:
+            return len(self._entries)
+
+    # --- Actualización ---
+
+    def _scan(self) -> Dict[str, FileEntry]:
+        entries = {}
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.name.endswith(self.suffix):
+                    continue
+                try:
+                    if not entry.is_file():
+                        continue
+                    st = entry.stat()
+                except OSError:
+                    continue  # borrado mientras se recorría
+                entries[entry.name] = FileEntry(st.st_size, st.st_mtime_ns)
+        return entries
+
+    def rescan(self) -> Tuple[int, int, int]:
+        """
+        Recorre el directorio completo y aplica la diferencia.
+
+        Returns:
+            (agregados, borrados, modificados).
+        """
+        entries = self._scan()
+        with self._lock:
+            old = self._entries
+            added = sum(1 for name in entries if name not in old)
+            removed = len(old) - (len(entries) - added)
+            changed = sum(
+                1 for name, entry in entries.items() if old.get(name, entry) != entry
+            )
+            if added or removed or changed or not self._loaded:
+                self._entries = entries
+                self._version += 1
+            self._loaded = True
+            self.rescans += 1
+        return added, removed, changed
+
+    def update(self, names) -> None:
+        """Vuelve a leer solo los archivos `names` (se agregan, cambian o salen)."""
+        changes = {}
+        for name in names:
+            if not name.endswith(self.suffix):
+                continue
+            try:
+                st = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                changes[name] = None
+                continue
+            is_file = stat.S_ISREG(st.st_mode)
+            changes[name] = FileEntry(st.st_size, st.st_mtime_ns) if is_file else None
+        with self._lock:
+            entries = self._entries
+            for name, entry in changes.items():
+                if entry is None:
+                    if entries.pop(name, None) is not None:
+                        self._version += 1
+                elif entries.get(name) != entry:
+                    entries[name] = entry
+                    self._version += 1
+
+    # --- Hilo de fondo ---
+
+    def start(self) -> str:
+        """
+        Carga el índice y lanza el hilo que lo mantiene. Devuelve el modo:
+        "inotify" o "polling". La vigilancia empieza antes de la carga, así
+        que no se pierden los cambios hechos mientras se recorre el directorio.
+        """
+        libc = _load_inotify() if self.use_inotify else None
+        fd = -1
+        if libc is not None:
+            fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+            if fd >= 0 and libc.inotify_add_watch(
+                fd, os.fsencode(self.directory), WATCH_MASK
+            ) < 0:
+                os.close(fd)
+                fd = -1
+        self.rescan()
+        if fd >= 0:
+            self.mode = "inotify"
+            target, args = self._watch_inotify, (fd,)
+        else:
+            self.mode = "polling"
+            target, args = self._poll, ()
+        self._thread = threading.Thread(target=target, args=args, daemon=True)
+        self._thread.start()
+        return self.mode
+
+    def stop(self) -> None:
+        """Detiene el hilo de fondo."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _poll(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.rescan()
+            except OSError:
+                pass  # el directorio no está; se reintenta en el próximo ciclo
+
+    def _watch_inotify(self, fd):
+        try:
+            while not self._stop.is_set():
+                ready, _, _ = select.select([fd], [], [], 0.5)
+                if not ready:
+                    continue
+                try:
+                    data = os.read(fd, 256 * 1024)
+                except BlockingIOError:
+                    continue
+                names, overflow, lost = self._parse_events(data)
+                if overflow:
+                    self.rescan()
+                elif names:
+                    self.update(names)
+                if lost:
+                    break
+        finally:
+            os.close(fd)
+        if not self._stop.is_set():
+            # Se borró o movió el directorio vigilado: se sigue recorriendo.
+            self.mode = "polling"
+            self._poll()
+
+    @staticmethod
+    def _parse_events(data):
+        """(nombres tocados, si hubo desborde, si se perdió el directorio)."""
+        names, overflow, lost = set(), False, False
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            _, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            raw = data[offset : offset + length].split(b"\0", 1)[0]
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                overflow = True
+            if mask & (IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED):
+                lost = True
+            if raw:
+                names.add(os.fsdecode(raw))
+        return names, overflow, lost
+
+    def describe(self) -> str:
+        """Resumen para el comando `status`."""
+        with self._lock:
+            count = len(self._entries)
+        return f"{count} archivos ({self.mode}, {self.rescans} recorridos completos)"
@@ -0,0 +1,380 @@
+"""
+Registro asíncrono y por lotes de `server_processing.log` y de los mensajes
+de los workers en la consola.
+
+Antes, cada `logging.info` de un worker escribía en el archivo dentro de la
+llamada (con el lock del handler, compartido por todos los hilos) y cada
+mensaje de consola hacía `print` + `sys.stdout.flush()`. En modo `forks`,
+además, cada proceso agregaba líneas al mismo archivo sin coordinarse.
+
+Con un `LogPipeline`, el logger raíz solo tiene un `QueueHandler`: registrar
+un mensaje es armar el registro y ponerlo en una cola. Un único hilo escritor
+(`BatchingQueueListener`) saca los registros, los junta y los escribe de a
+lotes: cuando se acumulan `batch_records` o cada `flush_interval` segundos,
+aunque no lleguen más. Los workers de un pool de procesos mandan sus
+registros al servidor por una `multiprocessing.Queue` (`worker_queue` y
+`attach_worker_logging`, el inicializador de los workers), con otro hilo
+escritor sobre los mismos handlers. Dentro del servidor el registro se pone en
+la cola tal cual (lo formatea el hilo escritor); cada worker de procesos junta
+los suyos como tuplas con lo que usan los formatos (más baratas de serializar
+que el `LogRecord` completo) y los manda de a listas, con el mismo criterio de
+lotes.
+
+Los mensajes del logger `CONSOLE_LOGGER_NAME` van a la consola (con el mismo
+formato que el `print` anterior) y no al archivo; el resto va al archivo.
+"""
+
+import atexit
+import collections
+import logging
+import multiprocessing
+import multiprocessing.util
+import queue
+import sys
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import List, Optional
+
+try:
+    from concurrent import interpreters
+except ImportError:  # Python < 3.14: sin subintérpretes
+    interpreters = None
+
+
+# Logger de los mensajes de los workers para la consola del servidor.
+CONSOLE_LOGGER_NAME = "consola"
+CONSOLE_FORMAT = "\n%(message)s"
+
+console = logging.getLogger(CONSOLE_LOGGER_NAME)
+
+# Cuánto espera el hilo escritor, al llegar un registro con la cola vacía, a
+# que lleguen más antes de procesarlos.
+_GATHER_SECONDS = 0.02
+
+
+class _BatchingMixin:
+    """
+    Junta los registros formateados y los escribe de a lotes. La escritura
+    ocurre al llegar a `batch_records` registros, cuando pasaron
+    `flush_interval` segundos desde la última, o en `flush()`.
+    """
+
+    def _init_batching(self, batch_records: int, flush_interval: float) -> None:
+        self.batch_records = max(batch_records, 1)
+        self.flush_interval = flush_interval
+        self._pending: List[str] = []
+        self._last_flush = time.monotonic()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self._pending.append(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+            return
+        if (
+            len(self._pending) >= self.batch_records
+            or time.monotonic() - self._last_flush >= self.flush_interval
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        self.acquire()
+        try:
+            if self.stream:
+                if self._pending:
+                    self.stream.write("".join(self._pending))
+                    self._pending.clear()
+                self.stream.flush()
+            self._last_flush = time.monotonic()
+        finally:
+            self.release()
+
+    def close(self) -> None:
+        self.flush()
+        super().close()
+
+
+class BatchingStreamHandler(_BatchingMixin, logging.StreamHandler):
+    """`StreamHandler` que escribe de a lotes (ej. la consola)."""
+
+    def __init__(self, stream=None, batch_records=256, flush_interval=0.5):
+        super().__init__(stream)
+        self._init_batching(batch_records, flush_interval)
+
+
+class BatchingFileHandler(_BatchingMixin, logging.FileHandler):
+    """`FileHandler` que escribe de a lotes (ej. `server_processing.log`)."""
+
+    def __init__(
+        self, filename, mode="a", encoding=None, batch_records=256, flush_interval=0.5
+    ):
+        super().__init__(filename, mode=mode, encoding=encoding)
+        self._init_batching(batch_records, flush_interval)
+
+
+class _LocalQueueHandler(QueueHandler):
+    """
+    `QueueHandler` para una cola del mismo proceso: no formatea ni copia el
+    registro, lo hace el hilo escritor.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+class _TupleQueueHandler(QueueHandler):
+    """
+    `QueueHandler` de un worker de subintérpretes: manda cada registro como una
+    tupla (logger, nivel, hora, ms, mensaje), apenas se registra. Un
+    subintérprete no admite hilos daemon, así que no se juntan lotes por tiempo.
+    """
+
+    def prepare(self, record):
+        message = self.format(record)  # incluye el traceback, si lo hay
+        return (record.name, record.levelno, record.created, record.msecs, message)
+
+
+class _WorkerQueueHandler(_TupleQueueHandler):
+    """
+    `QueueHandler` de un worker de procesos: junta las tuplas de
+    `_TupleQueueHandler` y las manda de a listas, al llegar a `batch_records`,
+    cada `flush_interval` segundos y al terminar el worker.
+    """
+
+    def __init__(self, log_queue, batch_records, flush_interval):
+        super().__init__(log_queue)
+        self.batch_records = max(batch_records, 1)
+        self.flush_interval = flush_interval
+        self._pending = []
+        threading.Thread(target=self._flush_periodically, daemon=True).start()
+        # Antes de que la cola se cierre al salir el worker (prioridad 10).
+        multiprocessing.util.Finalize(None, self.flush, exitpriority=20)
+
+    def enqueue(self, item):
+        self._pending.append(item)
+        if len(self._pending) >= self.batch_records:
+            self.flush()
+
+    def flush(self):
+        self.acquire()
+        try:
+            if self._pending:
+                self.queue.put_nowait(self._pending)
+                self._pending = []
+        finally:
+            self.release()
+
+    def _flush_periodically(self):
+        while True:
+            time.sleep(self.flush_interval)
+            self.flush()
+
+
+def _record_from_worker(item) -> logging.LogRecord:
+    name, levelno, created, msecs, message = item
+    return logging.makeLogRecord(
+        {
+            "name": name,
+            "levelno": levelno,
+            "levelname": logging.getLevelName(levelno),
+            "created": created,
+            "msecs": msecs,
+            "msg": message,
+        }
+    )
+
+
+class BatchingQueueListener(QueueListener):
+    """
+    `QueueListener` que, si la cola queda `flush_interval` segundos sin
+    registros, escribe lo pendiente de sus handlers. Acepta también las
+    listas de `_WorkerQueueHandler`.
+    """
+
+    def __init__(self, log_queue, *handlers, flush_interval=0.5):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.flush_interval = flush_interval
+        self._backlog = collections.deque()
+
+    def _get(self):
+        if self._backlog:
+            return self._backlog.popleft()
+        try:
+            return self.queue.get_nowait()
+        except queue.Empty:
+            pass
+        while True:
+            try:
+                # Solo `timeout`: la cola de subintérpretes no acepta `block`.
+                item = self.queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                for handler in self.handlers:
+                    handler.flush()
+                continue
+            # Se despertó por un registro: espera a que se junten más, así
+            # no compite con los workers por cada uno.
+            time.sleep(_GATHER_SECONDS)
+            return item
+
+    def dequeue(self, block):
+        item = self._get()
+        if type(item) is list:
+            self._backlog.extend(item)
+            item = self._backlog.popleft()
+        return _record_from_worker(item) if type(item) is tuple else item
+
+
+class LogPipeline:
+    """
+    Registro del servidor: `filename` con el formato `fmt`, y los mensajes de
+    `CONSOLE_LOGGER_NAME` en `console_stream` (por defecto `sys.stdout`).
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        fmt: str,
+        level: int = logging.INFO,
+        batch_records: int = 256,
+        flush_interval: float = 0.5,
+        console_stream=None,
+    ):
+        self.filename = filename
+        self.fmt = fmt
+        self.level = level
+        self.batch_records = batch_records
+        self.flush_interval = flush_interval
+        self.console_stream = console_stream
+        self._lock = threading.Lock()
+        self._handlers: List[logging.Handler] = []
+        self._listeners: List[BatchingQueueListener] = []
+        self._queue_handler: Optional[_LocalQueueHandler] = None
+        self._worker_queue = None
+        self._interpreter_queue = None
+
+    @property
+    def running(self) -> bool:
+        return self._queue_handler is not None
+
+    def _create_handlers(self) -> List[logging.Handler]:
+        file_handler = BatchingFileHandler(
+            self.filename,
+            batch_records=self.batch_records,
+            flush_interval=self.flush_interval,
+        )
+        file_handler.setFormatter(logging.Formatter(self.fmt))
+        file_handler.addFilter(lambda record: record.name != CONSOLE_LOGGER_NAME)
+
+        console_handler = BatchingStreamHandler(
+            self.console_stream or sys.stdout,
+            batch_records=self.batch_records,
+            flush_interval=self.flush_interval,
+        )
+        console_handler.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+        console_handler.addFilter(lambda record: record.name == CONSOLE_LOGGER_NAME)
+        return [file_handler, console_handler]
+
+    def _start_listener(self, log_queue) -> None:
+        listener = BatchingQueueListener(
+            log_queue, *self._handlers, flush_interval=self.flush_interval
+        )
+        listener.start()
+        self._listeners.append(listener)
+
+    def start(self) -> None:
+        """Deja al logger raíz escribiendo por la cola (reemplaza sus handlers)."""
+        with self._lock:
+            if self.running:
+                return
+            self._handlers = self._create_handlers()
+            local_queue = queue.SimpleQueue()
+            self._start_listener(local_queue)
+            self._queue_handler = _LocalQueueHandler(local_queue)
+            root = logging.getLogger()
+            for handler in root.handlers[:]:
+                root.removeHandler(handler)
+            root.addHandler(self._queue_handler)
+            root.setLevel(self.level)
+        atexit.register(self.stop)
+
+    def worker_queue(self):
+        """
+        Cola para los workers de un pool de procesos (se crea la primera vez,
+        con su hilo escritor). None si el registro no está iniciado.
+        """
+        with self._lock:
+            if not self.running:
+                return None
+            if self._worker_queue is None:
+                self._worker_queue = multiprocessing.Queue()
+                self._start_listener(self._worker_queue)
+            return self._worker_queue
+
+    def interpreter_queue(self):
+        """
+        Cola para los workers de un pool de subintérpretes (ver `worker_queue`).
+        None si el registro no está iniciado o no hay `concurrent.interpreters`.
+        """
+        with self._lock:
+            if not self.running or interpreters is None:
+                return None
+            if self._interpreter_queue is None:
+                self._interpreter_queue = interpreters.create_queue()
+                self._start_listener(self._interpreter_queue)
+            return self._interpreter_queue
+
+    def stop(self) -> None:
+        """
+        Escribe los registros pendientes y cierra el archivo. Llamarlo después
+        de cerrar los pools de procesos, para no perder sus últimos registros.
+        """
+        with self._lock:
+            if not self.running:
+                return
+            logging.getLogger().removeHandler(self._queue_handler)
+            self._queue_handler = None
+            for listener in self._listeners:
+                listener.stop()
+            for handler in self._handlers:
+                handler.close()
+            self._listeners.clear()
+            self._handlers.clear()
+            self._worker_queue = None
+            self._interpreter_queue = None
+        atexit.unregister(self.stop)
+
+
+def attach_worker_logging(
+    log_queue,
+    level: int = logging.INFO,
+    batch_records: int = 256,
+    flush_interval: float = 0.5,
+) -> None:
+    """
+    Inicializador de los workers de un pool de procesos: sus registros van al
+    servidor por `log_queue`, de a lotes. Sin cola, se deja el registro
+    heredado.
+    """
+    if log_queue is None:
+        return
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(_WorkerQueueHandler(log_queue, batch_records, flush_interval))
+    root.setLevel(level)
+
+
+def attach_interpreter_logging(log_queue, level: int = logging.INFO) -> None:
+    """
+    Inicializador de los workers de un pool de subintérpretes: arrancan sin
+    handlers, así que sin esto sus registros de nivel INFO se pierden. Sus
+    registros van al servidor por `log_queue` (ver `LogPipeline.interpreter_queue`).
+    """
+    if log_queue is None:
+        return
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(_TupleQueueHandler(log_queue))
+    root.setLevel(level)
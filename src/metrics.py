@@ -0,0 +1,233 @@
+"""
+Tiempos por etapa del servidor: dónde se va el tiempo de cada lote y de cada
+archivo.
+
+Cada etapa se mide con `time.monotonic()` (un `span` o una diferencia de
+marcas de tiempo) y se acumula en un `Histogram` por (etapa, modo). Las marcas
+que toma un worker de procesos se pueden comparar con las del servidor porque
+el reloj monotónico es del sistema, no del proceso.
+
+Etapas (ver `STAGES`):
+
+*   `admission`: espera del lote en el `BatchDispatcher` hasta tener workers.
+*   `queue_wait`: de que la tarea se envía al pool a que un worker la empieza.
+*   `read` y `regex`: lectura del archivo y análisis, dentro del worker. Con
+    `mmap` la lectura ocurre durante el análisis y cuenta como `regex`.
+*   `task`: la tarea completa en el worker.
+*   `result`: de que el worker termina a que el servidor tiene el resultado
+    (serialización, pipe o arena, y decodificación).
+*   `encode` y `send`: codificar el FILE_RESULT y enviarlo al cliente.
+*   `batch`: el lote completo.
+
+Los histogramas tienen cubetas logarítmicas (`SUBBUCKETS` por cada potencia de
+2): registrar un tiempo es O(1) y cada percentil se informa como la cota
+superior de su cubeta, a lo sumo un 1 / SUBBUCKETS (12.5 %) por encima del
+valor real.
+"""
+
+import contextlib
+import json
+import math
+import threading
+import time
+from typing import Dict, Iterator, Tuple
+
+
+STAGES = (
+    "admission",
+    "queue_wait",
+    "read",
+    "regex",
+    "task",
+    "result",
+    "encode",
+    "send",
+    "batch",
+)
+PERCENTILES = (50, 95, 99)
+SUBBUCKETS = 8
+# Workers con contadores propios; pasado este número se descarta el más viejo
+# (los pools de procesos reemplazan workers cada `max_tasks_per_process`).
+MAX_TRACKED_WORKERS = 512
+
+
+class Histogram:
+    """Distribución de duraciones (en segundos) de una etapa."""
+
+    __slots__ = ("count", "total", "min", "max", "zeros", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        self.zeros = 0
+        self.buckets: Dict[int, int] = {}
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+        if seconds <= 0:
+            self.zeros += 1
+            return
+        # seconds = mantissa · 2**exponent, con 0.5 <= mantissa < 1.
+        mantissa, exponent = math.frexp(seconds)
+        key = exponent * SUBBUCKETS + int((mantissa - 0.5) * 2 * SUBBUCKETS)
+        self.buckets[key] = self.buckets.get(key, 0) + 1
+
+    @staticmethod
+    def _upper(key: int) -> float:
+        exponent, sub = divmod(key, SUBBUCKETS)
+        return math.ldexp(0.5 + (sub + 1) / (2 * SUBBUCKETS), exponent)
+
+    def percentile(self, p: float) -> float:
+        """Cota superior de la cubeta donde cae el percentil `p` (0-100)."""
+        if not self.count:
+            return 0.0
+        rank = max(math.ceil(p / 100 * self.count), 1)
+        seen = self.zeros
+        if seen >= rank:
+            return 0.0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if seen >= rank:
+                return min(max(self._upper(key), self.min), self.max)
+        return self.max
+
+    def summary(self) -> Dict:
+        """Cantidad, media, percentiles y máximo, en milisegundos."""
+        summary = {"count": self.count}
+        if not self.count:
+            return summary
+        summary["mean_ms"] = round(self.total / self.count * 1000, 3)
+        for p in PERCENTILES:
+            summary[f"p{p}_ms"] = round(self.percentile(p) * 1000, 3)
+        summary["max_ms"] = round(self.max * 1000, 3)
+        return summary
+
+
+class Metrics:
+    """
+    Histogramas por (etapa, modo) y contadores por worker. Es seguro usarlo
+    desde varios hilos.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.started_at = time.time()
+            self._stages: Dict[Tuple[str, str], Histogram] = {}
+            self._workers: Dict[str, list] = {}  # id -> [tareas, segundos ocupado]
+
+    def _add(self, stage: str, mode: str, seconds: float) -> None:
+        histogram = self._stages.get((stage, mode))
+        if histogram is None:
+            histogram = self._stages[(stage, mode)] = Histogram()
+        histogram.add(seconds)
+
+    def record(self, stage: str, mode: str, seconds: float) -> None:
+        """Suma una duración de `stage` en el modo `mode`."""
+        with self._lock:
+            self._add(stage, mode, seconds)
+
+    @contextlib.contextmanager
+    def span(self, stage: str, mode: str) -> Iterator[None]:
+        """Mide el bloque `with` como una duración de `stage`."""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.record(stage, mode, time.monotonic() - start)
+
+    def record_task(
+        self, mode: str, submitted: float, timings: Dict, resolved: float
+    ) -> None:
+        """
+        Registra las etapas de una tarea del pool: `submitted` y `resolved`
+        son las marcas del servidor (envío al pool y resultado recuperado) y
+        `timings` las del worker (ver `process_file_task` en `src/worker.py`).
+        """
+        start, end = timings.get("start"), timings.get("end")
+        if start is None or end is None:
+            return
+        with self._lock:
+            self._add("queue_wait", mode, max(start - submitted, 0.0))
+            self._add("task", mode, end - start)
+            self._add("result", mode, max(resolved - end, 0.0))
+            for stage in ("read", "regex"):
+                if stage in timings:
+                    self._add(stage, mode, timings[stage])
+            worker_id = timings.get("worker", "?")
+            worker = self._workers.get(worker_id)
+            if worker is None:
+                if len(self._workers) >= MAX_TRACKED_WORKERS:
+                    del self._workers[next(iter(self._workers))]
+                worker = self._workers[worker_id] = [0, 0.0]
+            worker[0] += 1
+            worker[1] += end - start
+
+    def snapshot(self) -> Dict:
+        """Resumen JSON de las métricas (lo que devuelve GET_METRICS)."""
+        with self._lock:
+            stages: Dict[str, Dict] = {}
+            for stage in STAGES:
+                for (name, mode), histogram in sorted(self._stages.items()):
+                    if name == stage:
+                        stages.setdefault(stage, {})[mode] = histogram.summary()
+            workers = {
+                worker: {
+                    "tasks": tasks,
+                    "busy_seconds": round(busy, 6),
+                    "mean_task_ms": round(busy / tasks * 1000, 3),
+                }
+                for worker, (tasks, busy) in sorted(self._workers.items())
+            }
+            return {
+                "since": self.started_at,
+                "elapsed_seconds": round(time.time() - self.started_at, 3),
+                "stages": stages,
+                "workers": workers,
+            }
+
+    def dump(self, path: str) -> Dict:
+        """Escribe `snapshot()` como JSON en `path` y lo devuelve."""
+        snapshot = self.snapshot()
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, indent=2, ensure_ascii=False)
+        return snapshot
+
+
+def format_metrics(snapshot: Dict) -> str:
+    """Tabla de texto de un `snapshot()`, para la consola del servidor."""
+    lines = [
+        f"{'etapa':<11} {'modo':<8} {'n':>7} {'media':>9} "
+        + " ".join(f"{f'p{p}':>9}" for p in PERCENTILES)
+        + f" {'máx':>9}  (ms)"
+    ]
+    for stage, modes in snapshot["stages"].items():
+        for mode, summary in modes.items():
+            if not summary["count"]:
+                continue
+            lines.append(
+                f"{stage:<11} {mode:<8} {summary['count']:>7} "
+                f"{summary['mean_ms']:>9.3f} "
+                + " ".join(f"{summary[f'p{p}_ms']:>9.3f}" for p in PERCENTILES)
+                + f" {summary['max_ms']:>9.3f}"
+            )
+    if len(lines) == 1:
+        lines.append("  (sin datos todavía)")
+    if snapshot["workers"]:
+        lines.append(
+            f"\n{'worker':<24} {'tareas':>7} {'ocupado (s)':>12} {'media (ms)':>11}"
+        )
+        for worker, stats in snapshot["workers"].items():
+            lines.append(
+                f"{worker:<24} {stats['tasks']:>7} {stats['busy_seconds']:>12.3f} "
+                f"{stats['mean_task_ms']:>11.3f}"
+            )
+    return "\n".join(lines)
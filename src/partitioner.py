@@ -0,0 +1,228 @@
+"""
+Reparto de archivos entre clientes según el trabajo que cuesta cada archivo y
+la capacidad (workers) de cada cliente.
+
+El comando `trigger` del servidor repartía la misma cantidad de archivos a cada
+cliente, sin mirar su tamaño ni cuántos workers tiene el cliente: un cliente
+podía recibir todos los archivos grandes y tardar mucho más que el resto. Acá
+cada archivo pesa su tamaño (más un costo fijo por archivo) y los archivos se
+asignan con LPT (Longest Processing Time first): del más pesado al más liviano,
+cada uno al cliente que terminaría antes si lo recibiera. Así todos los lotes
+de un trigger terminan más o menos a la vez.
+
+`ThroughputModel` convierte el peso en segundos con un promedio móvil de los
+segundos por byte medidos en los lotes anteriores, para predecir el makespan.
+En el modo dinámico, `WorkStealingQueues` reparte los mismos archivos a medida
+que los workers se liberan, con robo de trabajo entre lotes.
+"""
+
+import collections
+import heapq
+import threading
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+
+# Costo fijo de cada archivo (abrirlo, elegir extractor, enviar el resultado),
+# en bytes equivalentes: muchos archivos chicos no son gratis.
+FILE_OVERHEAD_BYTES = 16 * 1024
+
+# Segundos por byte (por worker) antes de medir el primer lote.
+DEFAULT_SECONDS_PER_BYTE = 2e-7
+
+
+class Partition(NamedTuple):
+    """Resultado de `partition_files`, con una posición por cliente."""
+
+    assignments: List[List[str]]  # archivos, del más pesado al más liviano
+    loads: List[int]  # peso total asignado
+    finish_units: List[float]  # duración prevista, en bytes por worker
+
+    @property
+    def makespan_units(self) -> float:
+        """Duración prevista del cliente que termina último."""
+        return max(self.finish_units, default=0.0)
+
+
+def file_weight(size: int) -> int:
+    """Peso de un archivo de `size` bytes."""
+    return size + FILE_OVERHEAD_BYTES
+
+
+def batch_units(weights: Iterable[int], workers: int) -> float:
+    """
+    Duración prevista de un lote con `workers` workers, en bytes por worker.
+
+    Un archivo no se reparte entre workers, así que el lote no puede durar
+    menos que su archivo más pesado.
+    """
+    weights = list(weights)
+    if not weights:
+        return 0.0
+    return max(sum(weights) / max(workers, 1), max(weights))
+
+
+def partition_files(
+    files: Iterable[Tuple[str, int]], capacities: List[int]
+) -> Partition:
+    """
+    Reparte archivos entre clientes con LPT.
+
+    Los archivos se recorren del más pesado al más liviano, y cada uno va al
+    cliente con menor `(carga + peso) / capacidad`. Los clientes se agrupan por
+    capacidad, con un heap de cargas por grupo: dentro de un grupo el mejor es
+    siempre el de menor carga, así que cada archivo cuesta O(grupos · log n) y
+    no O(clientes). Los empates van al cliente de menor índice.
+
+    Args:
+        files: Pares (nombre, peso), ej. con `file_weight(tamaño)`.
+        capacities: Workers de cada cliente (al menos 1 cada uno).
+
+    Returns:
+        Un `Partition` con los archivos, la carga y la duración prevista de
+        cada cliente.
+    """
+    if not capacities:
+        raise ValueError("Se necesita al menos un cliente.")
+    capacities = [max(int(c), 1) for c in capacities]
+    groups: Dict[int, List[Tuple[int, int]]] = {}  # capacidad -> heap (carga, i)
+    for index, capacity in enumerate(capacities):
+        groups.setdefault(capacity, []).append((0, index))
+
+    assignments: List[List[str]] = [[] for _ in capacities]
+    loads = [0] * len(capacities)
+    weights: List[List[int]] = [[] for _ in capacities]
+    for name, weight in sorted(files, key=lambda item: (-item[1], item[0])):
+        best = None
+        for capacity, heap in groups.items():
+            load, index = heap[0]
+            finish = (load + weight) / capacity
+            if best is None or (finish, index) < best[:2]:
+                best = (finish, index, capacity)
+        _, index, capacity = best
+        loads[index] += weight
+        heapq.heapreplace(groups[capacity], (loads[index], index))
+        assignments[index].append(name)
+        weights[index].append(weight)
+
+    finish_units = [
+        batch_units(client_weights, capacity)
+        for client_weights, capacity in zip(weights, capacities)
+    ]
+    return Partition(assignments, loads, finish_units)
+
+
+class ThroughputModel:
+    """
+    Segundos por byte (por worker) de procesamiento, para convertir la
+    duración prevista de un lote en segundos.
+
+    Después de cada lote, `observe` compara la duración medida con la prevista
+    en bytes por worker y actualiza un promedio móvil exponencial. Es seguro
+    usarlo desde varios hilos.
+    """
+
+    def __init__(
+        self, seconds_per_byte: float = DEFAULT_SECONDS_PER_BYTE, alpha: float = 0.3
+    ):
+        """
+        Args:
+            seconds_per_byte (float): Estimación inicial.
+            alpha (float): Peso de cada medición nueva en el promedio (0 a 1).
+        """
+        self.seconds_per_byte = seconds_per_byte
+        self.alpha = alpha
+        self.samples = 0
+        self._lock = threading.Lock()
+
+    def predict(self, units: float) -> float:
+        """Segundos previstos para una duración en bytes por worker."""
+        return units * self.seconds_per_byte
+
+    def observe(self, units: float, seconds: float) -> None:
+        """Registra un lote de `units` bytes por worker que tardó `seconds`."""
+        if units <= 0 or seconds <= 0:
+            return
+        measured = seconds / units
+        with self._lock:
+            if self.samples == 0:
+                self.seconds_per_byte = measured
+            else:
+                self.seconds_per_byte += self.alpha * (measured - self.seconds_per_byte)
+            self.samples += 1
+
+
+class WorkStealingQueues:
+    """
+    Colas de archivos de un trigger dinámico, una por lote.
+
+    Cada lote empieza con su parte de `partition_files` (del archivo más
+    pesado al más liviano) y toma archivos de a uno a medida que se liberan
+    sus workers. Un lote que vació su cola le roba al lote con más trabajo
+    pendiente, desde el final de su cola (sus archivos más livianos). Así un
+    cliente rápido no queda ocioso mientras otro todavía tiene una cola larga,
+    y los archivos de un lote que nunca arranca (ej. su cliente se desconectó)
+    o que falla pasan a los demás con `close`. Es seguro usarlas desde varios
+    hilos.
+    """
+
+    def __init__(self, assignments: List[List[str]], weights: Dict[str, int]):
+        """
+        Args:
+            assignments: Archivos iniciales de cada lote.
+            weights: Nombre de archivo -> peso.
+        """
+        self._queues = [collections.deque(files) for files in assignments]
+        self._loads = [sum(weights[name] for name in files) for files in assignments]
+        self._weights = weights
+        # Lotes que todavía van a pedir trabajo con `take`.
+        self._open = set(range(len(assignments)))
+        self._lock = threading.Lock()
+        self.steals = 0
+
+    def take(self, owner: int) -> Optional[Tuple[str, bool]]:
+        """
+        Próximo archivo para el lote `owner`: (nombre, si fue robado), o None
+        si no queda trabajo en ninguna cola (desde ahí el lote ya no recibe
+        archivos de `close`).
+        """
+        with self._lock:
+            source = owner
+            if not self._queues[owner]:
+                source = max(range(len(self._queues)), key=self._loads.__getitem__)
+                if not self._queues[source]:
+                    self._open.discard(owner)
+                    return None
+                name = self._queues[source].pop()
+                self.steals += 1
+            else:
+                name = self._queues[owner].popleft()
+            self._loads[source] -= self._weights[name]
+            return name, source != owner
+
+    def close(self, owner: int) -> List[str]:
+        """
+        Retira el lote `owner` (terminó, falló o nunca arrancó). Los archivos
+        que quedaban en su cola pasan, de a uno y del más pesado al más
+        liviano, al lote abierto con menos carga pendiente.
+
+        Returns:
+            Los archivos que no se pudieron reasignar porque no queda ningún
+            lote abierto; se sacan de las colas y nadie los procesa.
+        """
+        with self._lock:
+            self._open.discard(owner)
+            files = list(self._queues[owner])
+            self._queues[owner].clear()
+            self._loads[owner] = 0
+            if not self._open:
+                return files
+            for name in files:
+                target = min(self._open, key=self._loads.__getitem__)
+                self._queues[target].append(name)
+                self._loads[target] += self._weights[name]
+            return []
+
+    def pending(self, owner: int) -> List[str]:
+        """Archivos que todavía esperan en la cola del lote `owner`."""
+        with self._lock:
+            return list(self._queues[owner])
@@ -1,14 +1,43 @@
 """
 Define la estructura de datos para representar un proceso o tarea
 dentro de la simulación de scheduling.
+
+`Process` declara todos sus campos en `__slots__` (sin `__dict__` por objeto).
+Para cargas muy grandes, `ProcessTable` guarda los mismos campos por columnas,
+en arreglos tipados del módulo `array`, y entrega vistas livianas que se usan
+igual que un `Process`.
 """
 
+from array import array
+from typing import Iterable, Iterator, List, Tuple
+
+
 class Process:
     """
     Representa una única tarea (generalmente asociada a un archivo .txt)
     que será gestionada por el planificador (scheduler).
     """
 
+    __slots__ = (
+        "pid",
+        "filename",
+        "arrival_time",
+        "burst_time",
+        "remaining_burst_time",
+        "priority",
+        "start_time",
+        "completion_time",
+        "waiting_time",
+        "turnaround_time",
+        "state",
+        "turnaround_formula",
+        "waiting_formula",
+        "response_ratio",
+        "ticks_in_current_burst",
+        "queue_level",
+        "last_cpu",
+    )
+
     def __init__(
         self,
         pid: int,
@@ -42,7 +71,9 @@ class Process:
         self.turnaround_formula = ""
         self.waiting_formula = ""
         self.response_ratio = 0.0 # Para el algoritmo HRRN
-
+        self.ticks_in_current_burst = 0 # Ticks corridos en el tramo actual (quantum)
+        self.queue_level = 0 # Nivel de la cola en MLFQ (0 = más prioritario)
+        self.last_cpu = -1 # Último CPU en que corrió (-1 = todavía no corrió)
 
     def __str__(self):
         """Representación simple en string del proceso."""
@@ -65,6 +96,171 @@ class Process:
         )
 
 
+# Estados posibles de un proceso; `ProcessTable` guarda el índice en esta tupla.
+PROCESS_STATES = ("New", "Ready", "Running", "Terminated")
+
+
+class ProcessTable:
+    """
+    Tabla de procesos guardada por columnas ("struct of arrays").
+
+    Cada campo numérico de `Process` es un `array` tipado ('q' para enteros de
+    64 bits, 'd' para `response_ratio`, 'b' para el estado), así que un proceso
+    ocupa unas decenas de bytes en lugar de un objeto con una referencia a un
+    entero por campo. `filename` y las fórmulas, que son texto, van en listas.
+
+    `table[i]` (o iterar la tabla) devuelve una `ProcessView`: un objeto de dos
+    referencias que lee y escribe la fila `i`, y que los schedulers y
+    `simulate()` pueden usar como un `Process`.
+
+    Las columnas son atributos públicos (`table.burst_time`, etc.). Con numpy,
+    `numpy.frombuffer(table.burst_time, dtype=numpy.int64)` las ve sin copiarlas.
+    """
+
+    INT_FIELDS = (
+        "pid",
+        "arrival_time",
+        "burst_time",
+        "remaining_burst_time",
+        "priority",
+        "start_time",
+        "completion_time",
+        "waiting_time",
+        "turnaround_time",
+        "ticks_in_current_burst",
+        "queue_level",
+        "last_cpu",
+    )
+    TEXT_FIELDS = ("filename", "turnaround_formula", "waiting_formula")
+
+    def __init__(self, rows: Iterable[Tuple] = ()):
+        """
+        Args:
+            rows: Tuplas (pid, filename, arrival_time, burst_time[, priority]),
+                  los mismos argumentos que recibe `Process`.
+        """
+        for name in self.INT_FIELDS:
+            setattr(self, name, array("q"))
+        for name in self.TEXT_FIELDS:
+            setattr(self, name, [])
+        self.response_ratio = array("d")
+        self.state = array("b")
+        for row in rows:
+            self.append(*row)
+
+    @classmethod
+    def from_processes(cls, processes: Iterable[Process]) -> "ProcessTable":
+        """Copia objetos `Process` (con su estado actual) a una tabla nueva."""
+        table = cls()
+        for process in processes:
+            index = table.append(
+                process.pid,
+                process.filename,
+                process.arrival_time,
+                process.burst_time,
+                process.priority,
+            )
+            view = table[index]
+            for name in Process.__slots__:
+                setattr(view, name, getattr(process, name))
+        return table
+
+    def append(
+        self,
+        pid: int,
+        filename: str,
+        arrival_time: int,
+        burst_time: int,
+        priority: int = 0,
+    ) -> int:
+        """Agrega un proceso nuevo (como `Process(...)`) y devuelve su índice."""
+        self.pid.append(pid)
+        self.filename.append(filename)
+        self.arrival_time.append(arrival_time)
+        self.burst_time.append(burst_time)
+        self.remaining_burst_time.append(burst_time)
+        self.priority.append(priority)
+        self.start_time.append(-1)
+        self.completion_time.append(-1)
+        self.waiting_time.append(0)
+        self.turnaround_time.append(0)
+        self.ticks_in_current_burst.append(0)
+        self.queue_level.append(0)
+        self.last_cpu.append(-1)
+        self.turnaround_formula.append("")
+        self.waiting_formula.append("")
+        self.response_ratio.append(0.0)
+        self.state.append(0)
+        return len(self.pid) - 1
+
+    def __len__(self):
+        return len(self.pid)
+
+    def __getitem__(self, index: int) -> "ProcessView":
+        if not -len(self) <= index < len(self):
+            raise IndexError("índice fuera de la tabla de procesos")
+        return ProcessView(self, index % len(self))
+
+    def __iter__(self) -> Iterator["ProcessView"]:
+        for index in range(len(self)):
+            yield ProcessView(self, index)
+
+    def views(self) -> List["ProcessView"]:
+        """Una vista por fila, para pasarle la tabla a `simulate()`."""
+        return list(self)
+
+    def to_process(self, index: int) -> Process:
+        """Copia la fila `index` a un objeto `Process` independiente."""
+        view = self[index]
+        process = Process(view.pid, view.filename, view.arrival_time, view.burst_time)
+        for name in Process.__slots__:
+            setattr(process, name, getattr(view, name))
+        return process
+
+
+class ProcessView:
+    """
+    Una fila de una `ProcessTable`, con los mismos atributos que `Process`.
+
+    No guarda datos propios: leer o escribir `view.burst_time` lee o escribe la
+    columna de la tabla. Dos vistas de la misma fila ven los mismos valores,
+    pero son objetos distintos (la cola Ready las distingue por identidad).
+    """
+
+    __slots__ = ("table", "index")
+
+    def __init__(self, table: ProcessTable, index: int):
+        self.table = table
+        self.index = index
+
+    @property
+    def state(self) -> str:
+        return PROCESS_STATES[self.table.state[self.index]]
+
+    @state.setter
+    def state(self, value: str):
+        self.table.state[self.index] = PROCESS_STATES.index(value)
+
+    __str__ = Process.__str__
+    __repr__ = Process.__repr__
+
+
+def _column_property(name):
+    """Propiedad de `ProcessView` que lee y escribe la columna `name`."""
+
+    def fget(view):
+        return getattr(view.table, name)[view.index]
+
+    def fset(view, value):
+        getattr(view.table, name)[view.index] = value
+
+    return property(fget, fset)
+
+
+for _name in ProcessTable.INT_FIELDS + ProcessTable.TEXT_FIELDS + ("response_ratio",):
+    setattr(ProcessView, _name, _column_property(_name))
+del _name
+
 if __name__ == "__main__":
     # Ejemplo de cómo crear y usar la clase Process (para pruebas rápidas)
     p1 = Process(pid=1, filename="doc1.txt", arrival_time=0, burst_time=5)
@@ -0,0 +1,166 @@
+"""
+Framing de los mensajes JSON entre cliente y servidor.
+
+Versiones del protocolo:
+    v1: un JSON por línea, terminado en "\\n" (formato original).
+    v2: frames con prefijo de longitud. Cada frame tiene una cabecera de 5 bytes
+        (longitud del payload en 4 bytes big-endian + 1 byte de flags) seguida
+        del JSON en UTF-8, opcionalmente comprimido con zlib (FLAG_ZLIB).
+
+Negociación: toda conexión empieza en v1. El WELCOME del servidor anuncia las
+versiones que soporta (`server_info.protocols`). Si el cliente soporta v2,
+envía HELLO como su última línea v1 y desde ahí envía frames v2. El servidor
+contesta ACK_HELLO como su última línea v1 y desde ahí también usa v2. Un
+cliente que no envía HELLO sigue en v1 toda la conexión.
+"""
+
+import json
+import struct
+import zlib
+
+
+PROTOCOL_V1 = 1
+PROTOCOL_V2 = 2
+SUPPORTED_PROTOCOLS = [PROTOCOL_V1, PROTOCOL_V2]
+COMPRESSION_ZLIB = "zlib"
+
+FRAME_HEADER = struct.Struct("!IB")
+FLAG_ZLIB = 0x01
+
+# Solo se comprimen payloads de al menos este tamaño (en los chicos no conviene).
+COMPRESS_MIN_BYTES = 1024
+# Tamaño máximo aceptado para un mensaje (línea v1 o frame v2).
+MAX_MESSAGE_BYTES = 64 * 1024 * 1024
+# Espacio libre mínimo que se reserva en el buffer antes de cada recv_into.
+RECV_CHUNK = 64 * 1024
+
+
+class ProtocolError(Exception):
+    """Datos recibidos que no respetan el framing acordado."""
+
+
+def _inflate(data):
+    """
+    Descomprime el payload zlib de un frame sin generar más de
+    MAX_MESSAGE_BYTES: un frame chico no puede expandirse sin límite en
+    memoria (bomba de descompresión).
+
+    Raises:
+        ProtocolError: Si el payload no es zlib válido, está incompleto o
+        supera MAX_MESSAGE_BYTES al descomprimirlo.
+    """
+    decompressor = zlib.decompressobj()
+    try:
+        message = decompressor.decompress(data, MAX_MESSAGE_BYTES)
+    except zlib.error as e:
+        raise ProtocolError(f"Payload zlib inválido: {e}") from e
+    if decompressor.unconsumed_tail:
+        raise ProtocolError("Frame demasiado grande al descomprimirlo.")
+    if not decompressor.eof:
+        raise ProtocolError("Payload zlib incompleto.")
+    return message
+
+
+def encode_message(message, version=PROTOCOL_V1, compress=False):
+    """
+    Codifica un mensaje (dict) para enviarlo con la versión de protocolo dada.
+
+    Returns:
+        bytes: Línea JSON terminada en "\\n" (v1) o frame con cabecera (v2).
+    """
+    if version == PROTOCOL_V1:
+        return (json.dumps(message) + "\n").encode("utf-8")
+
+    data = json.dumps(message, separators=(",", ":")).encode("utf-8")
+    flags = 0
+    if compress and len(data) >= COMPRESS_MIN_BYTES:
+        compressed = zlib.compress(data, 1)
+        if len(compressed) < len(data):
+            data, flags = compressed, FLAG_ZLIB
+    return FRAME_HEADER.pack(len(data), flags) + data
+
+
+class MessageReader:
+    """
+    Separa los mensajes recibidos por un socket, en v1 o v2.
+
+    Los datos se leen con `recv_into` sobre un `bytearray` preasignado, que se
+    compacta o crece solo cuando hace falta. Cada byte se copia una vez al
+    recibirlo y otra al extraer su mensaje, sin importar en cuántos `recv` haya
+    llegado (con un buffer `str` y `split` el costo crecía de forma cuadrática).
+    `version` puede cambiarse entre mensajes, al negociar el protocolo.
+    """
+
+    def __init__(self, initial_size=RECV_CHUNK):
+        self.version = PROTOCOL_V1
+        self._buf = bytearray(initial_size)
+        self._start = 0  # primer byte sin consumir
+        self._end = 0  # fin de los datos recibidos
+        self._scan = 0  # en v1, hasta dónde ya se buscó "\n"
+
+    def _reserve(self, needed):
+        """Garantiza al menos `needed` bytes libres al final del buffer."""
+        if len(self._buf) - self._end >= needed:
+            return
+        pending = self._end - self._start
+        if self._start:
+            self._buf[:pending] = self._buf[self._start : self._end]
+            self._scan = max(self._scan - self._start, 0)
+            self._start, self._end = 0, pending
+        if len(self._buf) - self._end < needed:
+            new_size = max(len(self._buf) * 2, pending + needed)
+            self._buf.extend(bytes(new_size - len(self._buf)))
+
+    def recv_from(self, sock):
+        """Lee del socket directamente al buffer. Devuelve los bytes leídos (0 = EOF)."""
+        self._reserve(RECV_CHUNK)
+        view = memoryview(self._buf)[self._end :]
+        try:
+            received = sock.recv_into(view)
+        finally:
+            view.release()
+        self._end += received
+        return received
+
+    def feed(self, data):
+        """Agrega bytes ya recibidos por otro medio (ej. un StreamReader de asyncio)."""
+        self._reserve(len(data))
+        self._buf[self._end : self._end + len(data)] = data
+        self._end += len(data)
+
+    def messages(self):
+        """
+        Genera los mensajes completos del buffer como bytes JSON (UTF-8).
+
+        Raises:
+            ProtocolError: Si un mensaje supera MAX_MESSAGE_BYTES (también al
+            descomprimirlo) o su payload zlib es inválido.
+        """
+        while self._start < self._end:
+            if self.version == PROTOCOL_V1:
+                newline = self._buf.find(b"\n", max(self._scan, self._start), self._end)
+                if newline < 0:
+                    self._scan = self._end
+                    if self._end - self._start > MAX_MESSAGE_BYTES:
+                        raise ProtocolError("Línea demasiado larga.")
+                    return
+                message = bytes(self._buf[self._start : newline])
+                self._start = self._scan = newline + 1
+            else:
+                available = self._end - self._start
+                if available < FRAME_HEADER.size:
+                    return
+                length, flags = FRAME_HEADER.unpack_from(self._buf, self._start)
+                if length > MAX_MESSAGE_BYTES:
+                    raise ProtocolError(f"Frame demasiado grande ({length} bytes).")
+                if available < FRAME_HEADER.size + length:
+                    return
+                body = self._start + FRAME_HEADER.size
+                message = bytes(self._buf[body : body + length])
+                self._start = body + length
+                if flags & FLAG_ZLIB:
+                    message = _inflate(message)
+
+            if self._start == self._end:
+                self._start = self._end = self._scan = 0
+            yield message
@@ -0,0 +1,322 @@
+"""
+Caché persistente de resultados de extracción para el servidor.
+
+Evita volver a procesar archivos cuyo contenido no cambió desde la última vez.
+Cada resultado se identifica por (ruta, tamaño, mtime, hash del contenido,
+versión del extractor) y se guarda en dos niveles: un LRU en memoria y una
+base SQLite local que sobrevive a reinicios del servidor.
+"""
+
+import collections
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, NamedTuple, Optional, Tuple
+
+
+class CacheKey(NamedTuple):
+    """
+    Identifica el contenido de un archivo en un momento dado. `content_hash`
+    es None si todavía no se leyó el archivo: lo calcula el worker que lo
+    procesa (ver `ResultCache.lookup`).
+    """
+
+    path: str
+    size: int
+    mtime_ns: int
+    content_hash: Optional[str]
+
+
+def content_digest():
+    """Objeto hash con el que se identifica el contenido de los archivos."""
+    return hashlib.blake2b(digest_size=20)
+
+
+def hash_file(filepath: str, block_size: int = 1024 * 1024) -> str:
+    """Calcula el hash BLAKE2b del contenido de un archivo leyendo por bloques."""
+    digest = content_digest()
+    with open(filepath, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Caché de resultados en dos niveles (LRU en memoria + SQLite en disco).
+
+    Si la ruta, el tamaño y el mtime coinciden con una entrada conocida, el
+    resultado se devuelve sin leer el archivo. Si solo cambió el mtime (ej. un
+    `touch`), se recalcula el hash y se reutiliza el resultado si el contenido
+    es el mismo. En los demás casos el archivo se lee una sola vez: el worker
+    que lo procesa calcula el hash mientras lo lee y se pasa a `store`. Es
+    seguro usarla desde varios hilos.
+
+    Las escrituras en disco (resultados nuevos, filas de `files` y el
+    `last_used` de los aciertos) se juntan en memoria y se escriben en una
+    sola transacción con `flush`, al terminar cada lote o cada `write_batch`
+    escrituras. Mientras tanto, `lookup` ya las ve.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        extractor_version: str,
+        memory_entries: int = 1024,
+        max_entries: int = 100_000,
+        write_batch: int = 256,
+    ):
+        """
+        Args:
+            db_path (str): Archivo SQLite donde se guardan los resultados.
+            extractor_version (str): Versión del extractor; al cambiarla, los
+                                     resultados anteriores dejan de usarse.
+            memory_entries (int): Tamaño máximo del LRU en memoria.
+            max_entries (int): Cantidad máxima de resultados guardados en disco.
+            write_batch (int): Escrituras pendientes a partir de las cuales
+                               `store` llama a `flush` sin esperar al lote.
+        """
+        self.extractor_version = extractor_version
+        self.memory_entries = memory_entries
+        self.max_entries = max_entries
+        self.write_batch = write_batch
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._memory: "collections.OrderedDict[tuple, Dict]" = collections.OrderedDict()
+        # Escrituras aún no guardadas en disco (ver `flush`).
+        self._pending_files: Dict[str, CacheKey] = {}
+        self._pending_results: Dict[str, Tuple[str, float]] = {}  # hash -> (json, uso)
+        self._pending_touches: Dict[str, float] = {}  # hash -> último uso
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                content_hash TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS results (
+                content_hash TEXT NOT NULL,
+                version TEXT NOT NULL,
+                data TEXT NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (content_hash, version)
+            );
+            CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used);
+            CREATE INDEX IF NOT EXISTS files_content_hash ON files (content_hash);
+            """
+        )
+        with self._db:
+            # Filas de `files` cuyo resultado ya se descartó (versiones
+            # anteriores no las borraban).
+            self._db.execute(
+                "DELETE FROM files WHERE content_hash NOT IN "
+                "(SELECT content_hash FROM results)"
+            )
+            self._disk_entries = self._db.execute(
+                "SELECT COUNT(*) FROM results"
+            ).fetchone()[0]
+            self._trim()
+
+    def _memory_key(self, path: str, size: int, mtime_ns: int) -> tuple:
+        return (path, size, mtime_ns, self.extractor_version)
+
+    def _remember(self, memory_key: tuple, data: Dict) -> None:
+        """Guarda en el LRU en memoria, descartando la entrada más antigua."""
+        self._memory[memory_key] = data
+        self._memory.move_to_end(memory_key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _load_result(self, content_hash: str) -> Optional[Dict]:
+        pending = self._pending_results.get(content_hash)
+        if pending is not None:
+            self._pending_results[content_hash] = (pending[0], time.time())
+            return json.loads(pending[0])
+        row = self._db.execute(
+            "SELECT data FROM results WHERE content_hash = ? AND version = ?",
+            (content_hash, self.extractor_version),
+        ).fetchone()
+        if row is None:
+            return None
+        self._pending_touches[content_hash] = time.time()
+        return json.loads(row[0])
+
+    def _file_row(self, path: str) -> Optional[tuple]:
+        """(tamaño, mtime_ns, hash) conocidos de `path`, o None."""
+        key = self._pending_files.get(path)
+        if key is not None:
+            return key.size, key.mtime_ns, key.content_hash
+        return self._db.execute(
+            "SELECT size, mtime_ns, content_hash FROM files WHERE path = ?",
+            (path,),
+        ).fetchone()
+
+    def lookup(self, path: str) -> Tuple[Optional[Dict], Optional[CacheKey]]:
+        """
+        Busca el resultado guardado para un archivo.
+
+        Returns:
+            Tuple[Optional[Dict], Optional[CacheKey]]: El resultado (o None si no
+            está) y la clave a usar con `store` tras procesarlo. La clave es None
+            si el archivo no se puede leer, y su hash es None si el archivo es
+            nuevo o cambió de tamaño.
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None, None
+
+        memory_key = self._memory_key(path, stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            data = self._memory.get(memory_key)
+            if data is not None:
+                self._memory.move_to_end(memory_key)
+                self.hits += 1
+                return data, None
+
+            row = self._file_row(path)
+            if row is not None and row[0] == stat.st_size and row[1] == stat.st_mtime_ns:
+                data = self._load_result(row[2])
+                if data is not None:
+                    self._remember(memory_key, data)
+                    self.hits += 1
+                    return data, None
+
+            if row is None or row[0] != stat.st_size:
+                # El contenido cambió o no se conoce: el hash lo calcula el
+                # worker al leer el archivo para procesarlo.
+                self.misses += 1
+                return None, CacheKey(path, stat.st_size, stat.st_mtime_ns, None)
+
+        # Solo cambió el mtime (ej. un `touch`): se compara su contenido.
+        try:
+            key = CacheKey(path, stat.st_size, stat.st_mtime_ns, hash_file(path))
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None, None
+
+        with self._lock:
+            data = self._load_result(key.content_hash)
+            if data is not None:
+                self._pending_files[key.path] = key
+                self._remember(memory_key, data)
+                self.hits += 1
+                return data, None
+            self.misses += 1
+        return None, key
+
+    def store(
+        self, key: CacheKey, data: Dict, content_hash: Optional[str] = None
+    ) -> None:
+        """
+        Guarda el resultado de un archivo procesado con la clave de `lookup`.
+        Si la clave no trae el hash se usa `content_hash`, el que calculó el
+        worker al leer el archivo; sin ninguno de los dos no se guarda nada.
+        Queda en disco con el próximo `flush`.
+        """
+        if key.content_hash is None:
+            if content_hash is None:
+                return
+            key = key._replace(content_hash=content_hash)
+        encoded = json.dumps(data)
+        with self._lock:
+            self._pending_files[key.path] = key
+            self._pending_results[key.content_hash] = (encoded, time.time())
+            self._remember(self._memory_key(key.path, key.size, key.mtime_ns), data)
+            pending = len(self._pending_files) + len(self._pending_touches)
+            if pending >= self.write_batch:
+                self._flush()
+
+    def flush(self) -> None:
+        """Escribe en disco, en una sola transacción, lo guardado desde el último."""
+        with self._lock:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not (self._pending_files or self._pending_results or self._pending_touches):
+            return
+        version = self.extractor_version
+        with self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO files (path, size, mtime_ns, content_hash) "
+                "VALUES (?, ?, ?, ?)",
+                [
+                    (key.path, key.size, key.mtime_ns, key.content_hash)
+                    for key in self._pending_files.values()
+                ],
+            )
+            results = [
+                (data, last_used, content_hash, version)
+                for content_hash, (data, last_used) in self._pending_results.items()
+            ]
+            self._db.executemany(
+                "UPDATE results SET data = ?, last_used = ? "
+                "WHERE content_hash = ? AND version = ?",
+                results,
+            )
+            inserted = self._db.executemany(
+                "INSERT OR IGNORE INTO results "
+                "(data, last_used, content_hash, version) VALUES (?, ?, ?, ?)",
+                results,
+            ).rowcount
+            self._disk_entries += max(inserted, 0)
+            self._db.executemany(
+                "UPDATE results SET last_used = ? "
+                "WHERE content_hash = ? AND version = ?",
+                [
+                    (last_used, content_hash, version)
+                    for content_hash, last_used in self._pending_touches.items()
+                ],
+            )
+            self._trim()
+        self._pending_files.clear()
+        self._pending_results.clear()
+        self._pending_touches.clear()
+
+    def _trim(self) -> None:
+        """
+        Descarta los resultados usados hace más tiempo por encima de
+        `max_entries`, y las filas de `files` que apuntaban a ellos. Solo
+        consulta la base cuando el contador de resultados pasa el límite.
+        """
+        excess = self._disk_entries - self.max_entries
+        if excess <= 0:
+            return
+        evicted = self._db.execute(
+            "SELECT rowid, content_hash FROM results ORDER BY last_used LIMIT ?",
+            (excess,),
+        ).fetchall()
+        self._db.executemany(
+            "DELETE FROM results WHERE rowid = ?", [(rowid,) for rowid, _ in evicted]
+        )
+        self._db.executemany(
+            "DELETE FROM files WHERE content_hash = ? AND NOT EXISTS "
+            "(SELECT 1 FROM results WHERE content_hash = ?)",
+            [(content_hash, content_hash) for content_hash in {h for _, h in evicted}],
+        )
+        self._disk_entries -= len(evicted)
+
+    def stats(self) -> Dict:
+        """Contadores de aciertos/fallos y tamaño de cada nivel."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "memory_entries": len(self._memory),
+                "disk_entries": self._disk_entries,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush()
+            self._db.close()
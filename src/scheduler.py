@@ -3,19 +3,419 @@ Implementa diferentes algoritmos de scheduling (planificación) de procesos.
 
 Cada algoritmo debe poder decidir qué proceso(s) de la cola 'Ready'
 deberían ejecutarse a continuación, basándose en sus propias reglas.
+
+La cola Ready puede ser una `ReadyQueue` (heap, O(log n) por operación, creada
+con `scheduler.create_ready_queue()`) o una lista simple, que se sigue
+aceptando por compatibilidad (se ordena completa en cada selección). MLFQ usa
+su propia cola, `MultilevelQueue` (una deque por nivel, O(1) por operación), y
+HRRN `ResponseRatioQueue` (procesos agrupados por ráfaga).
 """
 
-from typing import List, Optional
+import heapq
+import itertools
+from collections import deque
+from typing import Callable, Iterable, List, Optional, Union
 
 from .process import Process
 
 
+# Marca de las entradas del heap que ya no están en la cola (borrado perezoso).
+_REMOVED = object()
+
+
+class ReadyQueue:
+    """
+    Cola Ready ordenada por una clave, implementada sobre `heapq`.
+
+    Cada entrada del heap es `[clave, orden_de_inserción, n, proceso]`, así los
+    empates en la clave se resuelven por orden de llegada a la cola (igual que
+    el `sort` estable de las listas). `n` es único por entrada, para que el
+    heap nunca compare procesos. `push` y `pop` son O(log n).
+
+    Las claves se calculan al insertar. Si cambia el valor del que depende la
+    clave de un proceso que ya está en la cola (ej. `remaining_burst_time` en
+    SRTF), hay que llamar a `update()`, que lo reubica conservando su orden de
+    inserción (decrease-key). Las bajas (`remove`, `update`) marcan la entrada
+    vieja como borrada y el heap se limpia al sacar o cuando hay demasiadas.
+    """
+
+    def __init__(
+        self,
+        key: Optional[Callable[[Process], object]] = None,
+        processes: Iterable[Process] = (),
+    ):
+        """
+        Args:
+            key: Función que devuelve la clave de orden de un proceso (menor
+                 sale primero). Sin clave, la cola es FIFO.
+            processes: Procesos iniciales, en orden de llegada.
+        """
+        self.key = key
+        self._heap = []
+        self._entries = {}  # id(proceso) -> entrada viva en el heap
+        self._counter = itertools.count()
+        for process in processes:
+            self.push(process)
+
+    def _sort_key(self, process):
+        return self.key(process) if self.key is not None else 0
+
+    def push(self, process: Process):
+        """Agrega un proceso a la cola."""
+        if id(process) in self._entries:
+            raise ValueError(f"El proceso {process.pid} ya está en la cola Ready.")
+        order = next(self._counter)
+        entry = [self._sort_key(process), order, order, process]
+        self._entries[id(process)] = entry
+        heapq.heappush(self._heap, entry)
+
+    # Nombre de lista, para que la simulación pueda usar la cola como antes.
+    append = push
+
+    def pop(self) -> Process:
+        """Saca y devuelve el proceso con menor clave."""
+        while self._heap:
+            entry = heapq.heappop(self._heap)
+            if entry[3] is not _REMOVED:
+                del self._entries[id(entry[3])]
+                return entry[3]
+        raise IndexError("pop de una cola Ready vacía")
+
+    def peek(self) -> Optional[Process]:
+        """Devuelve el proceso con menor clave sin sacarlo (o None)."""
+        while self._heap and self._heap[0][3] is _REMOVED:
+            heapq.heappop(self._heap)
+        return self._heap[0][3] if self._heap else None
+
+    def remove(self, process: Process):
+        """Quita un proceso de la cola (O(1), borrado perezoso)."""
+        entry = self._entries.pop(id(process), None)
+        if entry is None:
+            raise ValueError(f"El proceso {process.pid} no está en la cola Ready.")
+        entry[3] = _REMOVED
+        # Si la mitad del heap son entradas borradas, se reconstruye.
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            self._heap = [e for e in self._heap if e[3] is not _REMOVED]
+            heapq.heapify(self._heap)
+
+    def update(self, process: Process):
+        """Recalcula la clave de un proceso de la cola (decrease/increase-key)."""
+        entry = self._entries.get(id(process))
+        if entry is None:
+            raise ValueError(f"El proceso {process.pid} no está en la cola Ready.")
+        new_entry = [self._sort_key(process), entry[1], next(self._counter), process]
+        entry[3] = _REMOVED
+        self._entries[id(process)] = new_entry
+        heapq.heappush(self._heap, new_entry)
+
+    def pop_best(self, score: Callable[[Process], object]) -> Process:
+        """
+        Saca el proceso con menor `score(proceso)`, calculado en el momento.
+
+        Es O(n): sirve para criterios que cambian con el tiempo (ej. HRRN).
+        Los empates se resuelven por orden de inserción.
+        """
+        live = self._entries.values()
+        if not live:
+            raise IndexError("pop de una cola Ready vacía")
+        best = min(live, key=lambda entry: (score(entry[3]), entry[1]))
+        process = best[3]
+        self.remove(process)
+        return process
+
+    def rekey(self, key: Optional[Callable[[Process], object]]):
+        """Cambia la clave de orden y reconstruye el heap (O(n))."""
+        self.key = key
+        self._entries = {
+            pid_key: [self._sort_key(entry[3]), entry[1], entry[2], entry[3]]
+            for pid_key, entry in self._entries.items()
+        }
+        self._heap = list(self._entries.values())
+        heapq.heapify(self._heap)
+
+    def clear(self):
+        self._heap.clear()
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __bool__(self):
+        return bool(self._entries)
+
+    def __contains__(self, process):
+        return id(process) in self._entries
+
+    def __iter__(self):
+        """Itera los procesos de la cola, en orden de inserción."""
+        # El dict conserva el orden de inserción (update reusa la misma clave).
+        return (entry[3] for entry in self._entries.values())
+
+    def __repr__(self):
+        return f"ReadyQueue({list(self)!r})"
+
+
+class MultilevelQueue:
+    """
+    Cola Ready de MLFQ: una `deque` FIFO por nivel (0 es el más prioritario)
+    y un bitmap, un entero con un bit encendido por cada nivel no vacío.
+
+    El nivel no vacío más prioritario es el bit encendido más bajo,
+    `(bitmap & -bitmap).bit_length() - 1`, así que `push`, `pop` y `peek` son
+    O(1) sin importar cuántos procesos haya en la cola.
+
+    El nivel de cada proceso está en `process.queue_level`. Un proceso que
+    vuelve a la cola después de usar su quantum completo
+    (`ticks_in_current_burst` >= quantum de su nivel) baja un nivel al
+    insertarse. Si lo desalojaron antes, conserva su nivel.
+    """
+
+    def __init__(self, quanta: List[int], processes: Iterable[Process] = ()):
+        """
+        Args:
+            quanta: Quantum de cada nivel; define la cantidad de niveles.
+            processes: Procesos iniciales, en orden de llegada.
+        """
+        self.quanta = quanta
+        self._levels = [deque() for _ in quanta]
+        self._bitmap = 0
+        self._members = set()  # id(proceso) de los procesos en la cola
+        # Instante del próximo boost de esta cola (lo maneja SchedulerMLFQ; con
+        # una cola por CPU, cada una se sube al nivel 0 cuando se despacha de ella).
+        self.next_boost = None
+        for process in processes:
+            self.push(process)
+
+    def push(self, process: Process):
+        """Agrega un proceso al final de su nivel, bajándolo si agotó su quantum."""
+        if id(process) in self._members:
+            raise ValueError(f"El proceso {process.pid} ya está en la cola Ready.")
+        level = min(process.queue_level, len(self._levels) - 1)
+        if (
+            process.ticks_in_current_burst >= self.quanta[level]
+            and level < len(self._levels) - 1
+        ):
+            level += 1
+        process.queue_level = level
+        self._levels[level].append(process)
+        self._bitmap |= 1 << level
+        self._members.add(id(process))
+
+    # Nombre de lista, para que la simulación pueda usar la cola como antes.
+    append = push
+
+    def _top_level(self) -> int:
+        return (self._bitmap & -self._bitmap).bit_length() - 1
+
+    def pop(self) -> Process:
+        """Saca el primer proceso del nivel no vacío más prioritario."""
+        if not self._bitmap:
+            raise IndexError("pop de una cola Ready vacía")
+        level = self._top_level()
+        queue = self._levels[level]
+        process = queue.popleft()
+        if not queue:
+            self._bitmap &= ~(1 << level)
+        self._members.discard(id(process))
+        return process
+
+    def peek(self) -> Optional[Process]:
+        """Devuelve el próximo proceso sin sacarlo (o None)."""
+        if not self._bitmap:
+            return None
+        return self._levels[self._top_level()][0]
+
+    def remove(self, process: Process):
+        """Quita un proceso de la cola (O(n) en su nivel)."""
+        if id(process) not in self._members:
+            raise ValueError(f"El proceso {process.pid} no está en la cola Ready.")
+        level = process.queue_level
+        self._levels[level].remove(process)
+        if not self._levels[level]:
+            self._bitmap &= ~(1 << level)
+        self._members.discard(id(process))
+
+    def boost(self):
+        """Sube todos los procesos al nivel 0, conservando el orden (O(n))."""
+        top = self._levels[0]
+        for queue in self._levels[1:]:
+            top.extend(queue)
+            queue.clear()
+        for process in top:
+            process.queue_level = 0
+        self._bitmap = 1 if top else 0
+
+    def clear(self):
+        for queue in self._levels:
+            queue.clear()
+        self._bitmap = 0
+        self._members.clear()
+
+    def __len__(self):
+        return len(self._members)
+
+    def __bool__(self):
+        return self._bitmap != 0
+
+    def __contains__(self, process):
+        return id(process) in self._members
+
+    def __iter__(self):
+        """Itera los procesos en el orden en que saldrían de la cola."""
+        return itertools.chain.from_iterable(self._levels)
+
+    def __repr__(self):
+        return f"MultilevelQueue({[list(queue) for queue in self._levels]!r})"
+
+
+class ResponseRatioQueue:
+    """
+    Cola Ready de HRRN, agrupada por `burst_time`.
+
+    El Response Ratio de un proceso en el instante t es (t - llegada + ráfaga) /
+    ráfaga: una recta en t con pendiente 1 / ráfaga. Entre procesos con la
+    misma ráfaga el orden no cambia nunca: gana siempre el que llegó primero.
+    Por eso cada grupo es un heap por (llegada, orden de inserción), y para
+    elegir alcanza con comparar la cabeza de cada grupo. `pop_highest_ratio`
+    es O(ráfagas distintas + log n), en lugar de O(n).
+
+    Los ratios se comparan multiplicando en cruz, con enteros, y los empates
+    se resuelven por orden de inserción, igual que `ReadyQueue.pop_best`.
+    """
+
+    def __init__(self, processes: Iterable[Process] = ()):
+        self._groups = {}  # burst_time -> heap de [llegada, orden, proceso]
+        self._entries = {}  # id(proceso) -> entrada viva
+        self._removed = 0  # entradas borradas que siguen en los heaps
+        self._counter = itertools.count()
+        for process in processes:
+            self.push(process)
+
+    def push(self, process: Process):
+        """Agrega un proceso a la cola (O(log n))."""
+        if id(process) in self._entries:
+            raise ValueError(f"El proceso {process.pid} ya está en la cola Ready.")
+        # Con ráfaga 0 el ratio es infinito para todos: decide solo el orden.
+        arrival = process.arrival_time if process.burst_time else 0
+        entry = [arrival, next(self._counter), process]
+        self._entries[id(process)] = entry
+        heapq.heappush(self._groups.setdefault(process.burst_time, []), entry)
+
+    # Nombre de lista, para que la simulación pueda usar la cola como antes.
+    append = push
+
+    def _best_head(self, current_time):
+        """(ráfaga, entrada) del proceso con mayor ratio, o (None, None)."""
+        if self._removed:
+            for burst in list(self._groups):
+                group = self._groups[burst]
+                while group and group[0][2] is _REMOVED:
+                    heapq.heappop(group)
+                    self._removed -= 1
+                if not group:
+                    del self._groups[burst]
+        # Con ráfaga 0 el ratio es infinito: gana el primero de ese grupo.
+        if 0 in self._groups:
+            return 0, self._groups[0][0]
+
+        best_burst = best_entry = None
+        for burst, group in self._groups.items():
+            entry = group[0]
+            if best_entry is not None:
+                # (t - a + b) / b contra (t - a' + b') / b', multiplicando en cruz.
+                left = (current_time - entry[0] + burst) * best_burst
+                right = (current_time - best_entry[0] + best_burst) * burst
+                if left < right or (left == right and entry[1] > best_entry[1]):
+                    continue
+            best_burst, best_entry = burst, entry
+        return best_burst, best_entry
+
+    def best(self, current_time: int) -> Optional[Process]:
+        """El proceso con mayor Response Ratio en `current_time` (o None)."""
+        entry = self._best_head(current_time)[1]
+        return entry[2] if entry is not None else None
+
+    def pop_highest_ratio(self, current_time: int) -> Process:
+        """Saca el proceso con mayor Response Ratio en `current_time`."""
+        burst, entry = self._best_head(current_time)
+        if entry is None:
+            raise IndexError("pop de una cola Ready vacía")
+        group = self._groups[burst]
+        heapq.heappop(group)  # el elegido es siempre la cabeza de su grupo
+        if not group:
+            del self._groups[burst]
+        process = entry[2]
+        del self._entries[id(process)]
+        return process
+
+    def remove(self, process: Process):
+        """Quita un proceso de la cola (O(1), borrado perezoso)."""
+        entry = self._entries.pop(id(process), None)
+        if entry is None:
+            raise ValueError(f"El proceso {process.pid} no está en la cola Ready.")
+        entry[2] = _REMOVED
+        self._removed += 1
+        # Si la mitad de las entradas están borradas, se reconstruyen los grupos.
+        if self._removed > len(self._entries) + 64:
+            for burst, group in list(self._groups.items()):
+                group[:] = [e for e in group if e[2] is not _REMOVED]
+                heapq.heapify(group)
+                if not group:
+                    del self._groups[burst]
+            self._removed = 0
+
+    def clear(self):
+        self._groups.clear()
+        self._entries.clear()
+        self._removed = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __bool__(self):
+        return bool(self._entries)
+
+    def __contains__(self, process):
+        return id(process) in self._entries
+
+    def __iter__(self):
+        """Itera los procesos de la cola, en orden de inserción."""
+        return (entry[2] for entry in self._entries.values())
+
+    def __repr__(self):
+        return f"ResponseRatioQueue({list(self)!r})"
+
+
 class SchedulerBase:
     """Clase base abstracta para los schedulers."""
 
+    # Si es True, un proceso que llega a la cola puede desalojar a uno en
+    # ejecución con peor `sort_key` (lo usa el simulador, ver simulator.py).
+    preemptive = False
+
+    def sort_key(self, process: Process):
+        """
+        Clave de orden de la cola Ready: sale primero el proceso con menor
+        clave y los empates se resuelven por orden de llegada a la cola.
+        """
+        raise NotImplementedError(
+            "El método 'sort_key' debe ser implementado por las subclases."
+        )
+
+    def time_slice(self, process: Process) -> Optional[int]:
+        """
+        Tiempo máximo que `process` corre antes de volver a la cola Ready, o
+        None si corre hasta terminar (o hasta que lo desalojen).
+        """
+        return None
+
+    def create_ready_queue(self, processes: Iterable[Process] = ()) -> ReadyQueue:
+        """Crea una cola Ready (heap) ordenada según este scheduler."""
+        return ReadyQueue(self.sort_key, processes)
+
     def schedule(
         self,
-        ready_queue: List[Process],
+        ready_queue: Union[ReadyQueue, List[Process]],
         current_time: int,
         running_processes: List[Process],
         available_threads: int,
@@ -24,9 +424,9 @@ class SchedulerBase:
         Selecciona el siguiente proceso a ejecutar desde la cola Ready.
 
         Args:
-            ready_queue (List[Process]): La lista de procesos en estado Ready.
-                                         IMPORTANTE: Esta lista será modificada por el método
-                                         (ej. si el scheduler saca el proceso seleccionado).
+            ready_queue (ReadyQueue | List[Process]): Los procesos en estado Ready.
+                                         IMPORTANTE: Esta cola será modificada por el método
+                                         (el scheduler saca el proceso seleccionado).
             current_time (int): El tiempo actual de la simulación.
             running_processes (List[Process]): Lista de procesos actualmente en ejecución.
             available_threads (int): Número de 'CPUs' o 'threads' simulados que están libres.
@@ -37,9 +437,17 @@ class SchedulerBase:
                                Nota: Devuelve solo UN proceso. El bucle principal llamará
                                de nuevo si hay más threads libres.
         """
-        raise NotImplementedError(
-            "El método 'schedule' debe ser implementado por las subclases."
-        )
+        if not ready_queue:
+            return None
+
+        if isinstance(ready_queue, ReadyQueue):
+            # Una cola creada para otro scheduler se reordena con esta clave.
+            if ready_queue.key != self.sort_key:
+                ready_queue.rekey(self.sort_key)
+            return ready_queue.pop()
+
+        ready_queue.sort(key=self.sort_key)
+        return ready_queue.pop(0)
 
     def __str__(self):
         return self.__class__.__name__
@@ -51,24 +459,12 @@ class SchedulerBase:
 class SchedulerFCFS(SchedulerBase):
     """Algoritmo de Scheduling First-Come, First-Served (FCFS)."""
 
-    def schedule(
-        self,
-        ready_queue: List[Process],
-        current_time: int,
-        running_processes: List[Process],
-        available_threads: int,
-    ) -> Optional[Process]:
+    def sort_key(self, process: Process):
         """
         Selecciona el proceso que llegó primero a la cola Ready.
         En caso de empate en arrival_time, el orden de llegada a la cola decide.
         """
-        if not ready_queue:
-            return None
-
-        ready_queue.sort(key=lambda p: p.arrival_time)
-
-        process_to_run = ready_queue.pop(0)
-        return process_to_run
+        return process.arrival_time
 
 
 class SchedulerSJF(SchedulerBase):
@@ -78,21 +474,11 @@ class SchedulerSJF(SchedulerBase):
     En caso de empate, desempata por arrival_time.
     """
 
-    def schedule(
-        self,
-        ready_queue: List[Process],
-        current_time: int,
-        running_processes: List[Process],
-        available_threads: int,
-    ) -> Optional[Process]:
+    def sort_key(self, process: Process):
         """
         Selecciona el proceso en la cola Ready con el menor `burst_time` total.
         """
-        if not ready_queue:
-            return None
-
-        ready_queue.sort(key=lambda p: (p.burst_time, p.arrival_time))
-        return ready_queue.pop(0)
+        return (process.burst_time, process.arrival_time)
 
 
 class SchedulerSRTF(SchedulerBase):
@@ -102,21 +488,15 @@ class SchedulerSRTF(SchedulerBase):
     En caso de empate, desempata por arrival_time.
     """
 
-    def schedule(
-        self,
-        ready_queue: List[Process],
-        current_time: int,
-        running_processes: List[Process],
-        available_threads: int,
-    ) -> Optional[Process]:
+    preemptive = True
+
+    def sort_key(self, process: Process):
         """
         Selecciona el proceso en la cola Ready con el menor `remaining_burst_time`.
+        Si cambia el restante de un proceso que está en una `ReadyQueue`, hay
+        que avisarle con `ready_queue.update(proceso)`.
         """
-        if not ready_queue:
-            return None
-
-        ready_queue.sort(key=lambda p: (p.remaining_burst_time, p.arrival_time))
-        return ready_queue.pop(0)
+        return (process.remaining_burst_time, process.arrival_time)
 
 
 class SchedulerRR(SchedulerBase):
@@ -136,20 +516,30 @@ class SchedulerRR(SchedulerBase):
             raise ValueError("Quantum debe ser un entero positivo.")
         self.quantum = quantum
 
+    def sort_key(self, process: Process):
+        """
+        Selecciona el siguiente proceso de la cola Ready (tratada como FIFO):
+        todas las claves son iguales y decide el orden de llegada a la cola.
+        """
+        return 0
+
+    def time_slice(self, process: Process) -> Optional[int]:
+        """Cada proceso corre como máximo un quantum por turno."""
+        return self.quantum
+
     def schedule(
         self,
-        ready_queue: List[Process],
+        ready_queue: Union[ReadyQueue, List[Process]],
         current_time: int,
         running_processes: List[Process],
         available_threads: int,
     ) -> Optional[Process]:
-        """
-        Selecciona el siguiente proceso de la cola Ready (tratada como FIFO).
-        """
-        if not ready_queue:
-            return None
-
-        return ready_queue.pop(0)
+        """FIFO: en una lista basta con sacar el primero."""
+        if isinstance(ready_queue, list):
+            return ready_queue.pop(0) if ready_queue else None
+        return super().schedule(
+            ready_queue, current_time, running_processes, available_threads
+        )
 
     def __str__(self):
         return f"{self.__class__.__name__}(Quantum={self.quantum})"
@@ -162,32 +552,60 @@ class SchedulerHRRN(SchedulerBase):
     Response Ratio = (Tiempo de Espera + Burst Time) / Burst Time.
     """
 
+    def sort_key(self, process: Process):
+        """
+        El Response Ratio depende del tiempo actual, así que no sirve como
+        clave fija del heap: en una `ReadyQueue` o una lista, la cola queda en
+        orden de llegada y `schedule` recorre todos los procesos.
+        """
+        return 0
+
+    def create_ready_queue(
+        self, processes: Iterable[Process] = ()
+    ) -> ResponseRatioQueue:
+        """Crea la cola agrupada por ráfaga, que elige sin recorrer todo."""
+        return ResponseRatioQueue(processes)
+
     def schedule(
         self,
-        ready_queue: List[Process],
+        ready_queue: Union[ResponseRatioQueue, ReadyQueue, List[Process]],
         current_time: int,
         running_processes: List[Process],
         available_threads: int,
     ) -> Optional[Process]:
         """
-        Calcula el Response Ratio para cada proceso en la cola Ready
-        y selecciona el proceso con el mayor ratio.
+        Selecciona el proceso con el mayor Response Ratio.
+
+        Con una `ResponseRatioQueue` solo se compara la cabeza de cada grupo
+        de ráfaga y solo se actualiza el `response_ratio` del elegido. Con una
+        `ReadyQueue` o una lista, se calcula el ratio de cada proceso de la
+        cola y se elige el mayor.
         """
         if not ready_queue:
             return None
 
+        if isinstance(ready_queue, ResponseRatioQueue):
+            process = ready_queue.pop_highest_ratio(current_time)
+            self._update_ratio(process, current_time)
+            return process
+
         for process in ready_queue:
-            wait_time = current_time - process.arrival_time
-            # Evitar división por cero si burst_time es 0 (aunque debería ser >0)
-            if process.burst_time == 0:
-                process.response_ratio = float('inf')
-            else:
-                process.response_ratio = (wait_time + process.burst_time) / process.burst_time
+            self._update_ratio(process, current_time)
+
+        if isinstance(ready_queue, ReadyQueue):
+            return ready_queue.pop_best(lambda p: -p.response_ratio)
 
         ready_queue.sort(key=lambda p: p.response_ratio, reverse=True)
+        return ready_queue.pop(0)
 
-        selected_process = ready_queue.pop(0)
-        return selected_process
+    @staticmethod
+    def _update_ratio(process: Process, current_time: int):
+        wait_time = current_time - process.arrival_time
+        # Evitar división por cero si burst_time es 0 (aunque debería ser >0)
+        if process.burst_time == 0:
+            process.response_ratio = float('inf')
+        else:
+            process.response_ratio = (wait_time + process.burst_time) / process.burst_time
 
     def __str__(self):
         return "SchedulerHRRN"
@@ -200,21 +618,115 @@ class SchedulerPriorityNP(SchedulerBase):
     En caso de empate en prioridad, desempata por arrival_time.
     """
 
+    def sort_key(self, process: Process):
+        """
+        Selecciona el proceso de mayor prioridad de la cola Ready.
+        """
+        return (process.priority, process.arrival_time)
+
+
+class SchedulerMLFQ(SchedulerBase):
+    """
+    Multilevel Feedback Queue (MLFQ) - Preemptivo.
+
+    Los procesos entran al nivel 0. Cada nivel es Round Robin con su propio
+    quantum; un proceso que agota el quantum de su nivel baja al siguiente, y
+    uno de un nivel más prioritario que llega a la cola desaloja al que corre
+    en un nivel inferior. Cada `boost_interval` unidades de tiempo todos los
+    procesos (en la cola y en ejecución) vuelven al nivel 0, para que los
+    procesos largos no esperen indefinidamente.
+    """
+
+    preemptive = True
+
+    def __init__(
+        self,
+        levels: int = 3,
+        quantum: int = 2,
+        quanta: Optional[List[int]] = None,
+        boost_interval: Optional[int] = 50,
+    ):
+        """
+        Inicializa el scheduler MLFQ.
+
+        Args:
+            levels (int): Cantidad de niveles (se ignora si se pasa `quanta`).
+            quantum (int): Quantum del nivel 0; cada nivel duplica el anterior.
+            quanta (List[int]): Quantum de cada nivel, en lugar de `levels` y
+                                `quantum` (ej. [2, 4, 8]).
+            boost_interval (int): Cada cuánto tiempo se suben todos los procesos
+                                  al nivel 0. None desactiva el boost.
+        """
+        if quanta is None:
+            if levels <= 0:
+                raise ValueError("MLFQ necesita al menos un nivel.")
+            quanta = [quantum * 2**level for level in range(levels)]
+        if not quanta or any(q <= 0 for q in quanta):
+            raise ValueError("Cada quantum debe ser un entero positivo.")
+        if boost_interval is not None and boost_interval <= 0:
+            raise ValueError("boost_interval debe ser un entero positivo o None.")
+        self.quanta = list(quanta)
+        self.boost_interval = boost_interval
+        self._next_boost = boost_interval
+
+    def sort_key(self, process: Process):
+        """El nivel del proceso: el nivel 0 es el más prioritario."""
+        return process.queue_level
+
+    def time_slice(self, process: Process) -> Optional[int]:
+        """El quantum del nivel en que está el proceso."""
+        return self.quanta[min(process.queue_level, len(self.quanta) - 1)]
+
+    def create_ready_queue(self, processes: Iterable[Process] = ()) -> MultilevelQueue:
+        """Crea la cola por niveles; una cola nueva reinicia el reloj del boost."""
+        self._next_boost = self.boost_interval
+        queue = MultilevelQueue(self.quanta, processes)
+        queue.next_boost = self.boost_interval
+        return queue
+
     def schedule(
         self,
-        ready_queue: List[Process],
+        ready_queue: Union[MultilevelQueue, ReadyQueue, List[Process]],
         current_time: int,
         running_processes: List[Process],
         available_threads: int,
     ) -> Optional[Process]:
         """
-        Selecciona el proceso de mayor prioridad de la cola Ready.
+        Hace el boost si ya toca y saca el primer proceso del nivel más
+        prioritario. Con una lista o una `ReadyQueue` se elige por nivel, pero
+        los procesos no bajan de nivel (eso lo hace `MultilevelQueue`).
         """
         if not ready_queue:
             return None
 
-        ready_queue.sort(key=lambda p: (p.priority, p.arrival_time))
-        return ready_queue.pop(0)
+        if self.boost_interval is not None and current_time >= self._next_boost:
+            self._next_boost = (
+                current_time // self.boost_interval + 1
+            ) * self.boost_interval
+            for process in running_processes:
+                process.queue_level = 0
+            if not isinstance(ready_queue, MultilevelQueue):
+                for process in ready_queue:
+                    process.queue_level = 0
+                if isinstance(ready_queue, ReadyQueue):
+                    ready_queue.rekey(self.sort_key)
+        if (
+            isinstance(ready_queue, MultilevelQueue)
+            and ready_queue.next_boost is not None
+            and current_time >= ready_queue.next_boost
+        ):
+            ready_queue.next_boost = self._next_boost
+            ready_queue.boost()
+
+        if isinstance(ready_queue, MultilevelQueue):
+            return ready_queue.pop()
+        return super().schedule(
+            ready_queue, current_time, running_processes, available_threads
+        )
+
+    def __str__(self):
+        quanta = "/".join(str(q) for q in self.quanta)
+        return f"SchedulerMLFQ(Quanta={quanta}, Boost={self.boost_interval})"
 
 
 # --- Diccionario para acceder fácilmente a los schedulers por nombre ---
@@ -225,6 +737,7 @@ AVAILABLE_SCHEDULERS = {
     "RR": SchedulerRR,
     "HRRN": SchedulerHRRN,
     "Priority_NP": SchedulerPriorityNP,
+    "MLFQ": SchedulerMLFQ,
 }
 
 
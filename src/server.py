@@ -1,28 +1,82 @@
+import argparse
+import asyncio
 import socket
 import threading
 import json
 import os
 import collections
 import concurrent.futures
+import contextlib
+import math
 import time
 import sys
 import logging
-from .extractor_regex import parse_file_regex as parse_file
+from .extractor_regex import merge_results, split_file_ranges
+from .extractor_regex import EXTRACTOR_VERSION
+from .result_cache import ResultCache, hash_file
+from .shared_results import ResultArena, resolve_result
+from .log_pipeline import LogPipeline
+from .worker import (
+    STREAMING_THRESHOLD_BYTES,
+    client_result,
+    gil_enabled,
+    init_interpreter_worker,
+    init_process_worker,
+    process_file_task,
+    process_single_file_wrapper,
+)
+from .metrics import Metrics, format_metrics
+from .file_index import FileIndex
+from .partitioner import (
+    ThroughputModel,
+    WorkStealingQueues,
+    batch_units,
+    file_weight,
+    partition_files,
+)
+from .protocol import (
+    COMPRESSION_ZLIB,
+    PROTOCOL_V1,
+    SUPPORTED_PROTOCOLS,
+    MessageReader,
+    ProtocolError,
+    encode_message,
+)
 
 
 # --- Configuración del Logger ---
+# Un hilo escritor saca los registros de una cola y los escribe de a lotes
+# (ver src/log_pipeline.py); los workers de los pools de procesos le mandan los
+# suyos por una cola entre procesos.
 LOG_FILENAME = "server_processing.log"
-logging.basicConfig(
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+# Registros que se juntan antes de escribir, y cada cuánto se escribe lo
+# pendiente aunque no se llegue a esa cantidad.
+LOG_BATCH_RECORDS = 256
+LOG_FLUSH_INTERVAL_SECONDS = 0.5
+log_pipeline = LogPipeline(
+    LOG_FILENAME,
+    LOG_FORMAT,
     level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    filename=LOG_FILENAME,
-    filemode="a",
+    batch_records=LOG_BATCH_RECORDS,
+    flush_interval=LOG_FLUSH_INTERVAL_SECONDS,
 )
+# Se inicia al arrancar el servidor (en `__main__`), no al importar el módulo:
+# importarlo no abre el archivo ni lanza el hilo escritor.
+
+# --- Métricas por etapa (ver src/metrics.py) ---
+# Se consultan con el comando `metrics` o el mensaje GET_METRICS, y se guardan
+# en este archivo al cerrar el servidor.
+METRICS_FILENAME = "server_metrics.json"
+server_metrics = Metrics()
 
 
 # --- Configuración General del Servidor ---
 HOST = "127.0.0.1"
 PORT = 65432
+# Conexiones pendientes de aceptar que el sistema mantiene en cola; con el valor
+# por defecto (128) las ráfagas de cientos de clientes esperan reintentos SYN.
+LISTEN_BACKLOG = 1024
 
 TEXT_FILES_DIR = os.path.abspath(
     os.path.join(os.path.dirname(__file__), "..", "text_files")
@@ -39,11 +93,62 @@ if not os.path.isdir(TEXT_FILES_DIR):
 else:
     print(f"[DEBUG] Carpeta ya existe.")
 
-text_files = [f for f in os.listdir(TEXT_FILES_DIR) if f.endswith(".txt")]
-print(f"[DEBUG] Archivos encontrados: {text_files}")
+# Índice en memoria de los .txt de TEXT_FILES_DIR (nombre, tamaño, mtime): los
+# triggers lo leen en lugar de recorrer el directorio. Se carga y empieza a
+# vigilar el directorio al arrancar el servidor (con inotify si está
+# disponible; si no, recorriéndolo cada FILE_INDEX_POLL_SECONDS).
+FILE_INDEX_POLL_SECONDS = 2.0
+file_index = FileIndex(TEXT_FILES_DIR, ".txt", poll_interval=FILE_INDEX_POLL_SECONDS)
 
 DEFAULT_CLIENT_CONFIG = {"mode": "threads", "count": 1}
 
+# Archivos más grandes que este umbral se reparten en rangos de bytes entre los
+# workers del lote, en vez de ocupar a uno solo. Coincide con el umbral de
+# streaming (ver `worker`). Ningún rango tiene menos de PARALLEL_RANGE_MIN_BYTES.
+PARALLEL_RANGE_THRESHOLD_BYTES = STREAMING_THRESHOLD_BYTES
+PARALLEL_RANGE_MIN_BYTES = 16 * 1024 * 1024
+
+# Caché de resultados: archivos sin cambios (mismo contenido y misma versión
+# del extractor) no se vuelven a procesar entre triggers ni entre reinicios.
+RESULT_CACHE_ENABLED = True
+RESULT_CACHE_FILENAME = "server_result_cache.sqlite3"
+RESULT_CACHE_MEMORY_ENTRIES = 1024
+RESULT_CACHE_MAX_ENTRIES = 100_000
+
+# Se abre al iniciar el servidor (ver `open_result_cache`), no al importar el
+# módulo: los workers y los benchmarks que lo importan no tocan la base.
+result_cache = None
+
+# Pools de workers persistentes: un pool sin uso durante este tiempo se cierra,
+# y un pool de procesos se reemplaza tras ejecutar esta cantidad de tareas por
+# worker (limita fugas de memoria en procesos de larga vida).
+POOL_IDLE_TIMEOUT_SECONDS = 300
+POOL_MAX_TASKS_PER_PROCESS = 200
+# Cada pool de procesos tiene una arena de memoria compartida de este tamaño
+# por la que los workers devuelven sus resultados sin pasarlos por pickle (ver
+# src/shared_results.py). Con 0, los resultados viajan por el pipe del pool.
+RESULT_ARENA_BYTES = 16 * 1024 * 1024
+
+# Cómo se ejecuta el modo "threads". El extractor es Python puro, así que con
+# el GIL los hilos no procesan en paralelo. "auto" usa hilos si el intérprete
+# no tiene GIL (CPython free-threaded) o si hay una sola CPU. Si no, usa un
+# subintérprete por worker, cada uno con su propio GIL (Python 3.14+), o un
+# pool de procesos. El cliente sigue viendo el modo "threads".
+THREADS_BACKENDS = ("auto", "threads", "interpreters", "processes")
+THREADS_BACKEND = "auto"
+# Ejecución de cada modo que no hace falta aclarar en `status`.
+POOL_DEFAULT_BACKENDS = {("threads", "threads"), ("forks", "processes")}
+
+# Presupuesto global de workers (hilos + procesos) repartido entre todos los
+# lotes que se ejecutan a la vez.
+MAX_TOTAL_WORKERS = max(4, (os.cpu_count() or 1) * 2)
+
+# Reparto de archivos de `trigger`: "static" fija los archivos de cada cliente
+# al disparar; "dynamic" los reparte a medida que se liberan los workers, con
+# robo de trabajo entre lotes. Se puede elegir por trigger o con --distribution.
+TRIGGER_DISTRIBUTIONS = ("static", "dynamic")
+TRIGGER_DISTRIBUTION = "static"
+
 
 # --- Estado del Servidor (Protegido por Locks) ---
 state_lock = threading.Lock()
@@ -52,19 +157,30 @@ client_configs: dict = {}
 client_queues: dict[str, collections.deque] = {}
 clients: dict = {}
 client_ids: dict = {}
+client_send_locks: dict = {}  # socket -> Lock (evita mezclar mensajes al enviar)
+client_protocols: dict = {}  # socket -> (versión, compresión) negociados para enviar
 next_client_id = 1
 
-processing_lock = threading.Lock()
 client_batch_processing_queue = collections.deque()
 new_batch_event = threading.Event()
 
 
 # --- Configuración del Socket del Servidor ---
-server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-server_socket.bind((HOST, PORT))
-server_socket.listen()
-print(f"Servidor escuchando en {HOST}:{PORT}")
+# El socket se crea al arrancar (no al importar el módulo), para que los
+# benchmarks y los workers puedan importar este módulo sin ocupar el puerto.
+server_socket = None
+# En modo asyncio (`--async`), el event loop que atiende las conexiones.
+async_loop = None
+
+
+def create_server_socket():
+    """Crea el socket del servidor y lo deja escuchando en HOST:PORT."""
+    global server_socket
+    server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    server_socket.bind((HOST, PORT))
+    server_socket.listen(LISTEN_BACKLOG)
+    print(f"Servidor escuchando en {HOST}:{PORT}")
 
 
 # --- Funciones auxiliares para manejo de clientes ---
@@ -123,17 +239,32 @@ def server_log(message):
     print(f"\n{message}")
 
 
-def send_to_client(client_socket, message):
-    """Envía un mensaje codificado en JSON a un cliente específico."""
+def send_to_client(client_socket, message, processing_mode=None):
+    """
+    Envía un mensaje codificado en JSON a un cliente específico. Con
+    `processing_mode`, registra lo que tardan la codificación y el envío en
+    `server_metrics` (etapas "encode" y "send").
+    """
     if client_socket.fileno() == -1:
         threading.Thread(
             target=handle_disconnect, args=(client_socket,), daemon=True
         ).start()
         return
 
+    with state_lock:
+        send_lock = client_send_locks.setdefault(client_socket, threading.Lock())
+
     try:
-        payload = json.dumps(message) + "\n"
-        client_socket.sendall(payload.encode("utf-8"))
+        with send_lock:
+            version, compress = client_protocols.get(client_socket, (PROTOCOL_V1, False))
+            started = time.monotonic()
+            data = encode_message(message, version, compress)
+            encoded = time.monotonic()
+            client_socket.sendall(data)
+            sent = time.monotonic()
+        if processing_mode is not None:
+            server_metrics.record("encode", processing_mode, encoded - started)
+            server_metrics.record("send", processing_mode, sent - encoded)
 
     except (BrokenPipeError, ConnectionResetError):
         threading.Thread(
@@ -147,6 +278,42 @@ def send_to_client(client_socket, message):
         ).start()
 
 
+def negotiate_protocol(client_socket, payload):
+    """
+    Atiende un HELLO: responde ACK_HELLO (última línea v1) y cambia el framing
+    de salida hacia ese cliente a la versión acordada.
+
+    Returns:
+        int: Versión con la que el servidor leerá los siguientes mensajes.
+    """
+    payload = payload if isinstance(payload, dict) else {}
+    version = payload.get("version", PROTOCOL_V1)
+    if version not in SUPPORTED_PROTOCOLS:
+        version = PROTOCOL_V1
+    compress = version > PROTOCOL_V1 and payload.get("compression") == COMPRESSION_ZLIB
+
+    with state_lock:
+        send_lock = client_send_locks.setdefault(client_socket, threading.Lock())
+
+    ack = {
+        "type": "ACK_HELLO",
+        "payload": {
+            "version": version,
+            "compression": COMPRESSION_ZLIB if compress else None,
+        },
+    }
+    try:
+        with send_lock:
+            client_socket.sendall(encode_message(ack))
+            client_protocols[client_socket] = (version, compress)
+    except Exception as e:
+        server_log(f"Error negociando protocolo: {e}")
+        threading.Thread(
+            target=handle_disconnect, args=(client_socket,), daemon=True
+        ).start()
+    return version
+
+
 def handle_disconnect(client_socket):
     """Limpia el estado del servidor cuando un cliente se desconecta."""
     addr_disconnected = None
@@ -158,6 +325,8 @@ def handle_disconnect(client_socket):
             addr_disconnected = clients.pop(client_socket, None)
             client_id_disconnected = client_ids.pop(client_socket, None)
             client_configs.pop(client_socket, None)
+            client_send_locks.pop(client_socket, None)
+            client_protocols.pop(client_socket, None)
             processed_disconnect = True
 
             for event_name in list(events.keys()):
@@ -190,263 +359,925 @@ def handle_disconnect(client_socket):
 
 # --- Funciones de Procesamiento de Archivos ---
 
-def process_single_file_wrapper(arg_tuple):
+def finish_task(outcome, processing_mode, submitted):
     """
-    Wrapper para procesar un solo archivo, adaptado para ThreadPool y ProcessPool.
-    Muestra el PID del worker (hilo o proceso) al inicio y al final.
+    (resultado completo, hash del contenido) de una tarea de
+    `process_file_task` (el resultado se lee de la arena si hace falta).
+    Registra sus etapas en `server_metrics`; `submitted` es cuándo se envió
+    la tarea al pool (`time.monotonic()`).
     """
-    filepath, processing_mode = arg_tuple
-    filename_base = os.path.basename(filepath)
+    shared, timings, content_hash = outcome
+    result = resolve_result(shared)
+    server_metrics.record_task(processing_mode, submitted, timings, time.monotonic())
+    return result, content_hash
 
-    pid_label = ""
-    worker_id_str = ""
 
-    if processing_mode == "threads":
-        pid_label = "THREAD ID"
-        worker_id_str = str(threading.get_ident())
-    elif processing_mode == "forks":
-        pid_label = "FORK PID"
-        worker_id_str = str(os.getpid())
-    else:
-        pid_label = "UNKNOWN WORKER ID"
-        worker_id_str = "N/A"
+# --- Archivos Grandes por Rangos ---
 
-    descriptive_worker_id = f"{pid_label}_{worker_id_str}"
+def plan_file_ranges(fp, size, num_workers, batch_bytes=None):
+    """
+    Rangos de bytes en que conviene repartir `fp` (de `size` bytes) entre los
+    `num_workers` workers de un lote con `batch_bytes` bytes pendientes, o
+    None para procesarlo completo en un solo worker.
+
+    Cada rango apunta a `batch_bytes / num_workers` (la parte de un worker):
+    solo se reparte un archivo que por sí solo dejaría a los demás workers
+    sin trabajo. Sin `batch_bytes`, el archivo se reparte entre todos.
+    """
+    if num_workers < 2 or size <= PARALLEL_RANGE_THRESHOLD_BYTES:
+        return None
+    target = max(PARALLEL_RANGE_MIN_BYTES, (batch_bytes or size) / num_workers)
+    parts = min(num_workers, math.ceil(size / target))
+    if parts < 2:
+        return None
+    try:
+        ranges = split_file_ranges(fp, parts)
+    except OSError:
+        return None  # el worker reporta el error al abrirlo
+    return ranges if len(ranges) > 1 else None
 
-    print(f"\n[{pid_label}: {worker_id_str}] Iniciando procesamiento de: {filename_base}")
-    sys.stdout.flush()
 
-    logging.info(
-        f"[{descriptive_worker_id}] Iniciando procesamiento de archivo: {filepath}"
+def merge_range_results(filepath, results):
+    """
+    Resultado de un archivo a partir de los resultados crudos de sus rangos:
+    se unen con `merge_results` (igual que procesarlo completo) y se
+    convierten una sola vez con `client_result`. `pid_server` lista los
+    workers que participaron; si algún rango falló, el archivo queda con ese
+    error y el worker de ese rango.
+    """
+    merged = merge_results(filepath, results)
+    workers = ", ".join(dict.fromkeys(r["pid_server"] for r in results))
+    return client_result(
+        merged, merged.get("pid_server", workers), os.path.basename(filepath)
     )
 
-    try:
-        raw_result_from_extractor = parse_file(filepath, pid=descriptive_worker_id)
 
+class RangeResults:
+    """Junta los resultados de los rangos de un archivo a medida que terminan."""
+
+    def __init__(self, filepath, parts):
+        self.filepath = filepath
+        self.results = [None] * parts
+        self.remaining = parts
+
+    def add(self, part, result):
+        """
+        Guarda el resultado del rango `part`. Devuelve el resultado unido del
+        archivo cuando terminó su último rango, y None mientras falten.
+        """
+        self.results[part] = result
+        self.remaining -= 1
+        if self.remaining:
+            return None
+        return merge_range_results(self.filepath, self.results)
+
+
+def file_tasks(pending, processing_mode, num_workers):
+    """
+    Tareas del pool para los archivos `pending`, tuplas (clave, ruta, clave de
+    caché): una por archivo, o una por rango para los archivos grandes (ver
+    `plan_file_ranges`). Los rangos van primero, para que el trabajo largo
+    no quede para el final del lote. Como ningún worker lee completo un
+    archivo repartido en rangos, el hash de su clave de caché se calcula aquí.
+
+    Returns:
+        Lista de (argumentos del wrapper, (clave, clave de caché, RangeResults
+        o None, número de rango)).
+    """
+    sizes = [0] * len(pending)
+    if num_workers > 1:
+        for n, (_, fp, _) in enumerate(pending):
+            try:
+                sizes[n] = os.path.getsize(fp)
+            except OSError:
+                pass
+    batch_bytes = sum(sizes)
+
+    split, whole = [], []
+    for (key, fp, cache_key), size in zip(pending, sizes):
+        ranges = plan_file_ranges(fp, size, num_workers, batch_bytes)
+        if ranges is None:
+            whole.append(((fp, processing_mode), (key, cache_key, None, 0)))
+            continue
         logging.info(
-            f"[{descriptive_worker_id}] Datos extraídos de {filename_base}: "
-            f"Nombres: {len(raw_result_from_extractor.get('Nombres', []))}, "
-            f"Fechas: {len(raw_result_from_extractor.get('Fechas', []))}, "
-            f"Lugares: {len(raw_result_from_extractor.get('Lugares', []))}, "
-            f"Palabras: {raw_result_from_extractor.get('ConteoPalabras', 0)}"
+            f"{os.path.basename(fp)} ({size} bytes) se reparte en "
+            f"{len(ranges)} rangos entre los workers."
         )
+        if cache_key is not None and cache_key.content_hash is None:
+            try:
+                cache_key = cache_key._replace(content_hash=hash_file(fp))
+            except OSError:
+                cache_key = None
+        collector = RangeResults(fp, len(ranges))
+        for part, byte_range in enumerate(ranges):
+            split.append(
+                ((fp, processing_mode, byte_range), (key, cache_key, collector, part))
+            )
+    return split + whole
 
-        status_from_extractor = raw_result_from_extractor.get(
-            "status", raw_result_from_extractor.get("estado", "error")
-        )
-        error_from_extractor = raw_result_from_extractor.get("error", "")
 
-        final_filename = raw_result_from_extractor.get(
-            "filename", raw_result_from_extractor.get("archivo", filename_base)
-        )
+# --- Pools de Workers Persistentes ---
+
+def resolve_threads_backend(requested):
+    """
+    Cómo ejecutar el modo "threads" ("threads", "interpreters" o "processes")
+    según `requested` (uno de THREADS_BACKENDS) y lo que ofrece el intérprete.
+    """
+    has_interpreters = hasattr(concurrent.futures, "InterpreterPoolExecutor")
+    if requested == "interpreters" and not has_interpreters:
+        logging.warning("Sin subintérpretes en este Python: se usan procesos.")
+        return "processes"
+    if requested != "auto":
+        return requested
+    if not gil_enabled() or (os.cpu_count() or 1) < 2:
+        return "threads"
+    return "interpreters" if has_interpreters else "processes"
+
+
+class _PoolEntry:
+    """Un executor vivo (y su arena de resultados) junto con sus contadores de uso."""
+
+    def __init__(self, mode, workers, executor, backend, arena=None):
+        self.mode = mode
+        self.workers = workers
+        self.executor = executor
+        self.backend = backend  # "threads", "interpreters" o "processes"
+        self.arena = arena
+        self.tasks = 0
+        self.in_use = False
+        self.last_used = time.monotonic()
+        self.retired = False
+
+    def close(self, wait=False, cancel_futures=False):
+        """Cierra el executor y borra su arena."""
+        self.executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+        if self.arena is not None:
+            self.arena.close()
+
+
+class WorkerPoolManager:
+    """
+    Mantiene pools de hilos y procesos "calientes" entre lotes.
+
+    Cada lote recibe un pool de su (modo, cantidad de workers) para él solo,
+    así usa exactamente los workers que se le asignaron aunque otros lotes con
+    la misma configuración corran a la vez: se reutiliza uno libre o se crea
+    otro. Los pools se crean al pedirlos (crecen), se cierran tras
+    `idle_timeout` segundos sin uso (se achican) y, en modo "forks", se
+    reemplazan por uno nuevo al superar `max_tasks_per_process` tareas por
+    worker. Con `result_arena_bytes`, cada pool de procesos devuelve sus
+    resultados por una `ResultArena` de ese tamaño. `threads_backend` (ver
+    `resolve_threads_backend`) dice cómo se ejecutan los pools "threads". Con
+    `log_pipeline`, los workers de los pools de procesos y de subintérpretes
+    le mandan sus registros.
+    """
 
-        if status_from_extractor == "success":
-            print(
-                f"\n[{pid_label}: {worker_id_str}] Finalizado procesamiento de: "
-                f"{final_filename} (Éxito)"
+    def __init__(
+        self,
+        idle_timeout,
+        max_tasks_per_process,
+        result_arena_bytes=0,
+        threads_backend="threads",
+        log_pipeline=None,
+    ):
+        self.idle_timeout = idle_timeout
+        self.max_tasks_per_process = max_tasks_per_process
+        self.result_arena_bytes = result_arena_bytes
+        self.threads_backend = threads_backend
+        self.log_pipeline = log_pipeline
+        self._lock = threading.Lock()
+        self._pools = []  # _PoolEntry vivos, prestados o libres
+        self._reaper_thread = None
+        self._closed = False
+
+    def _create_process_entry(self, processing_mode, num_workers):
+        log_queue = self.log_pipeline.worker_queue() if self.log_pipeline else None
+        arena = None
+        if self.result_arena_bytes:
+            arena = ResultArena.create(self.result_arena_bytes)
+        executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=num_workers,
+            initializer=init_process_worker,
+            initargs=(
+                log_queue,
+                (arena.name, arena.lock) if arena else None,
+                LOG_BATCH_RECORDS,
+                LOG_FLUSH_INTERVAL_SECONDS,
+            ),
+        )
+        return _PoolEntry(processing_mode, num_workers, executor, "processes", arena)
+
+    def _create_interpreter_entry(self, num_workers):
+        """
+        Pool de subintérpretes, o None si no pueden ejecutar las tareas (ej.
+        un módulo de extensión sin soporte). Las tareas están en `worker`, que
+        cada subintérprete importa sin arrancar nada del servidor.
+        """
+        log_queue = self.log_pipeline.interpreter_queue() if self.log_pipeline else None
+        executor = concurrent.futures.InterpreterPoolExecutor(
+            max_workers=num_workers,
+            initializer=init_interpreter_worker,
+            initargs=(log_queue,),
+        )
+        try:
+            executor.submit(gil_enabled).result(timeout=60)
+        except Exception as e:
+            executor.shutdown(wait=False, cancel_futures=True)
+            logging.warning(
+                f"Los subintérpretes no pueden ejecutar tareas "
+                f"({type(e).__name__}: {e}); el modo threads usará procesos."
             )
-            sys.stdout.flush()
+            return None
+        return _PoolEntry("threads", num_workers, executor, "interpreters")
+
+    def _create_entry(self, processing_mode, num_workers):
+        if processing_mode == "threads":
+            if self.threads_backend == "interpreters":
+                entry = self._create_interpreter_entry(num_workers)
+                if entry is not None:
+                    return entry
+                self.threads_backend = "processes"
+            if self.threads_backend == "processes":
+                return self._create_process_entry(processing_mode, num_workers)
+            return _PoolEntry(
+                "threads",
+                num_workers,
+                concurrent.futures.ThreadPoolExecutor(max_workers=num_workers),
+                "threads",
+            )
+        if processing_mode == "forks":
+            return self._create_process_entry(processing_mode, num_workers)
+        raise ValueError(f"Modo de proc. inválido: {processing_mode}")
+
+    def _retire(self, entry):
+        """Saca un pool del registro; se cierra cuando su lote lo devuelve."""
+        if entry in self._pools:
+            self._pools.remove(entry)
+        entry.retired = True
+        if not entry.in_use:
+            entry.close()
+
+    def _start_reaper(self):
+        if self._reaper_thread is None:
+            self._reaper_thread = threading.Thread(target=self._reap_idle, daemon=True)
+            self._reaper_thread.start()
+
+    def _reap_idle(self):
+        """Hilo de fondo que cierra los pools sin uso reciente."""
+        while not self._closed:
+            time.sleep(max(self.idle_timeout / 2, 1))
+            now = time.monotonic()
+            with self._lock:
+                for entry in list(self._pools):
+                    if not entry.in_use and now - entry.last_used > self.idle_timeout:
+                        self._retire(entry)
+                        logging.info(
+                            f"Pool {entry.mode} x{entry.workers} cerrado por inactividad."
+                        )
 
-            logging.info(
-                f"[{descriptive_worker_id}] Finalizado procesamiento de "
-                f"{final_filename} con ÉXITO."
+    @contextlib.contextmanager
+    def lease(self, processing_mode, num_workers, num_tasks):
+        """
+        Presta un executor de (modo, workers) para él solo durante un lote de
+        `num_tasks` tareas: uno libre con esa configuración, o uno nuevo.
+
+        Uso:
+            with worker_pools.lease("forks", 4, len(files)) as executor:
+                executor.map(...)
+        """
+        num_workers = max(num_workers, 1)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("El servidor se está cerrando.")
+            entry = next(
+                (
+                    e
+                    for e in self._pools
+                    if e.mode == processing_mode
+                    and e.workers == num_workers
+                    and not e.in_use
+                ),
+                None,
             )
+            if (
+                entry is not None
+                and entry.backend == "processes"
+                and entry.tasks >= self.max_tasks_per_process * num_workers
+            ):
+                self._retire(entry)
+                logging.info(
+                    f"Pool {processing_mode} x{num_workers} reciclado tras "
+                    f"{entry.tasks} tareas."
+                )
+                entry = None
+            if entry is None:
+                entry = self._create_entry(processing_mode, num_workers)
+                self._pools.append(entry)
+            entry.in_use = True
+            entry.tasks += num_tasks
+            self._start_reaper()
 
-            data_for_client = {
-                "nombres_encontrados": raw_result_from_extractor.get("Nombres", []),
-                "fechas_encontradas": raw_result_from_extractor.get("Fechas", []),
-                "lugares_encontrados": raw_result_from_extractor.get("Lugares", []),
-                "word_count": raw_result_from_extractor.get("ConteoPalabras", 0),
-            }
+        try:
+            yield entry.executor
+        finally:
+            with self._lock:
+                entry.in_use = False
+                entry.last_used = time.monotonic()
+                if entry.retired:
+                    entry.close()
+
+    def describe(self):
+        """Lista (modo, workers, ejecución, tareas, en uso) de los pools vivos."""
+        with self._lock:
+            return [
+                (e.mode, e.workers, e.backend, e.tasks, e.in_use) for e in self._pools
+            ]
+
+    def shutdown(self, wait=True):
+        """Cierra todos los pools (se llama al apagar el servidor)."""
+        with self._lock:
+            self._closed = True
+            entries = list(self._pools)
+            self._pools.clear()
+        for entry in entries:
+            entry.close(wait=wait, cancel_futures=True)
+
+
+worker_pools = WorkerPoolManager(
+    POOL_IDLE_TIMEOUT_SECONDS,
+    POOL_MAX_TASKS_PER_PROCESS,
+    RESULT_ARENA_BYTES,
+    resolve_threads_backend(THREADS_BACKEND),
+    log_pipeline,
+)
 
-            final_result_for_server = {
-                "pid_server": descriptive_worker_id,
-                "filename": final_filename,
-                "data": data_for_client,
-                "status": "success",
-                "error": "",
-            }
-        else:
-            print(
-                f"\n[{pid_label}: {worker_id_str}] Error durante extracción para "
-                f"{final_filename} (ver log)."
-            )
-            sys.stdout.flush()
 
-            logging.error(
-                f"[{descriptive_worker_id}] Error durante extracción para "
-                f"{final_filename}: {error_from_extractor}"
+def make_result_streamer(
+    client_socket, event_name, total_files, batch=None, processing_mode=None
+):
+    """
+    Devuelve un callback para `process_files` que envía cada resultado al
+    cliente como un mensaje FILE_RESULT apenas termina, y cuenta éxitos/errores.
+    `total_files` puede ser una función, si el total cambia durante el lote
+    (reparto dinámico). Con `processing_mode`, los envíos se miden en
+    `server_metrics`.
+    """
+    counts = {"done": 0, "success": 0, "error": 0}
+
+    def on_result(result):
+        counts["done"] += 1
+        counts["success" if result.get("status") == "success" else "error"] += 1
+        if batch is not None:
+            batch.file_done(result)
+        send_to_client(
+            client_socket,
+            {
+                "type": "FILE_RESULT",
+                "payload": {
+                    "event": event_name,
+                    "done": counts["done"],
+                    "total": total_files() if callable(total_files) else total_files,
+                    "result": result,
+                },
+            },
+            processing_mode,
+        )
+
+    on_result.counts = counts
+    return on_result
+
+
+def completion_summary(event_name, counts, duration):
+    """Payload del PROCESSING_COMPLETE que cierra un lote enviado por FILE_RESULT."""
+    return {
+        "event": event_name,
+        "status": "success",
+        "streamed": True,
+        "total_files": counts["done"],
+        "success_count": counts["success"],
+        "error_count": counts["error"],
+        "duration_seconds": duration,
+    }
+
+
+# --- Despacho Concurrente de Lotes ---
+
+class BatchProgress:
+    """Estado de un lote registrado en el despachador (para `status`)."""
+
+    def __init__(self, batch_id, client_id, event_name, mode, requested, total_files):
+        self.batch_id = batch_id
+        self.client_id = client_id
+        self.event_name = event_name
+        self.mode = mode
+        self.requested = requested
+        self.workers = 0
+        self.total_files = total_files
+        self.done_files = 0
+        self.registered_at = time.time()
+        self.started_at = None
+
+    def file_done(self, _result=None):
+        self.done_files += 1
+
+
+class BatchDispatcher:
+    """
+    Reparte un presupuesto global de workers entre lotes concurrentes.
+
+    Los lotes se admiten en orden de llegada (FIFO). Cada lote recibe como
+    máximo su parte justa del presupuesto (presupuesto / lotes activos), lo
+    que haya libre y lo que pidió su cliente, con un mínimo de 1. Así un
+    cliente con muchos workers no deja sin turno a los demás, y ningún lote
+    espera mientras haya al menos un worker libre.
+    """
+
+    def __init__(self, total_workers):
+        self.total_workers = total_workers
+        self.in_use = 0
+        self._cond = threading.Condition()
+        self._next_id = 1
+        self._waiting = collections.deque()
+        self._running = {}
+
+    def register(self, client_id, event_name, mode, requested, total_files):
+        """Encola un lote para admisión (no bloquea)."""
+        with self._cond:
+            batch = BatchProgress(
+                self._next_id, client_id, event_name, mode,
+                max(requested, 1), total_files,
             )
+            self._next_id += 1
+            self._waiting.append(batch)
+            return batch
+
+    def admit(self, batch):
+        """Espera el turno del lote y le asigna sus workers."""
+        with self._cond:
+            while self._waiting[0] is not batch or self.in_use >= self.total_workers:
+                self._cond.wait()
+            self._waiting.popleft()
+            active = len(self._running) + len(self._waiting) + 1
+            fair_share = max(1, self.total_workers // active)
+            free = self.total_workers - self.in_use
+            batch.workers = max(1, min(batch.requested, fair_share, free))
+            self.in_use += batch.workers
+            batch.started_at = time.time()
+            self._running[batch.batch_id] = batch
+            self._cond.notify_all()
+            return batch.workers
+
+    def finish(self, batch):
+        """Devuelve los workers del lote al presupuesto."""
+        with self._cond:
+            if self._running.pop(batch.batch_id, None) is not None:
+                self.in_use -= batch.workers
+            elif batch in self._waiting:
+                self._waiting.remove(batch)
+            self._cond.notify_all()
+
+    def snapshot(self):
+        """Copia (en ejecución, en espera) de los lotes registrados."""
+        with self._cond:
+            return list(self._running.values()), list(self._waiting)
+
+
+batch_dispatcher = BatchDispatcher(MAX_TOTAL_WORKERS)
+
+
+# --- Reparto de Archivos por Carga ---
+
+# Segundos por byte medidos en los lotes anteriores (para predecir makespans).
+throughput_model = ThroughputModel()
+
+
+class TriggerRun:
+    """
+    Un `trigger` en curso: el peso de cada archivo, la duración prevista de
+    cada lote y cuántos lotes faltan. Cuando termina el último, registra en el
+    log el makespan previsto y el real.
+    """
 
-            final_result_for_server = {
-                "pid_server": descriptive_worker_id,
-                "filename": final_filename,
-                "data": {
-                    "nombres_encontrados": [],
-                    "fechas_encontradas": [],
-                    "lugares_encontrados": [],
-                    "word_count": 0,
-                },
-                "status": "error",
-                "error": error_from_extractor,
-            }
-        return final_result_for_server
+    def __init__(self, event_name, weights, predicted, work=None, owners=None):
+        """
+        Args:
+            event_name (str): Evento disparado.
+            weights (dict): Nombre de archivo -> peso (`file_weight`).
+            predicted (dict): Socket del cliente -> segundos previstos del lote.
+            work (WorkStealingQueues): Colas del reparto dinámico (None si es
+                                       estático).
+            owners (dict): Socket del cliente -> índice de su cola en `work`.
+        """
+        self.event_name = event_name
+        self.weights = weights
+        self.predicted = predicted
+        self.work = work
+        self.owners = owners or {}
+        self.predicted_makespan = max(predicted.values(), default=0.0)
+        self.started_at = time.time()
+        self.pending = len(predicted)
+        self._lock = threading.Lock()
+
+    def batch_done(
+        self, client_socket, client_addr_log, files, results, workers, duration
+    ):
+        """
+        Registra un lote terminado (o descartado) y actualiza
+        `throughput_model` con los archivos que se procesaron de verdad (los
+        aciertos de caché no cuentan). En el reparto dinámico cierra la cola
+        del lote: lo que quedaba en ella pasa a los lotes que siguen tomando
+        archivos (ver `WorkStealingQueues.close`).
+        """
+        if self.work is not None:
+            left = self.work.close(self.owners[client_socket])
+            if left:
+                message = (
+                    f"Trigger '{self.event_name}': {len(left)} archivos del lote "
+                    f"de {client_addr_log} sin procesar (ningún lote sigue activo)."
+                )
+                server_log(message)
+                logging.warning(message)
+        processed = [
+            self.weights[f]
+            for f, res in zip(files, results)
+            if res is not None and res.get("pid_server") != "CACHE"
+        ]
+        throughput_model.observe(batch_units(processed, workers), duration)
+        logging.info(
+            f"Trigger '{self.event_name}', lote de {client_addr_log}: previsto "
+            f"{self.predicted.get(client_socket, 0.0):.2f}s, real {duration:.2f}s "
+            f"({len(files)} archivos, {len(processed)} sin caché, {workers} workers)."
+        )
 
-    except Exception as e:
-        print(
-            f"\n[{pid_label}: {worker_id_str}] Error INESPERADO en wrapper para "
-            f"{filename_base} (ver log)."
+        with self._lock:
+            self.pending -= 1
+            if self.pending:
+                return
+        steals = f", {self.work.steals} archivos robados" if self.work else ""
+        message = (
+            f"Trigger '{self.event_name}': makespan previsto "
+            f"{self.predicted_makespan:.2f}s, real "
+            f"{time.time() - self.started_at:.2f}s{steals}."
         )
-        sys.stdout.flush()
+        server_log(message)
+        logging.info(message)
+
+
+def list_text_files():
+    """Pares (nombre, tamaño) de los archivos .txt de TEXT_FILES_DIR (del índice)."""
+    return file_index.snapshot()
+
 
-        logging.error(
-            f"[{descriptive_worker_id}] Error INESPERADO en wrapper para "
-            f"{filename_base}: {type(e).__name__} - {e}",
-            exc_info=True,
+def open_result_cache():
+    """La caché de resultados del servidor, o None si está desactivada."""
+    if not RESULT_CACHE_ENABLED:
+        return None
+    return ResultCache(
+        RESULT_CACHE_FILENAME,
+        EXTRACTOR_VERSION,
+        memory_entries=RESULT_CACHE_MEMORY_ENTRIES,
+        max_entries=RESULT_CACHE_MAX_ENTRIES,
+    )
+
+
+def cached_result(fp):
+    """
+    (resultado, clave de caché) de un archivo: el resultado es el de la caché
+    (con `pid_server` "CACHE") o None si hay que procesarlo.
+    """
+    if result_cache is None:
+        return None, None
+    cached_data, cache_key = result_cache.lookup(fp)
+    if cached_data is None:
+        return None, cache_key
+    result = {
+        "pid_server": "CACHE",
+        "filename": os.path.basename(fp),
+        "data": cached_data,
+        "status": "success",
+        "error": "",
+    }
+    return result, cache_key
+
+
+def process_files(full_paths, processing_mode, num_workers, on_result=None):
+    """
+    Procesa una lista de archivos consultando primero la caché de resultados.
+
+    Solo los archivos sin resultado en caché se envían al pool de workers; los
+    aciertos se devuelven sin leer el archivo. Los archivos grandes se reparten
+    en rangos entre los workers (ver `file_tasks`) y sus resultados se unen
+    antes de guardarlos en caché y de reportarlos. El orden de `full_paths` se
+    mantiene en la lista de resultados. Si se pasa `on_result`, se llama con
+    cada resultado apenas está disponible, en orden de finalización (para
+    reportar progreso y enviar resultados parciales al cliente).
+    """
+    results = [None] * len(full_paths)
+    pending = []  # (índice, ruta, clave de caché)
+
+    for i, fp in enumerate(full_paths):
+        cached, cache_key = cached_result(fp)
+        if cached is not None:
+            results[i] = cached
+            if on_result:
+                on_result(cached)
+        else:
+            pending.append((i, fp, cache_key))
+
+    if pending:
+        tasks = file_tasks(pending, processing_mode, num_workers)
+        with worker_pools.lease(processing_mode, num_workers, len(tasks)) as executor:
+            submitted = time.monotonic()
+            futures = {
+                executor.submit(process_file_task, args): task
+                for args, task in tasks
+            }
+            for future in concurrent.futures.as_completed(futures):
+                i, cache_key, ranges, part = futures[future]
+                res_item, content_hash = finish_task(
+                    future.result(), processing_mode, submitted
+                )
+                if ranges is not None:
+                    res_item = ranges.add(part, res_item)
+                    if res_item is None:
+                        continue
+                results[i] = res_item
+                if cache_key is not None and res_item.get("status") == "success":
+                    result_cache.store(cache_key, res_item["data"], content_hash)
+                if on_result:
+                    on_result(res_item)
+
+    if result_cache is not None:
+        result_cache.flush()
+        hits = len(full_paths) - len(pending)
+        stats = result_cache.stats()
+        logging.info(
+            f"Caché de resultados: {hits} aciertos, {len(pending)} fallos en este lote "
+            f"(acumulado: {stats['hits']} aciertos, {stats['misses']} fallos)."
         )
 
-        return {
-            "pid_server": descriptive_worker_id,
-            "filename": filename_base,
-            "data": {
-                "nombres_encontrados": [],
-                "fechas_encontradas": [],
-                "lugares_encontrados": [],
-                "word_count": 0,
-            },
-            "status": "error",
-            "error": f"Error inesperado en wrapper: {str(e)}",
-        }
+    return results
+
+
+def process_files_dynamic(work, owner, processing_mode, num_workers, on_result=None):
+    """
+    Procesa archivos tomándolos de a uno de `work` (un `WorkStealingQueues`)
+    a medida que se libera cada worker: nunca hay más de `num_workers`
+    tareas en vuelo (un archivo grande se reparte en rangos, ver
+    `file_tasks`), y cuando la cola del lote `owner` se vacía se roban
+    archivos de los demás lotes.
+
+    Returns:
+        (archivos, resultados, robados): los archivos procesados y sus
+        resultados, en orden de finalización, y cuántos fueron robados.
+    """
+    files, results = [], []
+    stolen = 0
+
+    def finish(name, result):
+        files.append(name)
+        results.append(result)
+        if on_result:
+            on_result(result)
+
+    with worker_pools.lease(
+        processing_mode, num_workers, len(work.pending(owner))
+    ) as executor:
+        in_flight = {}  # future -> (nombre, clave de caché, RangeResults, rango)
+        submitted = {}  # future -> cuándo se envió al pool
+        ready = collections.deque()  # tareas de file_tasks aún sin enviar
+        while True:
+            while len(in_flight) < num_workers:
+                if not ready:
+                    item = work.take(owner)
+                    if item is None:
+                        break
+                    name, was_stolen = item
+                    stolen += was_stolen
+                    fp = os.path.join(TEXT_FILES_DIR, name)
+                    cached, cache_key = cached_result(fp)
+                    if cached is not None:
+                        finish(name, cached)
+                        continue
+                    pending = [(name, fp, cache_key)]
+                    ready.extend(file_tasks(pending, processing_mode, num_workers))
+                args, task = ready.popleft()
+                now = time.monotonic()
+                future = executor.submit(process_file_task, args)
+                in_flight[future] = task
+                submitted[future] = now
+            if not in_flight:
+                break
+            done, _ = concurrent.futures.wait(
+                in_flight, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                name, cache_key, ranges, part = in_flight.pop(future)
+                res_item, content_hash = finish_task(
+                    future.result(), processing_mode, submitted.pop(future)
+                )
+                if ranges is not None:
+                    res_item = ranges.add(part, res_item)
+                    if res_item is None:
+                        continue
+                if cache_key is not None and res_item.get("status") == "success":
+                    result_cache.store(cache_key, res_item["data"], content_hash)
+                finish(name, res_item)
+
+    if result_cache is not None:
+        result_cache.flush()
+    return files, results, stolen
 
 
 def manage_client_batch_processing():
     """
-    Hilo trabajador que toma lotes de client_batch_processing_queue
-    y los procesa uno a la vez.
+    Hilo despachador que toma lotes de client_batch_processing_queue, los
+    registra en `batch_dispatcher` (en orden de llegada) y lanza un hilo por
+    lote. Varios lotes se procesan a la vez dentro del presupuesto global.
+
+    Todos los lotes que hay en la cola se registran antes de lanzar sus
+    hilos: los de un mismo `trigger` (que se encolan juntos) ya cuentan al
+    calcular la parte justa del primero que se admite, en vez de que ese se
+    lleve todos los workers libres.
     """
     while True:
         new_batch_event.wait()
 
-        client_socket, assigned_files, event_name, config = (None,) * 4
-
         with state_lock:
-            if client_batch_processing_queue:
-                item = client_batch_processing_queue.popleft()
-                client_socket, assigned_files, event_name, config = item
-            else:
+            items = list(client_batch_processing_queue)
+            client_batch_processing_queue.clear()
+            if not items:
                 new_batch_event.clear()
                 continue
 
-        client_addr_log, is_client_valid = "Dirección Desconocida", False
+        registered = []
+        for client_socket, assigned_files, event_name, config, trigger_run in items:
+            client_addr_log, is_client_valid = "Dirección Desconocida", False
 
-        with state_lock:
-            if client_socket in clients:
-                client_addr_log = str(clients[client_socket])
-                is_client_valid = True
-            else:
-                server_log(
-                    f"Cliente para lote de '{event_name}' ya no conectado. "
-                    "Lote descartado."
-                )
+            with state_lock:
+                if client_socket in clients:
+                    client_addr_log = str(clients[client_socket])
+                    is_client_valid = True
+                else:
+                    server_log(
+                        f"Cliente para lote de '{event_name}' ya no conectado. "
+                        "Lote descartado."
+                    )
 
-        if not is_client_valid or not assigned_files:
-            continue
+            dynamic = trigger_run is not None and trigger_run.work is not None
+            if not is_client_valid or not (assigned_files or dynamic):
+                if trigger_run is not None:
+                    trigger_run.batch_done(
+                        client_socket, client_addr_log, assigned_files, [], 1, 0.0
+                    )
+                continue
 
-        with processing_lock:
-            start_time_batch = time.time()
-            results = []
-            worker_identifiers_used = set()
+            num_workers = config.get("count", DEFAULT_CLIENT_CONFIG["count"])
+            processing_mode = config.get("mode", DEFAULT_CLIENT_CONFIG["mode"])
+            batch = batch_dispatcher.register(
+                get_client_id(client_socket), event_name, processing_mode,
+                num_workers, len(assigned_files),
+            )
+            registered.append(
+                (batch, client_socket, client_addr_log, assigned_files, trigger_run)
+            )
 
-            try:
-                send_to_client(
-                    client_socket,
-                    {
-                        "type": "START_PROCESSING",
-                        "payload": {"event": event_name, "files": assigned_files},
-                    },
-                )
+        for args in registered:
+            threading.Thread(
+                target=process_client_batch, args=args, daemon=True
+            ).start()
 
-                num_workers = config.get("count", DEFAULT_CLIENT_CONFIG["count"])
-                processing_mode = config.get("mode", DEFAULT_CLIENT_CONFIG["mode"])
 
-                num_workers = max(num_workers, 1)
+def process_client_batch(
+    batch, client_socket, client_addr_log, assigned_files, trigger_run=None
+):
+    """
+    Procesa un lote de un cliente: espera su admisión en `batch_dispatcher`,
+    procesa los archivos con los workers asignados y envía los resultados.
+    Si el lote viene de un `trigger`, le avisa a `trigger_run` al terminar.
+    """
+    event_name = batch.event_name
+    processing_mode = batch.mode
+    with server_metrics.span("admission", processing_mode):
+        num_workers = batch_dispatcher.admit(batch)
 
-                full_paths = [os.path.join(TEXT_FILES_DIR, f) for f in assigned_files]
+    start_time_batch = time.monotonic()
+    results = []
+    worker_identifiers_used = set()
 
-                executor_cls = None
-                if processing_mode == "threads":
-                    executor_cls = concurrent.futures.ThreadPoolExecutor
-                elif processing_mode == "forks":
-                    executor_cls = concurrent.futures.ProcessPoolExecutor
-                else:
-                    raise ValueError(f"Modo de proc. inválido: {processing_mode}")
+    try:
+        if num_workers < batch.requested:
+            server_log(
+                f"Lote {batch.batch_id} ({client_addr_log}, {event_name}): "
+                f"{num_workers} de {batch.requested} workers pedidos "
+                f"(presupuesto global: {batch_dispatcher.total_workers})."
+            )
 
-                with executor_cls(max_workers=num_workers) as executor:
-                    map_input = [(fp, processing_mode) for fp in full_paths]
-                    map_results_list = list(
-                        executor.map(process_single_file_wrapper, map_input)
-                    )
-                    results.extend(map_results_list)
+        work = trigger_run.work if trigger_run is not None else None
+        if work is not None:
+            # Reparto dinámico: los archivos de la cola del lote (otros lotes
+            # pueden haber robado parte), y los que se vayan tomando.
+            owner = trigger_run.owners[client_socket]
+            assigned_files = work.pending(owner)
+
+        send_to_client(
+            client_socket,
+            {
+                "type": "START_PROCESSING",
+                "payload": {
+                    "event": event_name,
+                    "files": assigned_files,
+                    "dynamic": work is not None,
+                },
+            },
+        )
 
-                    for res_item in map_results_list:
-                        if "pid_server" in res_item:
-                            worker_identifiers_used.add(res_item["pid_server"])
+        if work is not None:
+            on_result = make_result_streamer(
+                client_socket,
+                event_name,
+                lambda: on_result.counts["done"] + len(work.pending(owner)),
+                batch,
+                processing_mode,
+            )
+            assigned_files, map_results_list, stolen = process_files_dynamic(
+                work, owner, processing_mode, num_workers, on_result=on_result
+            )
+            batch.total_files = len(assigned_files)
+        else:
+            full_paths = [os.path.join(TEXT_FILES_DIR, f) for f in assigned_files]
+            on_result = make_result_streamer(
+                client_socket, event_name, len(full_paths), batch, processing_mode
+            )
+            map_results_list = process_files(
+                full_paths, processing_mode, num_workers, on_result=on_result
+            )
+        results.extend(map_results_list)
 
-                duration = time.time() - start_time_batch
-                server_log(
-                    f"Lote para {client_addr_log} ({event_name}) "
-                    f"completado en {duration:.2f}s."
-                )
+        for res_item in map_results_list:
+            if "pid_server" in res_item:
+                worker_identifiers_used.add(res_item["pid_server"])
 
-                if worker_identifiers_used:
-                    print(f"    Workers utilizados para este lote ({processing_mode}):")
-                    for worker_id_str in sorted(list(worker_identifiers_used)):
-                        print(f"      - {worker_id_str}")
-                    sys.stdout.flush()
+        duration = time.monotonic() - start_time_batch
+        server_metrics.record("batch", processing_mode, duration)
+        server_log(
+            f"Lote para {client_addr_log} ({event_name}) "
+            f"completado en {duration:.2f}s."
+        )
 
-                send_to_client(
-                    client_socket,
-                    {
-                        "type": "PROCESSING_COMPLETE",
-                        "payload": {
-                            "event": event_name,
-                            "status": "success",
-                            "results": results,
-                            "duration_seconds": duration,
-                        },
-                    },
-                )
+        if worker_identifiers_used:
+            print(f"    Workers utilizados para este lote ({processing_mode}):")
+            for worker_id_str in sorted(list(worker_identifiers_used)):
+                print(f"      - {worker_id_str}")
+            sys.stdout.flush()
 
-            except Exception as e:
-                server_log(
-                    f"Error en procesamiento de lote para {client_addr_log}: {e}"
-                )
-                try:
-                    send_to_client(
-                        client_socket,
-                        {
-                            "type": "PROCESSING_COMPLETE",
-                            "payload": {
-                                "event": event_name,
-                                "status": "failure",
-                                "message": str(e),
-                                "results": [],
-                            },
-                        },
-                    )
-                except:
-                    pass
+        summary = completion_summary(event_name, on_result.counts, duration)
+        if work is not None:
+            # El cliente se entera de qué archivos terminó procesando.
+            summary["files"] = assigned_files
+            summary["stolen_count"] = stolen
+        send_to_client(
+            client_socket, {"type": "PROCESSING_COMPLETE", "payload": summary}
+        )
+
+    except Exception as e:
+        server_log(f"Error en procesamiento de lote para {client_addr_log}: {e}")
+        try:
+            send_to_client(
+                client_socket,
+                {
+                    "type": "PROCESSING_COMPLETE",
+                    "payload": {
+                        "event": event_name,
+                        "status": "failure",
+                        "message": str(e),
+                        "results": [],
+                    },
+                },
+            )
+        except:
+            pass
+    finally:
+        batch_dispatcher.finish(batch)
+        if trigger_run is not None:
+            trigger_run.batch_done(
+                client_socket,
+                client_addr_log,
+                assigned_files,
+                results,
+                num_workers,
+                time.monotonic() - start_time_batch,
+            )
 
 
 # --- Hilo Manejador de Cliente ---
-def handle_client(client_socket, addr):
-    """Maneja la comunicación con un cliente conectado."""
+def register_client(client_socket, addr):
+    """Registra un cliente recién conectado, le envía WELCOME y devuelve su ID."""
     global next_client_id
 
-    client_id = next_client_id
-    next_client_id += 1
-
     with state_lock:
+        client_id = next_client_id
+        next_client_id += 1
         clients[client_socket] = addr
         client_ids[client_socket] = client_id
         if client_socket not in client_configs:
@@ -458,15 +1289,202 @@ def handle_client(client_socket, addr):
         client_socket,
         {
             "type": "WELCOME",
-            "payload": {"server_info": {"version": "1.0"}, "client_id": client_id},
+            "payload": {
+                "server_info": {
+                    "version": "1.0",
+                    "protocols": SUPPORTED_PROTOCOLS,
+                    "compression": [COMPRESSION_ZLIB],
+                },
+                "client_id": client_id,
+            },
         },
     )
+    return client_id
+
+
+def handle_client_message(client_socket, client_id, message):
+    """
+    Atiende un mensaje ya decodificado de un cliente. Es común al servidor con
+    hilos (`handle_client`) y al modo asyncio (`handle_client_async`).
+    """
+    payload = message.get("payload")
+    command = message.get("type")
+
+    if command == "SET_CONFIG":
+        if isinstance(payload, dict) and "mode" in payload and "count" in payload:
+            mode = payload["mode"]
+            count = payload["count"]
+            if mode in ["threads", "forks"] and isinstance(count, int) and count > 0:
+                with state_lock:
+                    client_configs[client_socket] = {
+                        "mode": mode,
+                        "count": count,
+                    }
+                cfg = client_configs[client_socket]
+                send_to_client(
+                    client_socket,
+                    {
+                        "type": "ACK_CONFIG",
+                        "payload": {"status": "success", "config": cfg},
+                    },
+                )
+            else:
+                send_to_client(
+                    client_socket,
+                    {
+                        "type": "ACK_CONFIG",
+                        "payload": {
+                            "status": "error",
+                            "message": "Modo/cantidad inválido.",
+                        },
+                    },
+                )
+        else:
+            send_to_client(
+                client_socket,
+                {
+                    "type": "ACK_CONFIG",
+                    "payload": {
+                        "status": "error",
+                        "message": "Payload SET_CONFIG inválido.",
+                    },
+                },
+            )
+
+    elif command == "SUB":
+        event_name = payload
+        if isinstance(event_name, str) and event_name:
+            with state_lock:
+                if event_name not in events:
+                    events[event_name] = set()
+                events[event_name].add(client_socket)
+
+                if event_name not in client_queues:
+                    client_queues[event_name] = collections.deque()
+                if client_socket not in client_queues[event_name]:
+                    client_queues[event_name].append(client_socket)
+
+            server_log(f"Cliente {client_id} suscrito a evento '{event_name}'")
+            send_to_client(
+                client_socket,
+                {"type": "ACK_SUB", "payload": event_name},
+            )
+        else:
+            send_to_client(
+                client_socket,
+                {"type": "ERROR", "payload": "SUB inválido."},
+            )
+
+    elif command == "UNSUB":
+        event_name = payload
+        if isinstance(event_name, str) and event_name:
+            with state_lock:
+                if event_name in events:
+                    events[event_name].discard(client_socket)
+                if event_name in client_queues:
+                    new_q = collections.deque(
+                        [s for s in client_queues[event_name] if s != client_socket]
+                    )
+                    client_queues[event_name] = new_q
+
+            server_log(f"Cliente {client_id} desuscrito de evento '{event_name}'")
+            send_to_client(
+                client_socket,
+                {"type": "ACK_UNSUB", "payload": event_name},
+            )
+        else:
+            send_to_client(
+                client_socket,
+                {"type": "ERROR", "payload": "UNSUB inválido."},
+            )
+
+    elif command == "GET_METRICS":
+        send_to_client(
+            client_socket, {"type": "METRICS", "payload": server_metrics.snapshot()}
+        )
+
+    elif command == "PROCESS_FILES":
+        event_name = payload.get("event", "sin_evento")
+        files = payload.get("files", [])
+
+        if not files:
+            send_to_client(
+                client_socket,
+                {
+                    "type": "PROCESSING_COMPLETE",
+                    "payload": {
+                        "event": event_name,
+                        "status": "success",
+                        "message": "No files provided.",
+                        "results": [],
+                    },
+                },
+            )
+            return
+
+        try:
+            # El índice responde sin tocar el disco; un archivo recién creado
+            # que todavía no está en el índice se busca en el directorio.
+            full_paths = [
+                os.path.join(TEXT_FILES_DIR, f)
+                for f in files
+                if f in file_index or os.path.isfile(os.path.join(TEXT_FILES_DIR, f))
+            ]
+
+            num_workers = client_configs.get(client_socket, {}).get("count", 2)
+            mode = client_configs.get(client_socket, {}).get("mode", "threads")
+
+            batch = batch_dispatcher.register(
+                client_id, event_name, mode, num_workers, len(full_paths)
+            )
+            try:
+                with server_metrics.span("admission", mode):
+                    granted = batch_dispatcher.admit(batch)
+                start_time = time.monotonic()
+                on_result = make_result_streamer(
+                    client_socket, event_name, len(full_paths), batch, mode
+                )
+                process_files(full_paths, mode, granted, on_result=on_result)
+                server_metrics.record("batch", mode, time.monotonic() - start_time)
+            finally:
+                batch_dispatcher.finish(batch)
+
+            send_to_client(
+                client_socket,
+                {
+                    "type": "PROCESSING_COMPLETE",
+                    "payload": completion_summary(
+                        event_name,
+                        on_result.counts,
+                        time.monotonic() - start_time,
+                    ),
+                },
+            )
+
+        except Exception as e:
+            send_to_client(
+                client_socket,
+                {
+                    "type": "PROCESSING_COMPLETE",
+                    "payload": {
+                        "event": event_name,
+                        "status": "failure",
+                        "message": str(e),
+                        "results": [],
+                    },
+                },
+            )
+
 
-    buffer = ""
+def handle_client(client_socket, addr):
+    """Maneja la comunicación con un cliente conectado."""
+    client_id = register_client(client_socket, addr)
+
+    reader = MessageReader()
     try:
         while True:
             try:
-                data = client_socket.recv(4096)
+                received = reader.recv_from(client_socket)
             except ConnectionResetError:
                 server_log(f"Conexión reseteada por cliente {client_id} ({addr}).")
                 break
@@ -474,206 +1492,209 @@ def handle_client(client_socket, addr):
                 server_log(f"Error en recv() para cliente {client_id} ({addr}): {e}")
                 break
 
-            if not data:
+            if not received:
                 server_log(f"Cliente {client_id} ({addr}) cerró conexión.")
                 break
 
-            buffer += data.decode("utf-8")
+            try:
+                for message_bytes in reader.messages():
+                    if not message_bytes.strip():
+                        continue
+                    try:
+                        message = json.loads(message_bytes)
+                        if message.get("type") == "HELLO":
+                            reader.version = negotiate_protocol(
+                                client_socket, message.get("payload")
+                            )
+                        else:
+                            handle_client_message(client_socket, client_id, message)
+                    except json.JSONDecodeError:
+                        server_log(f"JSON inválido de {addr}: {message_bytes!r}")
+                    except Exception as e:
+                        server_log(f"Error procesando msg de {addr}: {e}")
+            except ProtocolError as e:
+                server_log(f"Framing inválido de cliente {client_id} ({addr}): {e}")
+                break
+    finally:
+        handle_disconnect(client_socket)
 
-            while "\n" in buffer:
-                message_str, buffer = buffer.split("\n", 1)
-                if not message_str.strip():
-                    continue
 
-                try:
-                    message = json.loads(message_str)
-                    command = message.get("type")
-                    payload = message.get("payload")
-
-                    if command == "SET_CONFIG":
-                        if (
-                            isinstance(payload, dict)
-                            and "mode" in payload
-                            and "count" in payload
-                        ):
-                            mode = payload["mode"]
-                            count = payload["count"]
-                            if (
-                                mode in ["threads", "forks"]
-                                and isinstance(count, int)
-                                and count > 0
-                            ):
-                                with state_lock:
-                                    client_configs[client_socket] = {
-                                        "mode": mode,
-                                        "count": count,
-                                    }
-                                cfg = client_configs[client_socket]
-                                send_to_client(
-                                    client_socket,
-                                    {
-                                        "type": "ACK_CONFIG",
-                                        "payload": {"status": "success", "config": cfg},
-                                    },
-                                )
-                            else:
-                                send_to_client(
-                                    client_socket,
-                                    {
-                                        "type": "ACK_CONFIG",
-                                        "payload": {
-                                            "status": "error",
-                                            "message": "Modo/cantidad inválido.",
-                                        },
-                                    },
-                                )
-                        else:
-                            send_to_client(
-                                client_socket,
-                                {
-                                    "type": "ACK_CONFIG",
-                                    "payload": {
-                                        "status": "error",
-                                        "message": "Payload SET_CONFIG inválido.",
-                                    },
-                                },
-                            )
+# --- Modo asyncio (python -m src.server --async) ---
 
-                    elif command == "SUB":
-                        event_name = payload
-                        if isinstance(event_name, str) and event_name:
-                            with state_lock:
-                                if event_name not in events:
-                                    events[event_name] = set()
-                                events[event_name].add(client_socket)
-
-                                if event_name not in client_queues:
-                                    client_queues[event_name] = collections.deque()
-                                if client_socket not in client_queues[event_name]:
-                                    client_queues[event_name].append(client_socket)
-
-                            server_log(
-                                f"Cliente {client_id} suscrito a evento '{event_name}'"
-                            )
-                            send_to_client(
-                                client_socket,
-                                {"type": "ACK_SUB", "payload": event_name},
-                            )
-                        else:
-                            send_to_client(
-                                client_socket,
-                                {"type": "ERROR", "payload": "SUB inválido."},
-                            )
+# Límites del buffer de escritura de cada conexión asyncio. Por encima de
+# ASYNC_WRITE_HIGH_WATER, `sendall` desde otro hilo espera a que el cliente lea
+# hasta bajar de ASYNC_WRITE_LOW_WATER, igual que un socket bloqueante.
+ASYNC_WRITE_HIGH_WATER = 1024 * 1024
+ASYNC_WRITE_LOW_WATER = 256 * 1024
 
-                    elif command == "UNSUB":
-                        event_name = payload
-                        if isinstance(event_name, str) and event_name:
-                            with state_lock:
-                                if event_name in events:
-                                    events[event_name].discard(client_socket)
-                                if event_name in client_queues:
-                                    new_q = collections.deque(
-                                        [
-                                            s
-                                            for s in client_queues[event_name]
-                                            if s != client_socket
-                                        ]
-                                    )
-                                    client_queues[event_name] = new_q
-
-                            server_log(
-                                f"Cliente {client_id} desuscrito de evento '{event_name}'"
-                            )
-                            send_to_client(
-                                client_socket,
-                                {"type": "ACK_UNSUB", "payload": event_name},
-                            )
-                        else:
-                            send_to_client(
-                                client_socket,
-                                {"type": "ERROR", "payload": "UNSUB inválido."},
-                            )
 
-                    elif command == "PROCESS_FILES":
-                        event_name = payload.get("event", "sin_evento")
-                        files = payload.get("files", [])
+class AsyncClientConnection:
+    """
+    Conexión atendida por el event loop, con la misma interfaz mínima de socket
+    (`sendall`, `fileno`, `close`) que usa el resto del servidor. Así el estado
+    global, `send_to_client`, `handle_disconnect` y los lotes funcionan igual
+    en ambos modos. Se puede usar desde cualquier hilo: las escrituras se
+    delegan al event loop.
+
+    Desde otro hilo (ej. los FILE_RESULT de un lote), `sendall` espera el
+    `drain()` del writer: si el cliente no lee, el lote se frena en vez de
+    acumular sus resultados en memoria. Desde el event loop no se puede
+    esperar; ahí la contrapresión la aplica `handle_client_async`, que espera
+    el `drain()` antes de leer más mensajes del cliente.
+    """
 
-                        if not files:
-                            send_to_client(
-                                client_socket,
-                                {
-                                    "type": "PROCESSING_COMPLETE",
-                                    "payload": {
-                                        "event": event_name,
-                                        "status": "success",
-                                        "message": "No files provided.",
-                                        "results": [],
-                                    },
-                                },
-                            )
-                            continue
+    def __init__(self, loop, writer):
+        self._loop = loop
+        self._loop_thread = threading.get_ident()
+        self._writer = writer
+        self._closed = False
+        writer.transport.set_write_buffer_limits(
+            high=ASYNC_WRITE_HIGH_WATER, low=ASYNC_WRITE_LOW_WATER
+        )
+        sock = writer.get_extra_info("socket")
+        self._fileno = sock.fileno() if sock is not None else -1
+
+    def fileno(self):
+        if self._closed or self._writer.is_closing():
+            return -1
+        return self._fileno
+
+    def _write(self, data):
+        if not self._writer.is_closing():
+            self._writer.write(data)
+
+    async def _write_and_drain(self, data):
+        if self._writer.is_closing():
+            raise BrokenPipeError("Conexión cerrada.")
+        self._writer.write(data)
+        await self._writer.drain()
+
+    async def drain(self):
+        """Espera a que el buffer de escritura baje del límite (ver la clase)."""
+        await self._writer.drain()
+
+    def sendall(self, data):
+        if self._closed:
+            raise BrokenPipeError("Conexión cerrada.")
+        if threading.get_ident() == self._loop_thread:
+            self._write(data)
+        else:
+            asyncio.run_coroutine_threadsafe(
+                self._write_and_drain(data), self._loop
+            ).result()
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        if threading.get_ident() == self._loop_thread:
+            self._writer.close()
+        else:
+            self._loop.call_soon_threadsafe(self._writer.close)
 
-                        try:
-                            full_paths = [
-                                os.path.join(TEXT_FILES_DIR, f)
-                                for f in files
-                                if os.path.isfile(os.path.join(TEXT_FILES_DIR, f))
-                            ]
 
-                            num_workers = client_configs.get(client_socket, {}).get(
-                                "count", 2
-                            )
-                            mode = client_configs.get(client_socket, {}).get(
-                                "mode", "threads"
-                            )
+# Bytes pedidos al StreamReader en cada lectura del modo asyncio.
+ASYNC_READ_CHUNK = 64 * 1024
 
-                            executor_cls = (
-                                concurrent.futures.ThreadPoolExecutor
-                                if mode == "threads"
-                                else concurrent.futures.ProcessPoolExecutor
-                            )
 
-                            with executor_cls(max_workers=num_workers) as executor:
-                                map_input = [(fp, mode) for fp in full_paths]
-                                map_results = list(
-                                    executor.map(process_single_file_wrapper, map_input)
-                                )
+async def handle_client_async(reader, writer):
+    """Equivalente de `handle_client` en modo asyncio: una corrutina por cliente."""
+    loop = asyncio.get_running_loop()
+    client_socket = AsyncClientConnection(loop, writer)
+    addr = writer.get_extra_info("peername")
+    client_id = register_client(client_socket, addr)
 
-                            send_to_client(
-                                client_socket,
-                                {
-                                    "type": "PROCESSING_COMPLETE",
-                                    "payload": {
-                                        "event": event_name,
-                                        "status": "success",
-                                        "results": map_results,
-                                        "duration_seconds": 0,
-                                    },
-                                },
-                            )
+    message_reader = MessageReader()
+    try:
+        while True:
+            try:
+                data = await reader.read(ASYNC_READ_CHUNK)
+            except ConnectionResetError:
+                server_log(f"Conexión reseteada por cliente {client_id} ({addr}).")
+                break
+            except Exception as e:
+                server_log(f"Error leyendo de cliente {client_id} ({addr}): {e}")
+                break
+
+            if not data:
+                server_log(f"Cliente {client_id} ({addr}) cerró conexión.")
+                break
 
-                        except Exception as e:
-                            send_to_client(
+            message_reader.feed(data)
+            try:
+                for message_bytes in message_reader.messages():
+                    if not message_bytes.strip():
+                        continue
+                    try:
+                        message = json.loads(message_bytes)
+                        command = message.get("type")
+                        if command == "HELLO":
+                            message_reader.version = negotiate_protocol(
+                                client_socket, message.get("payload")
+                            )
+                        elif command == "PROCESS_FILES":
+                            # La extracción bloquea: se hace fuera del event loop.
+                            await loop.run_in_executor(
+                                None,
+                                handle_client_message,
                                 client_socket,
-                                {
-                                    "type": "PROCESSING_COMPLETE",
-                                    "payload": {
-                                        "event": event_name,
-                                        "status": "failure",
-                                        "message": str(e),
-                                        "results": [],
-                                    },
-                                },
+                                client_id,
+                                message,
                             )
+                        else:
+                            handle_client_message(client_socket, client_id, message)
+                    except json.JSONDecodeError:
+                        server_log(f"JSON inválido de {addr}: {message_bytes!r}")
+                    except Exception as e:
+                        server_log(f"Error procesando msg de {addr}: {e}")
+            except ProtocolError as e:
+                server_log(f"Framing inválido de cliente {client_id} ({addr}): {e}")
+                break
 
-                except json.JSONDecodeError:
-                    server_log(f"JSON inválido de {addr}: '{message_str}'")
-                except Exception as e:
-                    server_log(f"Error procesando msg de {addr}: {e}")
+            # No se leen más pedidos mientras el cliente no lea las respuestas.
+            try:
+                await client_socket.drain()
+            except ConnectionError:
+                server_log(f"Cliente {client_id} ({addr}) cerró conexión.")
+                break
     finally:
         handle_disconnect(client_socket)
 
 
+async def async_main_server_loop():
+    """Acepta conexiones con `asyncio.start_server` en lugar de un hilo por cliente."""
+    global async_loop, server_socket
+    async_loop = asyncio.get_running_loop()
+    server_socket = await asyncio.start_server(
+        handle_client_async, HOST, PORT, backlog=LISTEN_BACKLOG
+    )
+    print(f"Servidor (asyncio) escuchando en {HOST}:{PORT}")
+    async with server_socket:
+        try:
+            await server_socket.serve_forever()
+        except asyncio.CancelledError:
+            pass
+
+
+def close_server_socket():
+    """Cierra el socket (o el servidor asyncio) que acepta conexiones."""
+    if server_socket is None:
+        return
+    if async_loop is not None:
+        async_loop.call_soon_threadsafe(server_socket.close)
+    else:
+        server_socket.close()
+
+
+def dump_metrics():
+    """Guarda las métricas en METRICS_FILENAME (al cerrar el servidor)."""
+    try:
+        server_metrics.dump(METRICS_FILENAME)
+        print(f"Métricas guardadas en {METRICS_FILENAME}.")
+    except OSError as e:
+        print(f"No se pudieron guardar las métricas: {e}")
+
+
 # --- Comandos del Servidor ---
 
 def print_help():
@@ -685,13 +1706,21 @@ def print_help():
     print(
         "  trigger <nombre_evento>       - Dispara un evento para los clientes en cola."
     )
+    print(
+        "  trigger <evento> dynamic      - Igual, repartiendo los archivos a medida "
+        "que se liberan los workers."
+    )
     print(
         "  list                          - Muestra estado de eventos, colas y clientes."
     )
     print("  clients                       - Muestra clientes y sus eventos suscritos.")
     print(
-        "  status                        - Muestra si el servidor está Ocupado o Idle."
+        "  status                        - Muestra estado, progreso de lotes y caché."
     )
+    print(
+        "  metrics                       - Tiempos por etapa (p50/p95/p99) y workers."
+    )
+    print("  metrics reset                 - Reinicia las métricas.")
     print(
         "  exit                          - Cierra el servidor y notifica a los clientes."
     )
@@ -777,20 +1806,78 @@ def server_commands():
                     print("-------------------------")
 
             elif command == "status":
-                is_worker_busy, q_len = False, 0
                 with state_lock:
-                    if client_batch_processing_queue:
-                        is_worker_busy = True
-                        q_len = len(client_batch_processing_queue)
+                    q_len = len(client_batch_processing_queue)
+                running, waiting = batch_dispatcher.snapshot()
+                q_len += len(waiting)
 
-                if is_worker_busy or processing_lock.locked():
-                    print(f"Estado: Ocupado (Procesando o con {q_len} lotes en cola)")
+                if running or q_len:
+                    print(
+                        f"Estado: Ocupado ({len(running)} lotes en ejecución, "
+                        f"{q_len} en cola, {batch_dispatcher.in_use}/"
+                        f"{batch_dispatcher.total_workers} workers en uso)"
+                    )
                 else:
                     print("Estado: Idle")
 
+                now = time.time()
+                for b in running:
+                    print(
+                        f"  - Lote {b.batch_id} | Cliente {b.client_id} | "
+                        f"'{b.event_name}' | {b.mode} x{b.workers} "
+                        f"(pidió {b.requested}) | "
+                        f"{b.done_files}/{b.total_files} archivos | "
+                        f"{now - b.started_at:.1f}s"
+                    )
+                for b in waiting:
+                    print(
+                        f"  - Lote {b.batch_id} | Cliente {b.client_id} | "
+                        f"'{b.event_name}' | en espera "
+                        f"({b.total_files} archivos, {now - b.registered_at:.1f}s)"
+                    )
+
+                pools = worker_pools.describe()
+                if pools:
+                    print("Pools de workers activos:")
+                    for mode, count, backend, tasks, in_use in pools:
+                        uso = "en uso" if in_use else "libre"
+                        ejecucion = (
+                            ""
+                            if (mode, backend) in POOL_DEFAULT_BACKENDS
+                            else f" con {backend}"
+                        )
+                        print(
+                            f"  - {mode} x{count}{ejecucion}: {tasks} tareas ({uso})"
+                        )
+
+                print(f"Índice de archivos: {file_index.describe()}")
+
+                if result_cache is not None:
+                    stats = result_cache.stats()
+                    print(
+                        f"Caché de resultados: {stats['hits']} aciertos, "
+                        f"{stats['misses']} fallos "
+                        f"({stats['memory_entries']} en memoria, "
+                        f"{stats['disk_entries']} en disco)"
+                    )
+
+            elif command == "metrics":
+                if len(parts) > 1 and parts[1] == "reset":
+                    server_metrics.reset()
+                    print("Métricas reiniciadas.")
+                else:
+                    print(format_metrics(server_metrics.snapshot()))
+
             elif command == "trigger" and len(parts) > 1:
                 event_name = parts[1]
-                print(f"Disparando evento '{event_name}'...")
+                distribution = parts[2] if len(parts) > 2 else TRIGGER_DISTRIBUTION
+                if distribution not in TRIGGER_DISTRIBUTIONS:
+                    print(
+                        f"Reparto '{distribution}' inválido. Opciones: "
+                        f"{', '.join(TRIGGER_DISTRIBUTIONS)}."
+                    )
+                    continue
+                print(f"Disparando evento '{event_name}' (reparto {distribution})...")
 
                 active_clients_for_event = []
                 with state_lock:
@@ -815,12 +1902,7 @@ def server_commands():
                     continue
 
                 try:
-                    all_files = [
-                        f
-                        for f in os.listdir(TEXT_FILES_DIR)
-                        if f.endswith(".txt")
-                        and os.path.isfile(os.path.join(TEXT_FILES_DIR, f))
-                    ]
+                    all_files = list_text_files()
                 except Exception as e:
                     print(f"Error listando archivos para '{event_name}': {e}")
                     continue
@@ -844,21 +1926,46 @@ def server_commands():
                         )
                     continue
 
-                num_clients = len(active_clients_for_event)
-                total_files = len(all_files)
-                start_idx = 0
-                batches_created = 0
-
-                for i, client_sock in enumerate(active_clients_for_event):
-                    files_this_client = total_files // num_clients
-                    if i < (total_files % num_clients):
-                        files_this_client += 1
-
-                    end_idx = start_idx + files_this_client
-                    assigned_files = all_files[start_idx:end_idx]
-                    start_idx = end_idx
+                # Reparto por carga: cada archivo pesa su tamaño y cada cliente
+                # tiene la capacidad de los workers que puede recibir (lo que
+                # pidió, hasta su parte del presupuesto global).
+                with state_lock:
+                    configs = [client_configs.get(s) for s in active_clients_for_event]
+                fair_share = max(1, MAX_TOTAL_WORKERS // len(active_clients_for_event))
+                default_count = DEFAULT_CLIENT_CONFIG["count"]
+                capacities = [
+                    min(max((cfg or {}).get("count", default_count), 1), fair_share)
+                    for cfg in configs
+                ]
+                weights = {name: file_weight(size) for name, size in all_files}
+                partition = partition_files(weights.items(), capacities)
+                predicted = {
+                    sock: throughput_model.predict(units)
+                    for sock, files, units in zip(
+                        active_clients_for_event,
+                        partition.assignments,
+                        partition.finish_units,
+                    )
+                    # En el reparto dinámico todos los clientes tienen lote:
+                    # el que empieza con la cola vacía roba a los demás.
+                    if files or distribution == "dynamic"
+                }
+                if distribution == "dynamic":
+                    trigger_run = TriggerRun(
+                        event_name,
+                        weights,
+                        predicted,
+                        WorkStealingQueues(partition.assignments, weights),
+                        {s: i for i, s in enumerate(active_clients_for_event)},
+                    )
+                else:
+                    trigger_run = TriggerRun(event_name, weights, predicted)
+                new_batches = []
 
-                    if not assigned_files:
+                for client_sock, assigned_files in zip(
+                    active_clients_for_event, partition.assignments
+                ):
+                    if not assigned_files and distribution != "dynamic":
                         send_to_client(
                             client_sock,
                             {
@@ -878,22 +1985,46 @@ def server_commands():
                         client_cfg = client_configs.get(client_sock)
 
                     if client_cfg:
-                        batch = (client_sock, assigned_files, event_name, client_cfg)
-                        with state_lock:
-                            client_batch_processing_queue.append(batch)
-                        batches_created += 1
+                        new_batches.append(
+                            (
+                                client_sock,
+                                assigned_files,
+                                event_name,
+                                client_cfg,
+                                trigger_run,
+                            )
+                        )
                     else:
                         print(
                             f"Cliente {clients.get(client_sock)} ya no tiene config. "
                             "Lote descartado."
                         )
+                        trigger_run.batch_done(
+                            client_sock, "?", assigned_files, [], 1, 0.0
+                        )
 
+                # Los lotes del trigger se encolan juntos, para que el
+                # despachador los registre a la vez (ver
+                # `manage_client_batch_processing`).
+                batches_created = len(new_batches)
                 if batches_created > 0:
+                    with state_lock:
+                        client_batch_processing_queue.extend(new_batches)
                     new_batch_event.set()
                 print(
                     f"{batches_created} lotes para '{event_name}' añadidos "
                     "a cola de procesamiento."
                 )
+                message = (
+                    f"Trigger '{event_name}': {len(all_files)} archivos "
+                    f"({sum(size for _, size in all_files) / 2**20:.1f} MB) "
+                    f"repartidos por carga ({distribution}) entre "
+                    f"{batches_created} clientes "
+                    f"(capacidades {capacities}); makespan previsto "
+                    f"{trigger_run.predicted_makespan:.2f}s."
+                )
+                server_log(message)
+                logging.info(message)
 
             elif command == "exit":
                 print("Cerrando servidor...")
@@ -908,7 +2039,10 @@ def server_commands():
                     time.sleep(0.1)
                     handle_disconnect(sock)
 
-                server_socket.close()
+                worker_pools.shutdown()
+                close_server_socket()
+                dump_metrics()
+                log_pipeline.stop()
                 print("Servidor terminado.")
                 os._exit(0)
 
@@ -929,7 +2063,10 @@ def server_commands():
                 except:
                     pass
                 handle_disconnect(sock)
-            server_socket.close()
+            worker_pools.shutdown()
+            close_server_socket()
+            dump_metrics()
+            log_pipeline.stop()
             os._exit(0)
 
         except Exception as e:
@@ -967,7 +2104,9 @@ def main_server_loop():
             except:
                 pass
             handle_disconnect(sock)
+        worker_pools.shutdown()
         server_socket.close()
+        dump_metrics()
 
     finally:
         if server_socket and not getattr(server_socket, "_closed", True):
@@ -979,6 +2118,42 @@ def main_server_loop():
 
 
 if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(
+        description="Servidor de procesamiento de archivos."
+    )
+    arg_parser.add_argument(
+        "--async",
+        dest="async_mode",
+        action="store_true",
+        help="Atiende las conexiones con asyncio en lugar de un hilo por cliente.",
+    )
+    arg_parser.add_argument("--port", type=int, default=PORT)
+    arg_parser.add_argument(
+        "--distribution",
+        choices=TRIGGER_DISTRIBUTIONS,
+        default=TRIGGER_DISTRIBUTION,
+        help="Reparto por defecto de los archivos de 'trigger'.",
+    )
+    arg_parser.add_argument(
+        "--threads-backend",
+        choices=THREADS_BACKENDS,
+        default=THREADS_BACKEND,
+        help="Cómo se ejecuta el modo 'threads' (hilos, subintérpretes o procesos).",
+    )
+    cli_args = arg_parser.parse_args()
+    PORT = cli_args.port
+    TRIGGER_DISTRIBUTION = cli_args.distribution
+    log_pipeline.start()
+    worker_pools.threads_backend = resolve_threads_backend(cli_args.threads_backend)
+    print(f"[DEBUG] Modo 'threads' ejecutado con: {worker_pools.threads_backend}.")
+    result_cache = open_result_cache()
+
+    if not cli_args.async_mode:
+        create_server_socket()
+
+    index_mode = file_index.start()
+    print(f"[DEBUG] Índice de archivos: {len(file_index)} archivos ({index_mode}).")
+
     # Iniciar hilos de fondo
     command_thread = threading.Thread(target=server_commands, daemon=True)
     command_thread.start()
@@ -989,4 +2164,12 @@ if __name__ == "__main__":
     batch_worker_thread.start()
 
     # Iniciar el bucle principal de aceptación de clientes
-    main_server_loop()
+    if cli_args.async_mode:
+        try:
+            asyncio.run(async_main_server_loop())
+        except KeyboardInterrupt:
+            print("\nCerrando servidor por KeyboardInterrupt...")
+            worker_pools.shutdown()
+            dump_metrics()
+    else:
+        main_server_loop()
@@ -0,0 +1,287 @@
+"""
+Resultados de los workers `forks` a través de memoria compartida.
+
+Con `ProcessPoolExecutor`, cada resultado de `process_single_file_wrapper` (un
+dict con las listas completas de nombres, fechas y lugares) se serializa con
+pickle, viaja por el pipe del pool y el hilo del executor lo vuelve a armar en
+el servidor. Con una `ResultArena`, el worker escribe el resultado en un
+segmento de `multiprocessing.shared_memory` que comparte con el servidor, y
+por el pipe solo devuelve un `SharedResult` (dónde quedó el resultado).
+
+Codificación de un resultado: cada texto se guarda una sola vez, en una tabla
+de textos concatenados; los que se repiten entre listas se guardan como
+índices a esa tabla. El servidor lo decodifica directamente del segmento.
+
+La arena es un buffer circular compartido por todos los workers de un pool:
+un worker reserva espacio al final (con un lock entre procesos) y el servidor
+marca el registro como libre al leerlo. El espacio de los registros más
+viejos ya leídos se reutiliza en la próxima reserva. Si el resultado no entra
+(la arena está llena o el resultado es enorme), o es tan chico que el pipe es
+más barato (`MIN_SHARED_ENTITIES`), viaja por pickle como antes.
+"""
+
+import bisect
+import multiprocessing
+import struct
+from array import array
+from multiprocessing import shared_memory
+from typing import Dict, NamedTuple, Optional, Union
+
+
+# Encabezado de la arena: inicio del registro más viejo, próximo byte libre y
+# bytes en uso (para distinguir arena vacía de llena).
+_HEADER = struct.Struct("<QQQ")
+# Encabezado de cada registro: largo total (múltiplo de 8) y estado.
+_RECORD = struct.Struct("<II")
+_FREE, _LIVE = 0, 1
+# Datos fijos de un resultado: palabras; cantidad de textos, nombres, fechas y
+# lugares; índices de fechas y lugares a la tabla (0 si están en orden después
+# de los nombres); bytes de texto.
+_FIXED = struct.Struct("<Q6I")
+# Separador de los textos de la tabla (no aparece en las entidades extraídas).
+_SEPARATOR = "\0"
+_FIELDS = ("status", "error", "filename", "pid_server")
+_DATA_LISTS = ("nombres_encontrados", "fechas_encontradas", "lugares_encontrados")
+_RESULT_KEYS = {"pid_server", "filename", "data", "status", "error"}
+
+# Resultados con menos entidades que esto viajan por pickle: con pocas, el
+# lock y la escritura en la arena cuestan más que el pipe (ver
+# benchmarks/bench_shared_results.py).
+MIN_SHARED_ENTITIES = 64
+
+# Arenas creadas por este proceso (el servidor), por nombre del segmento.
+_arenas: Dict[str, "ResultArena"] = {}
+# Arena del worker actual (la conecta `attach_worker` al arrancar el worker).
+_worker_arena: Optional["ResultArena"] = None
+
+
+class SharedResult(NamedTuple):
+    """Lo que un worker devuelve por el pipe: dónde quedó su resultado."""
+
+    arena: str  # nombre del segmento de memoria compartida
+    offset: int  # posición del registro dentro de la arena
+
+
+def encode_result(result: Dict) -> Optional[bytes]:
+    """
+    Codifica un resultado de `process_single_file_wrapper`: una tabla de
+    textos separados por `_SEPARATOR` con los nombres, después las fechas y
+    lugares que no estén ya en la tabla, y al final status, error, filename y
+    pid_server. Cada lista viene sin repetidos, pero un texto puede estar en
+    más de una (ej. "New York" es nombre y lugar): en ese caso las fechas y
+    lugares se guardan como índices a la tabla. Devuelve None si algún texto
+    contiene el separador.
+    """
+    data = result["data"]
+    nombres, fechas, lugares = (data[key] for key in _DATA_LISTS)
+    rest = [*fechas, *lugares]
+    texts = list(nombres)
+    refs = array("I")
+    unique = set(rest)
+    if len(unique) == len(rest) and unique.isdisjoint(nombres):
+        texts += rest
+    else:
+        positions: Dict[str, int] = {}
+        for text in rest:
+            position = positions.get(text)
+            if position is None:
+                # Las listas vienen ordenadas: se busca el texto entre los nombres.
+                position = bisect.bisect_left(nombres, text)
+                if position == len(nombres) or nombres[position] != text:
+                    position = len(texts)
+                    texts.append(text)
+                positions[text] = position
+            refs.append(position)
+    texts += [result[key] for key in _FIELDS]
+
+    joined = _SEPARATOR.join(texts)
+    if joined.count(_SEPARATOR) != len(texts) - 1:
+        return None
+    blob = joined.encode("utf-8", "surrogatepass")
+    fixed = _FIXED.pack(
+        data["word_count"],
+        len(texts),
+        len(nombres),
+        len(fechas),
+        len(lugares),
+        len(refs),
+        len(blob),
+    )
+    return b"".join((fixed, refs.tobytes(), blob))
+
+
+def decode_result(buffer, offset: int = 0) -> Dict:
+    """Decodifica un resultado escrito con `encode_result` en `buffer[offset:]`."""
+    words, _, num_nombres, num_fechas, num_lugares, num_refs, blob_size = (
+        _FIXED.unpack_from(buffer, offset)
+    )
+    offset += _FIXED.size
+    refs = array("I")
+    refs.frombytes(buffer[offset : offset + 4 * num_refs])
+    offset += 4 * num_refs
+    blob = bytes(buffer[offset : offset + blob_size])
+    texts = blob.decode("utf-8", "surrogatepass").split(_SEPARATOR)
+    status, error, filename, pid = texts[-4:]
+    if num_refs:
+        rest = list(map(texts.__getitem__, refs))
+    else:
+        rest = texts[num_nombres : num_nombres + num_fechas + num_lugares]
+    return {
+        "pid_server": pid,
+        "filename": filename,
+        "data": {
+            "nombres_encontrados": texts[:num_nombres],
+            "fechas_encontradas": rest[:num_fechas],
+            "lugares_encontrados": rest[num_fechas:],
+            "word_count": words,
+        },
+        "status": status,
+        "error": error,
+    }
+
+
+class ResultArena:
+    """
+    Buffer circular de resultados en memoria compartida (ver el módulo).
+
+    El servidor la crea con `create` y los workers se conectan con `attach`.
+    Solo el servidor la cierra y la borra (`unlink`).
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, lock, owner: bool):
+        self.shm = shm
+        self.lock = lock
+        self.owner = owner
+        self.capacity = (shm.size - _HEADER.size) // 8 * 8
+
+    @classmethod
+    def create(cls, size: int) -> "ResultArena":
+        """Crea una arena de `size` bytes para los resultados."""
+        shm = shared_memory.SharedMemory(create=True, size=_HEADER.size + size)
+        _HEADER.pack_into(shm.buf, 0, 0, 0, 0)
+        arena = cls(shm, multiprocessing.Lock(), owner=True)
+        _arenas[shm.name] = arena
+        return arena
+
+    @classmethod
+    def attach(cls, name: str, lock) -> "ResultArena":
+        """Se conecta a la arena `name` creada por el servidor."""
+        return cls(shared_memory.SharedMemory(name=name), lock, owner=False)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def _allocate(self, length: int) -> Optional[int]:
+        """
+        Reserva `length` bytes contiguos (con el lock tomado). Antes libera
+        los registros más viejos que el servidor ya leyó. Devuelve la
+        posición, o None si no hay lugar.
+        """
+        buffer = self.shm.buf
+        head, tail, used = _HEADER.unpack_from(buffer, 0)
+        while used:
+            size, state = _RECORD.unpack_from(buffer, _HEADER.size + head)
+            if state != _FREE:
+                break
+            head = (head + size) % self.capacity
+            used -= size
+        if not used:
+            head = tail = 0
+
+        if used and tail == head:
+            offset = None  # llena
+        elif tail >= head:
+            if length <= self.capacity - tail:
+                offset = tail
+            elif length <= head:
+                # No entra al final: el resto queda como un registro libre y
+                # se sigue desde el principio.
+                rest = self.capacity - tail
+                _RECORD.pack_into(buffer, _HEADER.size + tail, rest, _FREE)
+                used += rest
+                offset = 0
+            else:
+                offset = None
+        else:
+            offset = tail if length <= head - tail else None
+
+        if offset is not None:
+            _RECORD.pack_into(buffer, _HEADER.size + offset, length, _LIVE)
+            tail = (offset + length) % self.capacity
+            used += length
+        _HEADER.pack_into(buffer, 0, head, tail, used)
+        return offset
+
+    def write(self, result: Dict) -> Optional[SharedResult]:
+        """Escribe `result` en la arena; None si no entra o no se puede codificar."""
+        payload = encode_result(result)
+        if payload is None:
+            return None
+        length = -(-(_RECORD.size + len(payload)) // 8) * 8
+        if length > self.capacity // 2:
+            return None
+        with self.lock:
+            offset = self._allocate(length)
+        if offset is None:
+            return None
+        start = _HEADER.size + offset + _RECORD.size
+        self.shm.buf[start : start + len(payload)] = payload
+        return SharedResult(self.shm.name, offset)
+
+    def read(self, handle: SharedResult) -> Dict:
+        """Lee el resultado de `handle` y libera su registro."""
+        start = _HEADER.size + handle.offset
+        length, _ = _RECORD.unpack_from(self.shm.buf, start)
+        result = decode_result(self.shm.buf, start + _RECORD.size)
+        _RECORD.pack_into(self.shm.buf, start, length, _FREE)
+        return result
+
+    def usage(self) -> int:
+        """
+        Bytes reservados en la arena. Los registros ya leídos se recuperan
+        recién en la próxima reserva.
+        """
+        with self.lock:
+            return _HEADER.unpack_from(self.shm.buf, 0)[2]
+
+    def close(self) -> None:
+        """Cierra la arena y, si la creó este proceso, borra el segmento."""
+        self.shm.close()
+        if self.owner:
+            _arenas.pop(self.shm.name, None)
+            self.shm.unlink()
+
+
+def attach_worker(name: str, lock) -> None:
+    """Inicializador de los workers de un pool: conecta su arena."""
+    global _worker_arena
+    _worker_arena = ResultArena.attach(name, lock)
+
+
+def share_result(
+    result: Dict, min_entities: int = MIN_SHARED_ENTITIES
+) -> Union[Dict, SharedResult]:
+    """
+    En un worker con arena, escribe `result` en ella y devuelve su
+    `SharedResult`. Sin arena (ej. en modo threads), con menos de
+    `min_entities` entidades, o si el resultado no entra o no tiene la forma
+    esperada, devuelve `result` tal cual.
+    """
+    if _worker_arena is None or result.keys() != _RESULT_KEYS:
+        return result
+    try:
+        entities = sum(len(result["data"][key]) for key in _DATA_LISTS)
+        if entities < min_entities:
+            return result
+        handle = _worker_arena.write(result)
+    except (KeyError, TypeError, struct.error, OverflowError):
+        return result
+    return result if handle is None else handle
+
+
+def resolve_result(result: Union[Dict, SharedResult]) -> Dict:
+    """En el servidor: el resultado completo, leído de su arena si hace falta."""
+    if isinstance(result, SharedResult):
+        return _arenas[result.arena].read(result)
+    return result
@@ -0,0 +1,287 @@
+"""
+CLI para correr experimentos de scheduling en lote, sin GUI.
+
+Lee cargas de trabajo (CSV o JSON con llegada, ráfaga y prioridad de cada
+proceso), las simula con cada algoritmo de `AVAILABLE_SCHEDULERS` (o los
+elegidos, con uno o varios quantum para RR y MLFQ) y escribe las métricas promedio
+por algoritmo. Las corridas son independientes y se reparten entre los núcleos
+con un pool de procesos.
+
+No importa tkinter: arranca rápido y corre en máquinas sin pantalla.
+
+Uso (desde la raíz del proyecto):
+    python -m src.simulate carga.csv [otra.json ...] [--algorithms FCFS RR]
+        [--quantum 2 4 8] [--cpus 1 4] [--jobs 4] [--output resultados.csv]
+        [--per-cpu] [--no-steal] [--affinity] [--migration-cost 2]
+
+Formato de las cargas:
+    CSV: encabezado con `arrival` y `burst` (o `arrival_time`, `burst_time`) y,
+         opcionalmente, `priority`, `pid` y `filename`.
+    JSON: lista de objetos con esas mismas claves, o {"processes": [...]}.
+"""
+
+import argparse
+import concurrent.futures
+import csv
+import json
+import os
+import sys
+import time
+
+from .process import Process
+from .scheduler import AVAILABLE_SCHEDULERS
+from .simulator import simulate
+
+
+# Nombres aceptados para cada columna de las cargas de trabajo.
+COLUMN_ALIASES = {
+    "arrival": ("arrival", "arrival_time", "llegada"),
+    "burst": ("burst", "burst_time", "rafaga", "ráfaga"),
+    "priority": ("priority", "prioridad"),
+    "pid": ("pid",),
+    "filename": ("filename", "archivo"),
+}
+
+# Columnas de la tabla de resultados, en orden.
+RESULT_FIELDS = [
+    "workload",
+    "algorithm",
+    "cpus",
+    "num_processes",
+    "avg_turnaround_time",
+    "avg_waiting_time",
+    "avg_response_time",
+    "throughput",
+    "makespan",
+    "cpu_utilization",
+    "migrations",
+    "seconds",
+]
+
+
+class WorkloadError(Exception):
+    """Una carga de trabajo con formato inválido."""
+
+
+def _field(row, name, default=None):
+    for alias in COLUMN_ALIASES[name]:
+        value = row.get(alias)
+        if value not in (None, ""):
+            return value
+    return default
+
+
+def parse_rows(rows, source):
+    """
+    Convierte filas (dicts) en tuplas (pid, filename, arrival, burst, priority).
+
+    Se usan tuplas, y no objetos `Process`, para que viajen baratas a los
+    procesos del pool.
+    """
+    processes = []
+    for index, row in enumerate(rows):
+        try:
+            arrival = int(_field(row, "arrival"))
+            burst = int(_field(row, "burst"))
+            priority = int(_field(row, "priority", 0))
+            pid = int(_field(row, "pid", index + 1))
+        except (TypeError, ValueError):
+            raise WorkloadError(
+                f"{source}, proceso {index + 1}: se esperan enteros en "
+                f"arrival, burst y priority ({row!r})."
+            ) from None
+        if burst <= 0 or arrival < 0:
+            raise WorkloadError(
+                f"{source}, proceso {index + 1}: burst debe ser positivo y "
+                f"arrival no negativo."
+            )
+        filename = str(_field(row, "filename", f"proc_{pid}"))
+        processes.append((pid, filename, arrival, burst, priority))
+    return processes
+
+
+def load_workload(path):
+    """Lee una carga de trabajo CSV o JSON (según la extensión)."""
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.lower().endswith(".json"):
+            try:
+                data = json.load(f)
+            except json.JSONDecodeError as e:
+                raise WorkloadError(f"{path}: JSON inválido ({e}).") from None
+            rows = data.get("processes", []) if isinstance(data, dict) else data
+        else:
+            rows = list(csv.DictReader(f))
+    if not rows:
+        raise WorkloadError(f"{path}: no tiene procesos.")
+    return parse_rows(rows, path)
+
+
+def scheduler_configs(algorithms, quanta):
+    """
+    Lista de (etiqueta, nombre, kwargs) a simular. RR y MLFQ (cuyo quantum es
+    el del nivel 0) se simulan una vez por quantum.
+    """
+    configs = []
+    for name in algorithms:
+        if name in ("RR", "MLFQ"):
+            for quantum in quanta:
+                configs.append((f"{name}(q={quantum})", name, {"quantum": quantum}))
+        else:
+            configs.append((name, name, {}))
+    return configs
+
+
+def run_experiment(
+    workload_name, rows, label, algorithm, kwargs, num_cpus, options=None
+):
+    """
+    Una corrida: simula la carga con un algoritmo y devuelve sus métricas.
+    `options` son argumentos extra de `simulate()` (colas por CPU, afinidad...).
+    """
+    processes = [Process(*row) for row in rows]
+    scheduler = AVAILABLE_SCHEDULERS[algorithm](**kwargs)
+    start = time.perf_counter()
+    result = simulate(
+        processes, scheduler, num_cpus, record_events=False, **(options or {})
+    )
+    elapsed = time.perf_counter() - start
+
+    row = {"workload": workload_name, "algorithm": label, "cpus": num_cpus}
+    for field in RESULT_FIELDS[3:-1]:
+        row[field] = result.metrics.get(field, 0)
+    row["seconds"] = elapsed
+    return row
+
+
+def run_all(experiments, jobs):
+    """
+    Corre las simulaciones, en paralelo si `jobs` > 1, y devuelve sus
+    resultados en el mismo orden que `experiments`.
+    """
+    if jobs <= 1 or len(experiments) <= 1:
+        return [run_experiment(*experiment) for experiment in experiments]
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(run_experiment, *exp) for exp in experiments]
+        return [future.result() for future in futures]
+
+
+def format_table(results):
+    """Tabla de texto con los resultados, una fila por corrida."""
+    header = (
+        f"{'carga':<20} {'algoritmo':<12} {'cpus':>4} {'procesos':>9} "
+        f"{'turnaround':>11} {'espera':>9} {'respuesta':>10} "
+        f"{'throughput':>10} {'uso CPU':>8} {'migr':>6} {'seg':>7}"
+    )
+    lines = [header, "-" * len(header)]
+    for row in results:
+        lines.append(
+            f"{row['workload'][:20]:<20} {row['algorithm']:<12} {row['cpus']:>4} "
+            f"{row['num_processes']:>9} {row['avg_turnaround_time']:>11.2f} "
+            f"{row['avg_waiting_time']:>9.2f} {row['avg_response_time']:>10.2f} "
+            f"{row['throughput']:>10.4f} {row['cpu_utilization']:>8.1%} "
+            f"{row['migrations']:>6} {row['seconds']:>7.2f}"
+        )
+    return "\n".join(lines)
+
+
+def write_results(results, path):
+    """Escribe los resultados en CSV o JSON, según la extensión de `path`."""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        if path.lower().endswith(".json"):
+            json.dump(results, f, indent=2)
+        else:
+            writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS)
+            writer.writeheader()
+            writer.writerows(results)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m src.simulate",
+        description="Compara algoritmos de scheduling sobre cargas de trabajo.",
+    )
+    parser.add_argument("workloads", nargs="+", help="Archivos CSV o JSON")
+    parser.add_argument(
+        "--algorithms",
+        nargs="+",
+        choices=list(AVAILABLE_SCHEDULERS),
+        default=list(AVAILABLE_SCHEDULERS),
+        metavar="ALGORITMO",
+        help="Algoritmos a simular (por defecto todos)",
+    )
+    parser.add_argument(
+        "--quantum", nargs="+", type=int, default=[2], help="Quantum(s) para RR y MLFQ"
+    )
+    parser.add_argument(
+        "--cpus", nargs="+", type=int, default=[1], help="Cantidad(es) de CPUs"
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Procesos en paralelo (1 = sin pool)",
+    )
+    parser.add_argument("--per-cpu", action="store_true", help="Una cola Ready por CPU")
+    parser.add_argument(
+        "--no-steal",
+        action="store_true",
+        help="Con --per-cpu, un CPU libre no roba de otras colas",
+    )
+    parser.add_argument(
+        "--affinity",
+        action="store_true",
+        help="Cada proceso vuelve al último CPU en que corrió",
+    )
+    parser.add_argument(
+        "--migration-cost",
+        type=int,
+        default=0,
+        help="Tiempo perdido por un proceso al cambiar de CPU",
+    )
+    parser.add_argument(
+        "--output", help="Guarda los resultados en un archivo .csv o .json"
+    )
+    args = parser.parse_args(argv)
+
+    if any(q <= 0 for q in args.quantum) or any(c <= 0 for c in args.cpus):
+        parser.error("--quantum y --cpus deben ser enteros positivos.")
+    if args.migration_cost < 0:
+        parser.error("--migration-cost no puede ser negativo.")
+    options = {
+        "per_cpu_queues": args.per_cpu,
+        "work_stealing": not args.no_steal,
+        "affinity": args.affinity,
+        "migration_cost": args.migration_cost,
+    }
+
+    try:
+        workloads = [(path, load_workload(path)) for path in args.workloads]
+    except (OSError, WorkloadError) as e:
+        print(f"Error leyendo la carga de trabajo: {e}", file=sys.stderr)
+        return 1
+
+    experiments = [
+        (os.path.basename(path), rows, label, algorithm, kwargs, num_cpus, options)
+        for path, rows in workloads
+        for num_cpus in args.cpus
+        for label, algorithm, kwargs in scheduler_configs(args.algorithms, args.quantum)
+    ]
+
+    start = time.perf_counter()
+    results = run_all(experiments, args.jobs)
+    elapsed = time.perf_counter() - start
+
+    print(format_table(results))
+    print(
+        f"\n{len(results)} simulaciones en {elapsed:.2f}s "
+        f"(--jobs {min(args.jobs, len(results))})"
+    )
+    if args.output:
+        write_results(results, args.output)
+        print(f"Resultados guardados en {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
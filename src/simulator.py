@@ -0,0 +1,622 @@
+"""
+Motor de simulación de scheduling, independiente de la GUI.
+
+En lugar de avanzar de a un tick, la simulación salta directamente entre
+eventos: llegadas, finalizaciones, vencimientos de quantum y preempciones.
+El resultado incluye la línea de tiempo completa (segmentos por CPU y eventos)
+y las métricas, de modo que la GUI solo tiene que reproducirla.
+
+Con FCFS, SJF o Priority_NP en un solo CPU no hace falta el motor por eventos:
+la planificación completa es un orden de despacho seguido de una suma
+acumulada de ráfagas, que se calcula con numpy si está instalado (ver
+`_simulate_single_cpu`).
+
+Uso:
+    result = simulate(processes, SchedulerRR(quantum=2), num_cpus=2)
+    result.metrics["avg_waiting_time"]
+"""
+
+import bisect
+import heapq
+from typing import Dict, List, NamedTuple, Optional
+
+try:
+    import numpy as np
+except ImportError:  # numpy es opcional: sin él, el camino rápido usa un bucle
+    np = None
+
+from .process import Process
+from .scheduler import (
+    SchedulerBase,
+    SchedulerFCFS,
+    SchedulerPriorityNP,
+    SchedulerSJF,
+)
+
+
+# Tipos de evento de la línea de tiempo.
+EVENT_ARRIVAL = "arrival"  # el proceso entra a la cola Ready
+EVENT_DISPATCH = "dispatch"  # el proceso empieza a correr en un CPU
+EVENT_PREEMPT = "preempt"  # vence su quantum o lo desaloja otro; vuelve a Ready
+EVENT_COMPLETE = "complete"  # termina su ráfaga
+
+# Schedulers no preemptivos cuya clave depende solo de atributos fijos del
+# proceso: en un CPU, cada uno corre su ráfaga completa, uno tras otro.
+_FAST_PATH_SCHEDULERS = (SchedulerFCFS, SchedulerSJF, SchedulerPriorityNP)
+
+
+class TimelineSegment(NamedTuple):
+    """Intervalo [start, end) en que un proceso corrió en un CPU."""
+
+    pid: int
+    cpu: int
+    start: int
+    end: int
+
+
+class SimulationEvent(NamedTuple):
+    time: int
+    kind: str
+    pid: int
+    cpu: int  # -1 para las llegadas
+
+
+class SimulationResult(NamedTuple):
+    timeline: List[TimelineSegment]
+    events: List[SimulationEvent]
+    processes: List[Process]  # en orden de finalización
+    metrics: Dict[str, float]
+
+
+class _Running:
+    """
+    Proceso corriendo en un CPU, con el inicio de su tramo actual.
+
+    `penalty` es el costo de migración del tramo: las primeras unidades el
+    proceso ocupa el CPU sin avanzar (recalienta la caché del nuevo CPU). El
+    quantum empieza a contar después, para que un costo mayor que el quantum
+    no deje al proceso migrando sin avanzar nunca.
+    """
+
+    __slots__ = (
+        "process",
+        "slice_start",
+        "remaining_at_start",
+        "penalty",
+        "completion",
+        "slice_end",
+        "next_event",
+    )
+
+    def __init__(self, process, now, time_slice, penalty=0):
+        self.process = process
+        self.slice_start = now
+        self.remaining_at_start = process.remaining_burst_time
+        self.penalty = penalty
+        self.completion = now + penalty + self.remaining_at_start
+        self.slice_end = now + penalty + time_slice if time_slice else None
+        if self.slice_end is not None and self.slice_end < self.completion:
+            self.next_event = self.slice_end
+        else:
+            self.next_event = self.completion
+
+
+def reset_process(process: Process):
+    """Deja un proceso como recién creado, para poder simularlo de nuevo."""
+    process.remaining_burst_time = process.burst_time
+    process.start_time = -1
+    process.completion_time = -1
+    process.waiting_time = 0
+    process.turnaround_time = 0
+    process.ticks_in_current_burst = 0
+    process.queue_level = 0
+    process.last_cpu = -1
+    process.state = "New"
+
+
+def simulate(
+    processes: List[Process],
+    scheduler: SchedulerBase,
+    num_cpus: int = 1,
+    record_events: bool = True,
+    fast_path: bool = True,
+    per_cpu_queues: bool = False,
+    work_stealing: bool = True,
+    affinity: bool = False,
+    migration_cost: int = 0,
+) -> SimulationResult:
+    """
+    Simula la ejecución de `processes` con `scheduler` en `num_cpus` CPUs.
+
+    Los objetos `Process` se modifican: al terminar tienen `start_time`,
+    `completion_time`, `turnaround_time`, `waiting_time` y `state` finales.
+
+    En cada instante con eventos, el orden es: finalizaciones y vencimientos de
+    quantum (el proceso vuelve a la cola), llegadas, despacho a los CPUs
+    libres (del menor al mayor) y preempciones (si el scheduler es preemptivo).
+
+    Por defecto hay una sola cola Ready para todos los CPUs. Con
+    `per_cpu_queues`, cada CPU tiene la suya: los procesos que llegan van a
+    la del CPU menos cargado, y un CPU sin trabajo le roba uno a la cola más
+    larga (`work_stealing`). Un proceso que corre en un CPU distinto del
+    último en que corrió migra, y paga `migration_cost` unidades de tiempo.
+
+    Args:
+        processes: Procesos a simular (arrival_time y burst_time enteros).
+        scheduler: Cualquier `SchedulerBase`. Se usan `schedule()`,
+                   `time_slice()` y, si `scheduler.preemptive`, `sort_key()`.
+        num_cpus: Cantidad de CPUs simulados.
+        record_events: Si es False, no se guarda la lista de eventos (ahorra
+                       memoria con cargas grandes; la línea de tiempo sí).
+        fast_path: Con FCFS, SJF o Priority_NP y un solo CPU, calcula el
+                   resultado sin el motor por eventos. Con False se usa siempre
+                   el motor (para comparar ambos).
+        per_cpu_queues: Una cola Ready por CPU en lugar de una global.
+        work_stealing: Con colas por CPU, un CPU libre con su cola vacía toma
+                       el próximo proceso de la cola más larga.
+        affinity: Un proceso vuelve al último CPU en que corrió: a su cola
+                  (con colas por CPU) o a ese CPU si está libre (cola global).
+        migration_cost: Tiempo que un proceso ocupa el CPU sin avanzar cada vez
+                        que corre en un CPU distinto del anterior.
+
+    Returns:
+        SimulationResult con la línea de tiempo, los eventos, los procesos en
+        orden de finalización y las métricas (ver `compute_metrics`).
+    """
+    if num_cpus <= 0:
+        raise ValueError("num_cpus debe ser un entero positivo.")
+    if migration_cost < 0:
+        raise ValueError("migration_cost no puede ser negativo.")
+
+    pending = sorted(processes, key=lambda p: p.arrival_time)
+    for process in pending:
+        reset_process(process)
+    if fast_path and num_cpus == 1 and pending:
+        if type(scheduler) in _FAST_PATH_SCHEDULERS:
+            return _simulate_single_cpu(pending, scheduler, record_events)
+
+    if per_cpu_queues:
+        queues = [scheduler.create_ready_queue() for _ in range(num_cpus)]
+    else:
+        ready = scheduler.create_ready_queue()
+    running: List[Optional[_Running]] = [None] * num_cpus
+    # CPUs libres, ordenados: se usa siempre el más bajo.
+    free_cpus = list(range(num_cpus))
+    # Heap de (próximo evento, CPU) de los procesos en ejecución. Las entradas
+    # de tramos ya cortados quedan en el heap y se descartan al llegar arriba.
+    upcoming = []
+    timeline: List[TimelineSegment] = []
+    # Inicio del tramo en curso de cada CPU, y último tramo terminado todavía
+    # sin agregar a `timeline`: si el mismo proceso vuelve a ese CPU en el mismo
+    # instante (ej. vence su quantum y la cola está vacía), el tramo se extiende.
+    segment_start = [0] * num_cpus
+    last_segment: List[Optional[TimelineSegment]] = [None] * num_cpus
+    events: List[SimulationEvent] = []
+    completed: List[Process] = []
+    preemptive = getattr(scheduler, "preemptive", False)
+    migration_time = 0
+
+    if per_cpu_queues:
+        # Largo de cada cola y total en cola, para no recorrer todos los CPUs
+        # en cada evento: `longest` y `lightest` son heaps de (-largo, CPU) y
+        # (carga, CPU) con una entrada vigente por CPU (las viejas se descartan
+        # al llegar arriba) y `nonempty` son los CPUs con cola no vacía.
+        queue_len = [0] * num_cpus
+        queued = 0
+        nonempty = set()
+        longest = [(0, cpu) for cpu in range(num_cpus)]
+        lightest = [(0, cpu) for cpu in range(num_cpus)]
+        heap_limit = 4 * num_cpus + 64
+
+    def log(time, kind, pid, cpu):
+        if record_events:
+            events.append(SimulationEvent(time, kind, pid, cpu))
+
+    def stop(cpu, now):
+        """Saca el proceso del CPU, cierra su tramo y devuelve el proceso."""
+        nonlocal migration_time
+        slot = running[cpu]
+        running[cpu] = None
+        bisect.insort(free_cpus, cpu)
+        if per_cpu_queues:
+            refresh(cpu)
+        process = _current(slot, now)
+        elapsed = now - slot.slice_start
+        paid = min(slot.penalty, elapsed)
+        migration_time += paid
+        process.ticks_in_current_burst = elapsed - paid
+        last_segment[cpu] = TimelineSegment(process.pid, cpu, segment_start[cpu], now)
+        return process
+
+    def take_cpu(cpu):
+        """Saca `cpu` de los CPUs libres."""
+        del free_cpus[bisect.bisect_left(free_cpus, cpu)]
+        return cpu
+
+    def refresh(cpu):
+        """Registra el largo de la cola y la carga de `cpu` después de un cambio."""
+        nonlocal queued
+        size = len(queues[cpu])
+        queued += size - queue_len[cpu]
+        queue_len[cpu] = size
+        if size:
+            nonempty.add(cpu)
+        else:
+            nonempty.discard(cpu)
+        if len(longest) > heap_limit:
+            longest[:] = [(-queue_len[c], c) for c in range(num_cpus)]
+            heapq.heapify(longest)
+        if len(lightest) > heap_limit:
+            lightest[:] = [(load(c), c) for c in range(num_cpus)]
+            heapq.heapify(lightest)
+        heapq.heappush(longest, (-size, cpu))
+        heapq.heappush(lightest, (load(cpu), cpu))
+
+    def load(cpu):
+        return queue_len[cpu] + (running[cpu] is not None)
+
+    def longest_queue():
+        """CPU con la cola más larga; empata el más bajo."""
+        while queue_len[longest[0][1]] != -longest[0][0]:
+            heapq.heappop(longest)
+        return longest[0][1]
+
+    def least_loaded():
+        """CPU con menos trabajo (cola + el que corre); empata el más bajo."""
+        while load(lightest[0][1]) != lightest[0][0]:
+            heapq.heappop(lightest)
+        return lightest[0][1]
+
+    def enqueue(process):
+        """Pone un proceso en Ready: la cola global o la de algún CPU."""
+        process.state = "Ready"
+        if not per_cpu_queues:
+            ready.push(process)
+            return
+        if affinity and process.last_cpu >= 0:
+            cpu = process.last_cpu
+        else:
+            cpu = least_loaded()
+        queues[cpu].push(process)
+        refresh(cpu)
+
+    def dispatch(cpu, process, now):
+        migrates = process.last_cpu >= 0 and process.last_cpu != cpu
+        penalty = migration_cost if migrates else 0
+        slot = running[cpu] = _Running(
+            process, now, scheduler.time_slice(process), penalty
+        )
+        heapq.heappush(upcoming, (slot.next_event, cpu))
+        if per_cpu_queues:
+            refresh(cpu)
+        process.last_cpu = cpu
+        process.state = "Running"
+        if process.start_time == -1:
+            process.start_time = now
+        previous = last_segment[cpu]
+        if previous is not None:
+            last_segment[cpu] = None
+            if previous.pid == process.pid and previous.end == now:
+                segment_start[cpu] = previous.start
+            else:
+                timeline.append(previous)
+                segment_start[cpu] = now
+        else:
+            segment_start[cpu] = now
+        log(now, EVENT_DISPATCH, process.pid, cpu)
+
+    now = 0
+    next_arrival = 0
+    while True:
+        # 1. Finalizaciones y vencimientos de quantum en `now`, del CPU más
+        # bajo al más alto.
+        while upcoming and upcoming[0][0] == now:
+            cpu = heapq.heappop(upcoming)[1]
+            slot = running[cpu]
+            if slot is None or slot.next_event != now:
+                continue
+            process = stop(cpu, now)
+            if slot.completion == now:
+                process.state = "Terminated"
+                process.completion_time = now
+                process.turnaround_time = now - process.arrival_time
+                process.waiting_time = process.turnaround_time - process.burst_time
+                completed.append(process)
+                log(now, EVENT_COMPLETE, process.pid, cpu)
+            else:
+                enqueue(process)
+                log(now, EVENT_PREEMPT, process.pid, cpu)
+
+        # 2. Llegadas.
+        while next_arrival < len(pending) and pending[next_arrival].arrival_time <= now:
+            process = pending[next_arrival]
+            next_arrival += 1
+            enqueue(process)
+            log(now, EVENT_ARRIVAL, process.pid, -1)
+
+        # 3. Despacho a los CPUs libres.
+        if per_cpu_queues:
+            # Cada CPU libre toma de su cola o, si está vacía, de la más larga.
+            if work_stealing or len(free_cpus) <= len(nonempty):
+                candidates = list(free_cpus)
+            else:
+                candidates = sorted(cpu for cpu in nonempty if running[cpu] is None)
+            for cpu in candidates:
+                if not queued:
+                    break
+                if queue_len[cpu]:
+                    source = cpu
+                elif work_stealing:
+                    source = longest_queue()
+                else:
+                    continue
+                running_now = [slot.process for slot in running if slot is not None]
+                process = scheduler.schedule(
+                    queues[source], now, running_now, len(free_cpus)
+                )
+                refresh(source)
+                if process is not None:
+                    dispatch(take_cpu(cpu), process, now)
+        else:
+            while free_cpus and ready:
+                running_now = [slot.process for slot in running if slot is not None]
+                process = scheduler.schedule(ready, now, running_now, len(free_cpus))
+                if process is None:
+                    break
+                last_cpu = process.last_cpu
+                if affinity and last_cpu >= 0 and running[last_cpu] is None:
+                    cpu = take_cpu(last_cpu)
+                else:
+                    cpu = free_cpus.pop(0)
+                dispatch(cpu, process, now)
+
+        # 4. Preempción: si quedan procesos en la cola con todos los CPUs
+        # ocupados, el mejor de la cola desaloja al peor en ejecución. Con
+        # colas por CPU, cada CPU compara su proceso con su propia cola.
+        if preemptive and per_cpu_queues:
+            for cpu in sorted(nonempty):
+                slot, queue = running[cpu], queues[cpu]
+                if slot is None:
+                    continue
+                current = _current(slot, now)
+                if not scheduler.sort_key(queue.peek()) < scheduler.sort_key(current):
+                    continue
+                process = stop(cpu, now)
+                process.state = "Ready"
+                queue.push(process)
+                log(now, EVENT_PREEMPT, process.pid, cpu)
+                dispatch(take_cpu(cpu), queue.pop(), now)
+        elif preemptive:
+            while ready and not free_cpus:
+                worst_cpu = max(
+                    range(num_cpus),
+                    key=lambda c: scheduler.sort_key(_current(running[c], now)),
+                )
+                worst = running[worst_cpu].process
+                if not scheduler.sort_key(ready.peek()) < scheduler.sort_key(worst):
+                    break
+                process = stop(worst_cpu, now)
+                process.state = "Ready"
+                ready.push(process)
+                log(now, EVENT_PREEMPT, process.pid, worst_cpu)
+                dispatch(free_cpus.pop(0), ready.pop(), now)
+
+        # 5. Siguiente evento.
+        while upcoming:
+            event_time, cpu = upcoming[0]
+            slot = running[cpu]
+            if slot is not None and slot.next_event == event_time:
+                break
+            heapq.heappop(upcoming)
+        next_time = upcoming[0][0] if upcoming else None
+        if next_arrival < len(pending):
+            arrival_time = pending[next_arrival].arrival_time
+            if next_time is None or arrival_time < next_time:
+                next_time = arrival_time
+        if next_time is None:
+            break
+        now = next_time
+
+    timeline.extend(segment for segment in last_segment if segment is not None)
+    timeline.sort(key=lambda segment: (segment.start, segment.cpu))
+    metrics = compute_metrics(completed, timeline, num_cpus)
+    if completed:
+        metrics["migration_time"] = migration_time
+    return SimulationResult(timeline, events, completed, metrics)
+
+
+def _current(slot, now):
+    """Actualiza el restante de un proceso en ejecución al instante `now`."""
+    process = slot.process
+    progress = now - slot.slice_start - slot.penalty
+    if progress > 0:
+        process.remaining_burst_time = slot.remaining_at_start - progress
+    else:
+        process.remaining_burst_time = slot.remaining_at_start
+    return process
+
+
+def _simulate_single_cpu(pending, scheduler, record_events):
+    """
+    `simulate()` para un scheduler no preemptivo de clave fija en un CPU.
+
+    Da el mismo resultado que el motor por eventos (`pending` viene ordenado
+    por llegada, que es también el orden de inserción en la cola Ready).
+    """
+    completed = [pending[i] for i in _dispatch_order(pending, scheduler)]
+    starts, completions = _run_in_order(
+        [p.arrival_time for p in completed], [p.burst_time for p in completed]
+    )
+
+    timeline, turnarounds, waitings = [], [], []
+    for process, start, end in zip(completed, starts, completions):
+        process.start_time = start
+        process.completion_time = end
+        process.turnaround_time = end - process.arrival_time
+        process.waiting_time = process.turnaround_time - process.burst_time
+        process.remaining_burst_time = 0
+        process.ticks_in_current_burst = process.burst_time
+        process.last_cpu = 0
+        process.state = "Terminated"
+        timeline.append(TimelineSegment(process.pid, 0, start, end))
+        turnarounds.append(process.turnaround_time)
+        waitings.append(process.waiting_time)
+
+    events = []
+    if record_events:
+        # Mismo orden que el motor: en cada instante, la finalización, luego
+        # las llegadas y por último el despacho.
+        arrival_times = [p.arrival_time for p in pending]
+        arrivals = [
+            SimulationEvent(p.arrival_time, EVENT_ARRIVAL, p.pid, -1) for p in pending
+        ]
+        logged = 0
+        for process, start, end in zip(completed, starts, completions):
+            upto = bisect.bisect_right(arrival_times, start, logged)
+            events.extend(arrivals[logged:upto])
+            events.append(SimulationEvent(start, EVENT_DISPATCH, process.pid, 0))
+            logged = bisect.bisect_left(arrival_times, end, upto)
+            events.extend(arrivals[upto:logged])
+            events.append(SimulationEvent(end, EVENT_COMPLETE, process.pid, 0))
+
+    # Sin preempción, el tiempo de respuesta es el de espera.
+    metrics = _metrics(
+        turnarounds,
+        waitings,
+        waitings,
+        pending[0].arrival_time,
+        completions[-1],
+        sum(p.burst_time for p in completed),
+        len(timeline),
+        0,
+        1,
+    )
+    metrics["migration_time"] = 0
+    return SimulationResult(timeline, events, completed, metrics)
+
+
+def _dispatch_order(pending, scheduler):
+    """
+    Índices de `pending` en el orden en que se despachan en un CPU.
+
+    FCFS despacha en orden de llegada. SJF y Priority_NP eligen, al terminar
+    cada proceso, el de menor clave entre los que ya llegaron (desempatando por
+    orden de llegada), así que el orden sale de una pasada con un heap.
+    """
+    if type(scheduler) is SchedulerFCFS:
+        return range(len(pending))
+
+    # Posición de cada proceso ordenando por (clave, llegada): el heap guarda
+    # enteros, que se comparan mucho más rápido que las claves (tuplas).
+    by_rank = sorted(range(len(pending)), key=lambda i: scheduler.sort_key(pending[i]))
+    rank = [0] * len(pending)
+    for position, index in enumerate(by_rank):
+        rank[index] = position
+
+    arrivals = [p.arrival_time for p in pending]
+    order, heap = [], []
+    now = next_arrival = 0
+    while len(order) < len(pending):
+        if not heap and arrivals[next_arrival] > now:
+            now = arrivals[next_arrival]  # CPU ocioso
+        while next_arrival < len(pending) and arrivals[next_arrival] <= now:
+            heapq.heappush(heap, rank[next_arrival])
+            next_arrival += 1
+        index = by_rank[heapq.heappop(heap)]
+        order.append(index)
+        now += pending[index].burst_time
+    return order
+
+
+def _run_in_order(arrivals, bursts):
+    """
+    Inicio y fin de cada proceso si corren uno tras otro en ese orden.
+
+    fin[i] = max(fin[i-1], llegada[i]) + ráfaga[i]. Con S[i] la suma acumulada
+    de ráfagas, fin[i] = S[i] + max(0, max_{j<=i} (llegada[j] - S[j-1])): una
+    suma y un máximo acumulados, que con numpy se calculan sin bucle.
+    """
+    if np is not None:
+        burst = np.asarray(bursts)
+        total = np.cumsum(burst)
+        offset = np.maximum.accumulate(np.asarray(arrivals) - (total - burst))
+        completion = total + np.maximum(offset, 0)
+        return (completion - burst).tolist(), completion.tolist()
+
+    starts, completions = [], []
+    now = 0
+    for arrival, burst in zip(arrivals, bursts):
+        if arrival > now:
+            now = arrival
+        starts.append(now)
+        now += burst
+        completions.append(now)
+    return starts, completions
+
+
+def compute_metrics(
+    completed: List[Process], timeline: List[TimelineSegment], num_cpus: int
+) -> Dict[str, float]:
+    """
+    Métricas de una simulación terminada.
+
+    Returns:
+        dict con num_processes, makespan, avg/max turnaround, avg/max waiting,
+        avg_response_time, throughput (procesos por unidad de tiempo),
+        cpu_utilization (0 a 1), context_switches (despachos) y migrations
+        (tramos de un proceso en un CPU distinto del de su tramo anterior).
+    """
+    if not completed:
+        return {"num_processes": 0}
+    return _metrics(
+        [p.turnaround_time for p in completed],
+        [p.waiting_time for p in completed],
+        [p.start_time - p.arrival_time for p in completed],
+        min(p.arrival_time for p in completed),
+        max(p.completion_time for p in completed),
+        sum(segment.end - segment.start for segment in timeline),
+        len(timeline),
+        _count_migrations(timeline),
+        num_cpus,
+    )
+
+
+def _count_migrations(timeline):
+    """Tramos de un proceso en un CPU distinto del de su tramo anterior."""
+    last_cpu = {}
+    migrations = 0
+    for segment in timeline:
+        previous = last_cpu.get(segment.pid)
+        if previous is not None and previous != segment.cpu:
+            migrations += 1
+        last_cpu[segment.pid] = segment.cpu
+    return migrations
+
+
+def _metrics(
+    turnarounds,
+    waitings,
+    responses,
+    first_arrival,
+    makespan,
+    busy_time,
+    context_switches,
+    migrations,
+    num_cpus,
+):
+    """Arma el diccionario de `compute_metrics` a partir de listas y totales."""
+    count = len(turnarounds)
+    span = makespan - first_arrival
+    return {
+        "num_processes": count,
+        "makespan": makespan,
+        "avg_turnaround_time": sum(turnarounds) / count,
+        "max_turnaround_time": max(turnarounds),
+        "avg_waiting_time": sum(waitings) / count,
+        "max_waiting_time": max(waitings),
+        "avg_response_time": sum(responses) / count,
+        "throughput": count / span if span else float(count),
+        "cpu_utilization": busy_time / (span * num_cpus) if span else 1.0,
+        "context_switches": context_switches,
+        "migrations": migrations,
+    }
@@ -0,0 +1,249 @@
+"""
+Tareas que ejecutan los workers de los pools del servidor.
+
+Los pools de procesos y de subintérpretes reciben las funciones por referencia
+(módulo y nombre) y cada worker importa su módulo. Por eso este módulo no hace
+nada al importarse: sin registro, caché, índice de archivos ni pools; eso
+queda en `server`, que solo se importa en el proceso principal.
+"""
+
+import logging
+import os
+import sys
+import threading
+import time
+from .extractor_regex import parse_file_regex as parse_file
+from .extractor_regex import parse_file_regex_streaming as parse_file_streaming
+from .extractor_regex import parse_file_regex_mmap as parse_file_mmap
+from .extractor_regex import parse_file_regex_range as parse_file_range
+from .result_cache import content_digest
+from .shared_results import attach_worker, share_result
+from .log_pipeline import attach_interpreter_logging, attach_worker_logging
+from .log_pipeline import console as worker_console
+
+
+# Archivos más grandes que este umbral se procesan por bloques (streaming)
+# para que la memoria de cada worker no crezca con el tamaño del archivo.
+STREAMING_THRESHOLD_BYTES = 64 * 1024 * 1024
+# A partir de este tamaño (y hasta el umbral de streaming) se busca con patrones
+# de bytes sobre un mmap del archivo, sin decodificarlo ni copiarlo a memoria.
+MMAP_THRESHOLD_BYTES = 256 * 1024
+
+
+def select_extractor(filepath):
+    """Elige el extractor (completo, mmap o por bloques) según el tamaño del archivo."""
+    try:
+        size = os.path.getsize(filepath)
+    except OSError:
+        return parse_file
+    if size > STREAMING_THRESHOLD_BYTES:
+        return parse_file_streaming
+    if size >= MMAP_THRESHOLD_BYTES:
+        return parse_file_mmap
+    return parse_file
+
+
+def process_single_file_wrapper(arg_tuple, timings=None, digest=None):
+    """
+    Wrapper para procesar un solo archivo, adaptado para ThreadPool y ProcessPool.
+    Muestra el PID del worker (hilo o proceso) al inicio y al final. Si se pasa
+    el dict `timings`, guarda en él el worker y los tiempos de lectura y regex.
+    Si se pasa `digest`, el extractor lo actualiza con el contenido del archivo
+    (no se usa con rangos: ningún worker lee el archivo completo).
+
+    Devuelve el resultado en el formato del cliente (`client_result`), salvo
+    para un rango de bytes: ese vuelve crudo, con `pid_server`, para unirlo
+    con los demás rangos en `merge_range_results`.
+    """
+    filepath, processing_mode = arg_tuple[:2]
+    byte_range = arg_tuple[2] if len(arg_tuple) > 2 else None
+    filename_base = os.path.basename(filepath)
+    range_label = f" (bytes {byte_range[0]}-{byte_range[1]})" if byte_range else ""
+
+    pid_label = ""
+    worker_id_str = ""
+
+    if processing_mode == "threads":
+        # ID del hilo en el sistema operativo: distinto entre workers aunque
+        # el modo "threads" se ejecute con subintérpretes o procesos.
+        pid_label = "THREAD ID"
+        worker_id_str = str(threading.get_native_id())
+    elif processing_mode == "forks":
+        pid_label = "FORK PID"
+        worker_id_str = str(os.getpid())
+    else:
+        pid_label = "UNKNOWN WORKER ID"
+        worker_id_str = "N/A"
+
+    descriptive_worker_id = f"{pid_label}_{worker_id_str}"
+    if timings is not None:
+        timings["worker"] = descriptive_worker_id
+
+    worker_console.info(
+        f"[{pid_label}: {worker_id_str}] Iniciando procesamiento de: "
+        f"{filename_base}{range_label}"
+    )
+
+    logging.info(
+        f"[{descriptive_worker_id}] Iniciando procesamiento de archivo: "
+        f"{filepath}{range_label}"
+    )
+
+    try:
+        if byte_range is not None:
+            raw_result_from_extractor = parse_file_range(
+                filepath, descriptive_worker_id, *byte_range, timings=timings
+            )
+        else:
+            extractor = select_extractor(filepath)
+            raw_result_from_extractor = extractor(
+                filepath, pid=descriptive_worker_id, timings=timings, digest=digest
+            )
+
+        logging.info(
+            f"[{descriptive_worker_id}] Datos extraídos de "
+            f"{filename_base}{range_label}: "
+            f"Nombres: {len(raw_result_from_extractor.get('Nombres', []))}, "
+            f"Fechas: {len(raw_result_from_extractor.get('Fechas', []))}, "
+            f"Lugares: {len(raw_result_from_extractor.get('Lugares', []))}, "
+            f"Palabras: {raw_result_from_extractor.get('ConteoPalabras', 0)}"
+        )
+
+        status_from_extractor = raw_result_from_extractor.get(
+            "status", raw_result_from_extractor.get("estado", "error")
+        )
+        error_from_extractor = raw_result_from_extractor.get("error", "")
+
+        final_filename = raw_result_from_extractor.get(
+            "filename", raw_result_from_extractor.get("archivo", filename_base)
+        )
+
+        if status_from_extractor == "success":
+            worker_console.info(
+                f"[{pid_label}: {worker_id_str}] Finalizado procesamiento de: "
+                f"{final_filename}{range_label} (Éxito)"
+            )
+
+            logging.info(
+                f"[{descriptive_worker_id}] Finalizado procesamiento de "
+                f"{final_filename}{range_label} con ÉXITO."
+            )
+        else:
+            worker_console.error(
+                f"[{pid_label}: {worker_id_str}] Error durante extracción para "
+                f"{final_filename} (ver log)."
+            )
+
+            logging.error(
+                f"[{descriptive_worker_id}] Error durante extracción para "
+                f"{final_filename}: {error_from_extractor}"
+            )
+
+    except Exception as e:
+        worker_console.error(
+            f"[{pid_label}: {worker_id_str}] Error INESPERADO en wrapper para "
+            f"{filename_base} (ver log)."
+        )
+
+        logging.error(
+            f"[{descriptive_worker_id}] Error INESPERADO en wrapper para "
+            f"{filename_base}: {type(e).__name__} - {e}",
+            exc_info=True,
+        )
+
+        raw_result_from_extractor = {
+            "filename": filename_base,
+            "status": "error",
+            "error": f"Error inesperado en wrapper: {str(e)}",
+        }
+
+    if byte_range is not None:
+        # Los rangos vuelven crudos: el servidor los une con `merge_results`
+        # y convierte el resultado del archivo una sola vez.
+        return {**raw_result_from_extractor, "pid_server": descriptive_worker_id}
+    return client_result(
+        raw_result_from_extractor, descriptive_worker_id, filename_base
+    )
+
+
+def client_result(raw_result, pid_server, default_filename):
+    """
+    Convierte el resultado de un extractor (ver `extractor_regex`) al formato
+    que se envía al cliente y se guarda en la caché.
+    """
+    filename = raw_result.get("filename", raw_result.get("archivo", default_filename))
+    status = raw_result.get("status", raw_result.get("estado", "error"))
+    if status == "success":
+        return {
+            "pid_server": pid_server,
+            "filename": filename,
+            "data": {
+                "nombres_encontrados": raw_result.get("Nombres", []),
+                "fechas_encontradas": raw_result.get("Fechas", []),
+                "lugares_encontrados": raw_result.get("Lugares", []),
+                "word_count": raw_result.get("ConteoPalabras", 0),
+            },
+            "status": "success",
+            "error": "",
+        }
+    return {
+        "pid_server": pid_server,
+        "filename": filename,
+        "data": {
+            "nombres_encontrados": [],
+            "fechas_encontradas": [],
+            "lugares_encontrados": [],
+            "word_count": 0,
+        },
+        "status": "error",
+        "error": raw_result.get("error", ""),
+    }
+
+
+def process_file_task(arg_tuple):
+    """
+    Tarea que se envía al pool: `process_single_file_wrapper`, pero en un
+    worker de un pool con arena el resultado queda en la memoria compartida y
+    solo se devuelve su ubicación. Devuelve (resultado, tiempos del worker,
+    hash del contenido o None); el servidor lo recupera con `finish_task`.
+
+    El hash se calcula con los mismos bytes que lee el extractor, para que la
+    caché de resultados no tenga que volver a leer el archivo.
+    """
+    timings = {"start": time.monotonic()}
+    digest = content_digest() if len(arg_tuple) < 3 else None
+    result = process_single_file_wrapper(arg_tuple, timings, digest)
+    timings["end"] = time.monotonic()
+    content_hash = None
+    if digest is not None and result.get("status") == "success":
+        content_hash = digest.hexdigest()
+    return share_result(result), timings, content_hash
+
+
+def init_process_worker(log_queue, arena_args, batch_records, flush_interval):
+    """
+    Inicializador de los workers de un pool de procesos: sus registros van al
+    hilo escritor del servidor (de a `batch_records` o cada `flush_interval`
+    segundos) y, si el pool tiene arena, se conectan a ella.
+    """
+    attach_worker_logging(
+        log_queue,
+        batch_records=batch_records,
+        flush_interval=flush_interval,
+    )
+    if arena_args is not None:
+        attach_worker(*arena_args)
+
+
+def init_interpreter_worker(log_queue):
+    """
+    Inicializador de los workers de un pool de subintérpretes: sus registros
+    van al hilo escritor del servidor.
+    """
+    attach_interpreter_logging(log_queue)
+
+
+def gil_enabled():
+    """False solo en un CPython free-threaded que corre sin GIL."""
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return True if is_gil_enabled is None else is_gil_enabled()
@@ -0,0 +1,62 @@
+"""
+`parse_file_regex_mmap` debe dar el mismo resultado que `parse_file_regex`
+(el servidor elige uno u otro según el tamaño del archivo, y la caché guarda
+el primero que se calcula).
+"""
+
+import random
+
+import pytest
+
+from benchmarks.bench_extractor import ENTIDADES, PALABRAS_RELLENO
+from src.extractor_regex import parse_file_regex, parse_file_regex_mmap
+
+
+# Caracteres donde los patrones de bytes difieren de los de `str` si solo se
+# tiene en cuenta ASCII: emojis, marcas combinantes, dígitos no ASCII,
+# variantes de mayúsculas de `(?i)`, espacios Unicode, BOM...
+EXTRAS = [
+    "😀", "👍🏽", "🇦🇷", "é", "José", "٣", "١٢/٠٣/١٩٤٥", "𝟙𝟚", "ſep",
+    "3 ſep 1945", "İ", "K", "中文", "—", "«", "»", "¿", "¡", " ",
+    "　", "×", "÷", "ß", "ǅ", "Ⅻ", "²", "½", "﻿", "_", "𝐀bc",
+]
+SEPARADORES = [" ", " ", " ", "\n", "\r\n", "\r", "\t", ", ", "", ". "]
+
+
+def random_text(rng):
+    tokens = []
+    for _ in range(rng.randint(0, 2000)):
+        r = rng.random()
+        if r < 0.15:
+            tokens.append(rng.choice(ENTIDADES))
+        elif r < 0.35:
+            tokens.append(rng.choice(EXTRAS))
+        elif r < 0.38:
+            char = rng.randrange(0x80, 0x110000)
+            tokens.append("" if 0xD800 <= char <= 0xDFFF else chr(char))
+        else:
+            tokens.append(rng.choice(PALABRAS_RELLENO))
+    return "".join(token + rng.choice(SEPARADORES) for token in tokens)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_mmap_igual_que_texto(tmp_path, seed):
+    rng = random.Random(seed)
+    for case in range(60):
+        data = random_text(rng).encode("utf-8")
+        if rng.random() < 0.1:
+            # Un byte inválido: se ignora en modo texto.
+            i = rng.randint(0, len(data))
+            data = data[:i] + bytes([rng.choice([0xFF, 0x80, 0xC3])]) + data[i:]
+        path = tmp_path / f"{case}.txt"
+        path.write_bytes(data)
+        expected = parse_file_regex(str(path), "TEST")
+        assert parse_file_regex_mmap(str(path), "TEST") == expected, case
+
+
+def test_mmap_crlf_como_texto(tmp_path):
+    path = tmp_path / "crlf.txt"
+    path.write_bytes("vino López\r\nGarcía el 12 de\r\nenero de 1945.\r\n".encode())
+    result = parse_file_regex_mmap(str(path), "TEST")
+    assert result == parse_file_regex(str(path), "TEST")
+    assert "López\nGarcía" in result["Nombres"]
@@ -0,0 +1,50 @@
+"""
+Los workers de un pool de subintérpretes deben registrar en el archivo del
+servidor, igual que los de hilos y procesos: un subintérprete arranca sin
+handlers y, sin su inicializador, los `logging.info` por archivo se pierden.
+"""
+
+import concurrent.futures
+import io
+
+import pytest
+
+from src import server
+from src.log_pipeline import LogPipeline
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(concurrent.futures, "InterpreterPoolExecutor"),
+    reason="InterpreterPoolExecutor requiere Python 3.14+",
+)
+
+
+def test_subinterpretes_registran_en_el_archivo(tmp_path):
+    text_file = tmp_path / "entrada.txt"
+    text_file.write_text("Juan Pérez viajó a Madrid el 3 de marzo de 1990.\n")
+    log_path = tmp_path / "server.log"
+    console = io.StringIO()
+
+    pipeline = LogPipeline(str(log_path), server.LOG_FORMAT, console_stream=console)
+    pipeline.start()
+    pools = server.WorkerPoolManager(
+        idle_timeout=60,
+        max_tasks_per_process=100,
+        threads_backend="interpreters",
+        log_pipeline=pipeline,
+    )
+    try:
+        with pools.lease("threads", 1, 1) as executor:
+            outcome = executor.submit(
+                server.process_file_task, (str(text_file), "threads")
+            ).result(timeout=60)
+        backends = [backend for _, _, backend, _, _ in pools.describe()]
+    finally:
+        pools.shutdown()
+        pipeline.stop()
+
+    assert backends == ["interpreters"]
+    assert outcome[0]["status"] == "success"
+    log = log_path.read_text()
+    assert f"Iniciando procesamiento de archivo: {text_file}" in log
+    assert "Finalizado procesamiento de entrada.txt con ÉXITO." in log
+    assert "Iniciando procesamiento de: entrada.txt" in console.getvalue()
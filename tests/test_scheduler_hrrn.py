@@ -0,0 +1,97 @@
+"""
+`ResponseRatioQueue` (procesos agrupados por ráfaga) debe elegir en HRRN el
+mismo proceso que `ReadyQueue.pop_best`, que recalcula el Response Ratio de
+toda la cola, y `simulate()` debe dar el mismo resultado con las dos colas.
+Las dos desempatan por orden de inserción.
+
+La versión original con una lista (`sort` estable por ratio y `pop(0)`) elige
+siempre un proceso con el mismo ratio, pero con ratios exactamente iguales
+puede elegir otro: desempata por el orden en que quedó la lista tras el
+ordenamiento anterior.
+"""
+
+import random
+from fractions import Fraction
+
+import pytest
+
+from benchmarks.bench_hrrn import ScanningHRRN, make_processes
+from src.process import Process
+from src.scheduler import ReadyQueue, ResponseRatioQueue, SchedulerHRRN
+from src.simulator import simulate
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_cola_por_rafagas_elige_igual(seed):
+    # Inserciones, bajas y despachos con empates, ráfagas repetidas y ráfaga 0.
+    rng = random.Random(seed)
+    scheduler = SchedulerHRRN()
+    for _ in range(100):
+        grouped, scanned = ResponseRatioQueue(), ReadyQueue(scheduler.sort_key)
+        now, pid = 0, 0
+        for _ in range(rng.randint(1, 80)):
+            action = rng.random()
+            if action < 0.5 or not scanned:
+                process = Process(
+                    pid, "f.txt", now - rng.randint(0, 10), rng.randint(0, 6)
+                )
+                pid += 1
+                grouped.push(process)
+                scanned.push(process)
+            elif action < 0.6:
+                process = rng.choice(list(scanned))
+                grouped.remove(process)
+                scanned.remove(process)
+            else:
+                expected = scheduler.schedule(scanned, now, [], 1)
+                assert scheduler.schedule(grouped, now, [], 1) is expected
+            now += rng.randint(0, 3)
+            assert list(grouped) == list(scanned)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_simulacion_igual_que_recorrido(seed):
+    rng = random.Random(seed)
+    for case in range(70):
+        processes = make_processes(rng.randint(1, 60), rng.randrange(10**6), 8)
+        num_cpus = rng.randint(1, 3)
+        expected = simulate(processes, ScanningHRRN(), num_cpus)
+        expected_times = [(p.start_time, p.completion_time) for p in processes]
+        actual = simulate(processes, SchedulerHRRN(), num_cpus)
+        assert actual.timeline == expected.timeline, case
+        assert actual.events == expected.events, case
+        assert [(p.start_time, p.completion_time) for p in processes] == (
+            expected_times
+        ), case
+
+
+def response_ratio(process, now):
+    if process.burst_time == 0:
+        return float("inf")
+    return Fraction(now - process.arrival_time + process.burst_time, process.burst_time)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_mismo_ratio_que_lista(seed):
+    rng = random.Random(seed)
+    scheduler = SchedulerHRRN()
+    for _ in range(100):
+        grouped, listed = ResponseRatioQueue(), []
+        now, pid = 0, 0
+        for _ in range(rng.randint(1, 80)):
+            if rng.random() < 0.5 or not listed:
+                process = Process(
+                    pid, "f.txt", now - rng.randint(0, 10), rng.randint(0, 6)
+                )
+                pid += 1
+                grouped.push(process)
+                listed.append(process)
+            else:
+                expected = scheduler.schedule(listed, now, [], 1)
+                actual = scheduler.schedule(grouped, now, [], 1)
+                assert response_ratio(actual, now) == response_ratio(expected, now)
+                if actual is not expected:
+                    # Empate exacto: la lista sigue con el que eligió la cola.
+                    listed.remove(actual)
+                    listed.insert(0, expected)
+            now += rng.randint(0, 3)
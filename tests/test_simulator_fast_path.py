@@ -0,0 +1,40 @@
+"""
+El camino rápido de `src/simulator.py` (FCFS, SJF y Priority_NP en un CPU)
+debe dar exactamente el mismo resultado que el motor por eventos: línea de
+tiempo, eventos, orden de finalización, métricas y tiempos de cada proceso.
+Se prueba con numpy (si está instalado) y con el bucle de Python.
+"""
+
+import random
+
+import pytest
+
+from benchmarks.bench_fast_path import SCHEDULERS, make_processes, snapshot
+from src import simulator
+from src.simulator import simulate
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    if request.param == "numpy":
+        monkeypatch.setattr(simulator, "np", pytest.importorskip("numpy"))
+    else:
+        monkeypatch.setattr(simulator, "np", None)
+    return request.param
+
+
+@pytest.mark.parametrize("name", sorted(SCHEDULERS))
+@pytest.mark.parametrize("seed", range(3))
+def test_camino_rapido_igual_que_motor(backend, name, seed):
+    scheduler_cls = SCHEDULERS[name]
+    rng = random.Random(seed)
+    for case in range(100):
+        count = rng.randint(1, 60)
+        # Llegadas juntas (empates) o separadas (CPU ocioso entre llegadas).
+        spread = rng.choice([0, 0.5, 5, 20])
+        processes = make_processes(count, rng.randrange(10**6), spread)
+        expected = snapshot(
+            processes, simulate(processes, scheduler_cls(), fast_path=False)
+        )
+        actual = snapshot(processes, simulate(processes, scheduler_cls()))
+        assert actual == expected, case